@@ -1,17 +1,24 @@
 """
 JobMatch - 一个智能的求职匹配系统
+
+导出的类在第一次访问时才导入（PEP 562），只用到解析器或只用大模型API的程序不会加载torch、openai等重量级依赖。
 """
 
-from .parsers.web_parser import WebParser
-from .parsers.linkedin_parser import LinkedInParser
-from .ai.ai_model import AIModel
-from .ai.bert_model import BERTModel
-from .ai.chatgpt_model import ChatGPTModel
-from .ai.ai_judger import AIJudger
-from .main.job_match_server import JobMatchServer
+import importlib
 
 __version__ = "0.1.0"
 
+# 导出的名称 -> 所在模块
+_LAZY_EXPORTS = {
+    "WebParser": ".parsers.web_parser",
+    "LinkedInParser": ".parsers.linkedin_parser",
+    "AIModel": ".ai.ai_model",
+    "BERTModel": ".ai.bert_model",
+    "ChatGPTModel": ".ai.chatgpt_model",
+    "AIJudger": ".ai.ai_judger",
+    "JobMatchServer": ".main.job_match_server",
+}
+
 __all__ = [
     "WebParser",
     "LinkedInParser",
@@ -20,4 +27,16 @@ __all__ = [
     "ChatGPTModel",
     "AIJudger",
     "JobMatchServer",
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
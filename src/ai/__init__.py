@@ -1,11 +1,37 @@
 """
 AI判断模块
+
+BERTModel、ChatGPTModel、QwenModel分别依赖torch/transformers和openai，导入代价很大，
+这里按PEP 562在第一次访问时才导入它们所在的模块。
 """
 
+import importlib
+
 from .ai_model import AIModel
 from .ai_judger import AIJudger
-from .bert_model import BERTModel
-from .chatgpt_model import ChatGPTModel
-from .qwen_model import QwenModel
+from .cascade_judger import CascadeJudger
+from .cached_model import CachedModel, JudgmentCache
+from .job_index import JobEmbeddingIndex
+from .model_factory import create_model, create_model_from_config
+
+# 延迟导入的名称 -> 所在模块
+_LAZY_EXPORTS = {
+    "BERTModel": ".bert_model",
+    "ChatGPTModel": ".chatgpt_model",
+    "QwenModel": ".qwen_model",
+}
+
+__all__ = ["AIModel", "AIJudger", "CascadeJudger", "BERTModel", "ChatGPTModel", "QwenModel", "CachedModel",
+           "JudgmentCache", "JobEmbeddingIndex", "create_model", "create_model_from_config"]
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-__all__ = ["AIModel", "AIJudger", "BERTModel", "ChatGPTModel", "QwenModel"]
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,15 +1,50 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import threading
+import asyncio
+import logging
+import time
 from .ai_model import AIModel
+from .near_duplicates import NearDuplicateDetector
+
+logger = logging.getLogger(__name__)
 
 
 class AIJudger:
     """AI判断协调器"""
 
-    def __init__(self, ai_model: AIModel, user_requirements, threshold: float = 0.7):
+    def __init__(self,
+                 ai_model: AIModel,
+                 user_requirements,
+                 threshold: float = 0.7,
+                 max_workers: int = 1,
+                 timeout: Optional[float] = None,
+                 dedup_threshold: Optional[float] = None):
+        """
+        Args:
+            ai_model: 用于判断的AI模型
+            user_requirements: 默认的用户需求
+            threshold: 判断是否推荐的分数阈值
+            max_workers: judge_batch并行调用模型的最大并发数，1表示串行；所有judge_batch调用共享同一个线程池，
+                同时进行中的模型调用（包括已经超时但还没有结束的调用）不会超过这个数
+            timeout: 单次模型调用的超时时间（秒），从调用开始执行时计时，None表示不限制；
+                超时的调用不会被强行中止，模型应同时在客户端设置请求超时（例如QwenModel的timeout参数）
+            dedup_threshold: 近似重复检测的相似度阈值，设置后批量判断时描述近似重复的职位只判断一次，
+                None表示不去重
+        """
         # todo 后期优化的话这里应该是可以传入AIModel的config的，然后直接初始化AIModel
         self.ai_model = ai_model
         self.threshold = threshold
         self.user_requirements = user_requirements
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.duplicate_detector = NearDuplicateDetector(dedup_threshold) if dedup_threshold is not None else None
+        # 最近一次批量判断的去重统计
+        self.last_dedup_stats = {'total': 0, 'judged': 0, 'duplicates': 0}
+        # 并行或带超时的模型调用都提交到这个线程池，第一次使用时创建
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
 
     def judge_single(self, job_description: str, job_info: Dict = None, user_requirements: str = "") -> Dict[str, Any]:
         """
@@ -26,16 +61,271 @@ class AIJudger:
         """
         批量判断多个职位
 
-        todo, 优化为并行处理
+        模型支持批量判断（supports_batch为True）时调用模型的judge_batch，模型按包发送请求时（例如打包模式的QwenModel）
+        每个包和补判的职位都是一次独立的模型调用，与逐个判断一样并行并受timeout限制；
+        否则 max_workers > 1 时使用线程池并行调用模型，返回结果与job_descriptions、job_info_list按下标一一对应；
+        并行模式或设置了timeout时，单次调用超时或抛出异常都会转换为 {"success": False, "error": ...}，
+        不影响其他职位的判断。
+
+        设置了dedup_threshold时，描述近似重复的职位只判断分组中的第一个，其余职位复制它的结果，
+        并在结果中用duplicate_of标明代表职位。
         """
         if not user_requirements:
             user_requirements = self.user_requirements
+        representatives, unique = self.group_duplicates(job_descriptions, job_info_list)
+        unique_results = self._judge_unique([job_descriptions[idx] for idx in unique],
+                                            [job_info_list[idx] for idx in unique] if job_info_list else None,
+                                            user_requirements)
+        return self.expand_duplicates(representatives, dict(zip(unique, unique_results)), job_info_list)
+
+    def _judge_unique(self, job_descriptions: List[str], job_info_list: Optional[List],
+                      user_requirements: str) -> List[Dict[str, Any]]:
+        """判断去重之后的职位，返回结果与job_descriptions按下标一一对应"""
+        # 模型支持批量判断时（例如BERTModel），一次性交给模型处理
+        if getattr(self.ai_model, 'supports_batch', False):
+            raw_results = self._batch_judge(job_descriptions, user_requirements)
+            return [self._post_process(result, job_info_list[idx] if job_info_list else None)
+                    for idx, result in enumerate(raw_results)]
+
+        if self.max_workers <= 1 and self.timeout is None:
+            results = []
+            for idx in range(len(job_descriptions)):
+                job_info = job_info_list[idx] if job_info_list else None
+                results.append(self.judge_single(job_descriptions[idx], job_info, user_requirements))
+            return results
+
+        raw_results = self._judge_many(job_descriptions, user_requirements)
+        return [self._post_process(result, job_info_list[idx] if job_info_list else None)
+                for idx, result in enumerate(raw_results)]
+
+    def group_duplicates(self, job_descriptions: List[str],
+                         job_info_list: List = None) -> Tuple[List[int], List[int]]:
+        """
+        对职位描述进行近似重复分组
+
+        提供了job_info_list时比较详情页的职位描述（full_description），格式化后的文本包含标题、公司等字段，
+        同一描述在不同公司或地点重新发布时相似度会被拉低；没有职位信息时直接比较job_descriptions。
+
+        Returns:
+            (每个职位所属分组的代表下标, 所有代表的下标)；没有开启去重时每个职位都是自己的代表
+        """
+        if self.duplicate_detector is None:
+            representatives = list(range(len(job_descriptions)))
+        else:
+            texts = job_descriptions if not job_info_list else [
+                (job_info or {}).get('full_description') or "" for job_info in job_info_list]
+            representatives = self.duplicate_detector.representatives(texts)
+        unique = sorted(set(representatives))
+        self.last_dedup_stats = {
+            'total': len(job_descriptions),
+            'judged': len(unique),
+            'duplicates': len(job_descriptions) - len(unique),
+        }
+        return representatives, unique
+
+    @staticmethod
+    def expand_duplicates(representatives: List[int], results_by_representative: Dict[int, Dict[str, Any]],
+                           job_info_list: Optional[List]) -> List[Dict[str, Any]]:
+        """
+        把代表职位的判断结果复制给同组的其他职位
+
+        复制的结果换成该职位自己的job_info，并增加duplicate_of字段：代表职位的job_id，没有职位信息时为代表的下标
+        """
+        results = []
+        for idx, representative in enumerate(representatives):
+            result = results_by_representative[representative]
+            if representative != idx:
+                result = dict(result)
+                if job_info_list:
+                    result['job_info'] = job_info_list[idx]
+                    result['duplicate_of'] = job_info_list[representative].get('job_id', representative)
+                else:
+                    result['duplicate_of'] = representative
+            results.append(result)
+        return results
+
+    def _batch_judge(self, job_descriptions: List[str], user_requirements: str) -> List[Dict[str, Any]]:
+        """
+        批量判断，返回未经后处理的结果
+
+        模型提供make_packs并返回了分组时，每组通过一次judge_pack判断，各组经由线程池并行、受timeout限制，
+        包调用失败或回复中缺少的职位再逐个补判；否则整体调用模型的judge_batch，出错时所有职位都返回失败结果
+        """
+        make_packs = getattr(self.ai_model, 'make_packs', None)
+        packs = make_packs(user_requirements, job_descriptions) if make_packs is not None else None
+        if packs is None:
+            try:
+                return self.ai_model.judge_batch(user_requirements, job_descriptions)
+            except Exception as e:
+                return [{"success": False, "error": str(e)} for _ in job_descriptions]
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(job_descriptions)
+        # 只有一个职位的包直接走单个职位的判断
+        multi_packs = [pack for pack in packs if len(pack) > 1]
+        packed_results = self._map_parallel(
+            lambda pack: self.ai_model.judge_pack(user_requirements, [job_descriptions[idx] for idx in pack]),
+            multi_packs, self._pack_failed)
+        for pack, packed in zip(multi_packs, packed_results):
+            for local_index, result in packed.items():
+                results[pack[local_index]] = result
+
+        missing = [idx for idx, result in enumerate(results) if result is None]
+        fallback_results = self._judge_many([job_descriptions[idx] for idx in missing], user_requirements)
+        for idx, result in zip(missing, fallback_results):
+            results[idx] = result
+        return results
+
+    def _judge_many(self, job_descriptions: List[str], user_requirements: str) -> List[Dict[str, Any]]:
+        """
+        并行调用模型判断多个职位，返回未经后处理的结果，顺序与job_descriptions一致；
+        超时或抛出异常的职位返回 {"success": False, "error": ...}
+        """
+        return self._map_parallel(lambda description: self.ai_model.judge(user_requirements, description),
+                                  job_descriptions, lambda description, e: {"success": False, "error": str(e)})
+
+    @staticmethod
+    def _pack_failed(pack: List[int], error: Exception) -> Dict[int, Dict[str, Any]]:
+        """打包判断超时或失败时返回空字典，包中的职位之后逐个补判"""
+        logger.warning(f"打包判断失败，改为逐个判断{len(pack)}个职位: {str(error)}")
+        return {}
+
+    def _map_parallel(self, func, items: List, on_error) -> List:
+        """
+        对每一项调用func，返回结果的顺序与items一致；func超时或抛出异常时该项的结果为on_error(item, error)
+
+        max_workers > 1 或设置了timeout时，调用提交到共享的线程池，每一项从开始执行起最多等待timeout秒；
+        超时的调用继续占用线程池中的线程直到结束，因此同时进行中的调用数始终不超过max_workers
+        """
+        if self.timeout is None and (self.max_workers <= 1 or len(items) <= 1):
+            results = []
+            for item in items:
+                try:
+                    results.append(func(item))
+                except Exception as e:
+                    results.append(on_error(item, e))
+            return results
+
+        start_times: List[Optional[float]] = [None] * len(items)
+        started = [threading.Event() for _ in items]
+
+        def run(idx: int):
+            start_times[idx] = time.monotonic()
+            started[idx].set()
+            return func(items[idx])
+
+        executor = self._get_executor()
+        futures = [executor.submit(run, idx) for idx in range(len(items))]
         results = []
-        for idx in range(len(job_descriptions)):
-            job_info = job_info_list[idx] if job_info_list else None
-            results.append(self.judge_single(job_descriptions[idx], job_info, user_requirements))
+        for idx, future in enumerate(futures):
+            try:
+                if self.timeout is None:
+                    results.append(future.result())
+                    continue
+                started[idx].wait()
+                remaining = start_times[idx] + self.timeout - time.monotonic()
+                try:
+                    results.append(future.result(timeout=max(0.0, remaining)))
+                except FutureTimeoutError:
+                    raise TimeoutError(f"模型调用超时（超过{self.timeout}秒）") from None
+            except Exception as e:
+                results.append(on_error(items[idx], e))
+        return results
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ai-judge")
+            return self._executor
+
+    def close(self):
+        """关闭模型调用的线程池，不等待已经超时、仍在后台进行的调用"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    async def ajudge_single(self, job_description: str, job_info: Dict = None,
+                            user_requirements: str = "") -> Dict[str, Any]:
+        """
+        judge_single的异步版本，调用模型的ajudge；超时或异常时返回 {"success": False, "error": ...}
+        """
+        if not user_requirements:
+            user_requirements = self.user_requirements
+        result = await self._safe_ajudge(user_requirements, job_description)
+        return self._post_process(result, job_info)
+
+    async def ajudge_batch(self, job_descriptions: List[str], job_info_list: List = None,
+                           user_requirements: str = "") -> List[Dict[str, Any]]:
+        """
+        judge_batch的异步版本，所有职位在同一个事件循环中并发判断，返回结果与job_descriptions按下标一一对应
+
+        并发数由模型自身的限流控制（例如QwenModel按端点共享的信号量）；近似重复的处理与judge_batch相同
+        """
+        if not user_requirements:
+            user_requirements = self.user_requirements
+        representatives, unique = self.group_duplicates(job_descriptions, job_info_list)
+        unique_results = await self._ajudge_unique([job_descriptions[idx] for idx in unique],
+                                                   [job_info_list[idx] for idx in unique] if job_info_list else None,
+                                                   user_requirements)
+        return self.expand_duplicates(representatives, dict(zip(unique, unique_results)), job_info_list)
+
+    async def _ajudge_unique(self, job_descriptions: List[str], job_info_list: Optional[List],
+                             user_requirements: str) -> List[Dict[str, Any]]:
+        """异步判断去重之后的职位，返回结果与job_descriptions按下标一一对应"""
+        raw_results = await self._ajudge_many(job_descriptions, user_requirements)
+        return [self._post_process(result, job_info_list[idx] if job_info_list else None)
+                for idx, result in enumerate(raw_results)]
+
+    async def _ajudge_many(self, job_descriptions: List[str], user_requirements: str) -> List[Dict[str, Any]]:
+        """
+        并发判断多个职位，返回未经后处理的结果，顺序与job_descriptions一致
+
+        模型提供make_packs和ajudge_pack并返回了分组时，与_batch_judge一样每组发送一个请求，
+        包调用失败或回复中缺少的职位再逐个补判；否则每个职位各调用一次ajudge
+        """
+        make_packs = getattr(self.ai_model, 'make_packs', None)
+        packs = None
+        if make_packs is not None and hasattr(self.ai_model, 'ajudge_pack'):
+            packs = make_packs(user_requirements, job_descriptions)
+        if packs is None:
+            return list(await asyncio.gather(
+                *(self._safe_ajudge(user_requirements, description) for description in job_descriptions)))
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(job_descriptions)
+        multi_packs = [pack for pack in packs if len(pack) > 1]
+        packed_results = await asyncio.gather(*(self._safe_ajudge_pack(user_requirements, job_descriptions, pack)
+                                                for pack in multi_packs))
+        for pack, packed in zip(multi_packs, packed_results):
+            for local_index, result in packed.items():
+                results[pack[local_index]] = result
+
+        missing = [idx for idx, result in enumerate(results) if result is None]
+        fallback_results = await asyncio.gather(
+            *(self._safe_ajudge(user_requirements, job_descriptions[idx]) for idx in missing))
+        for idx, result in zip(missing, fallback_results):
+            results[idx] = result
         return results
 
+    async def _safe_ajudge_pack(self, user_requirements: str, job_descriptions: List[str],
+                                pack: List[int]) -> Dict[int, Dict[str, Any]]:
+        """异步调用模型的ajudge_pack判断一个包，超时或抛出异常时返回空字典"""
+        try:
+            return await asyncio.wait_for(
+                self.ai_model.ajudge_pack(user_requirements, [job_descriptions[idx] for idx in pack]), self.timeout)
+        except asyncio.TimeoutError:
+            return self._pack_failed(pack, TimeoutError(f"模型调用超时（超过{self.timeout}秒）"))
+        except Exception as e:
+            return self._pack_failed(pack, e)
+
+    async def _safe_ajudge(self, user_requirements: str, job_description: str) -> Dict[str, Any]:
+        """异步调用模型进行一次判断，超时或抛出异常时返回 {"success": False, "error": ...}"""
+        try:
+            return await asyncio.wait_for(self.ai_model.ajudge(user_requirements, job_description), self.timeout)
+        except asyncio.TimeoutError:
+            return {"success": False, "error": f"模型调用超时（超过{self.timeout}秒）"}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
     def _post_process(self, result: Dict[str, Any], job_info: Dict) -> Dict[str, Any]:
         """
         对得到的result进行后处理，例如没有reason字段时自动生成，只有score没有decision时自动判断
@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List
+import asyncio
 import re
 
 class AIModel(ABC):
     """AI模型的抽象基类"""
+
+    # 为True时表示judge_batch有比逐个调用judge更高效的实现，AIJudger会优先使用
+    supports_batch = False
     
     @abstractmethod
     def judge(self, user_requirements: str, job_description: str) -> Dict[str, Any]:
@@ -24,6 +28,35 @@ class AIModel(ABC):
         """
         pass
 
+    def judge_batch(self, user_requirements: str, job_descriptions: List[str]) -> List[Dict[str, Any]]:
+        """
+        批量判断同一份用户需求与多个职位描述的匹配程度，默认逐个调用judge
+
+        Args:
+            user_requirements: 用户需求文本
+            job_descriptions: 职位描述文本列表
+
+        Returns:
+            与job_descriptions一一对应的判断结果列表，每个结果的格式与judge相同
+        """
+        return [self.judge(user_requirements, job_description) for job_description in job_descriptions]
+
+    async def ajudge(self, user_requirements: str, job_description: str) -> Dict[str, Any]:
+        """
+        judge的异步版本，输入输出与judge相同
+
+        默认在线程池中调用judge，避免阻塞事件循环；基于网络API的子类应重写为原生的异步实现。
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.judge, user_requirements, job_description)
+
+    def cache_key_attributes(self) -> Dict[str, Any]:
+        """
+        影响判断结果的模型配置，CachedModel用它们计算缓存键，任何一项变化都不会命中旧的缓存
+
+        子类新增会改变结果的参数时需要同时加到这里，值只能是字符串、数值、布尔值或None
+        """
+        return {}
 
     def _extract_code_blocks(self, text: str) -> list:
         """
@@ -0,0 +1,136 @@
+"""
+BERTModel的推理后端
+
+- torch：原始的FP32 PyTorch模型
+- quantized：对Linear层做动态int8量化的PyTorch模型，CPU上更快、内存更小，分数有少量误差
+- onnx：导出为ONNX后用ONNX Runtime推理，导出结果缓存在cache_dir中，同一个模型只导出一次；
+  缓存文件名包含模型配置和权重的指纹，模型更新后会重新导出
+
+所有后端都是一个可调用对象：输入tokenizer产生的张量字典，返回最后一层隐藏状态 (batch, seq_len, hidden_size)。
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import re
+from typing import Dict
+import torch
+from transformers import BertConfig, BertModel
+
+BERT_BACKENDS = ('torch', 'quantized', 'onnx')
+# ONNX模型的输入名称，与BertTokenizer的输出一致
+ONNX_INPUT_NAMES = ('input_ids', 'attention_mask', 'token_type_ids')
+ONNX_OPSET_VERSION = 17
+
+logger = logging.getLogger(__name__)
+
+
+class TorchBertEncoder:
+    """PyTorch推理，quantize为True时对Linear层做动态int8量化"""
+
+    def __init__(self, model_name: str, quantize: bool = False):
+        model = BertModel.from_pretrained(model_name)
+        model.eval()
+        if quantize:
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        self.model = model
+        self.hidden_size = model.config.hidden_size
+
+    def __call__(self, inputs: Dict[str, torch.Tensor]) -> torch.Tensor:
+        with torch.no_grad():
+            return self.model(**inputs).last_hidden_state
+
+
+class _LastHiddenState(torch.nn.Module):
+    """导出ONNX用的包装，按固定的参数顺序输入，只输出最后一层隐藏状态"""
+
+    def __init__(self, model: BertModel):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask, token_type_ids):
+        return self.model(input_ids=input_ids, attention_mask=attention_mask,
+                          token_type_ids=token_type_ids).last_hidden_state
+
+
+def _model_fingerprint(model_name: str, config: BertConfig) -> str:
+    """
+    模型的指纹，用于区分同名模型的不同版本
+
+    包含完整的模型配置、Hugging Face Hub上的提交哈希（本地目录没有）、本地目录中权重文件的大小和修改时间，
+    以及torch版本和导出使用的opset版本。
+    """
+    parts = {
+        'config': config.to_dict(),
+        'commit': getattr(config, '_commit_hash', None),
+        'torch': torch.__version__,
+        'opset': ONNX_OPSET_VERSION,
+    }
+    if os.path.isdir(model_name):
+        parts['weights'] = sorted(
+            (entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+            for entry in os.scandir(model_name) if entry.name.endswith(('.bin', '.safetensors'))
+        )
+    data = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:16]
+
+
+class OnnxBertEncoder:
+    """ONNX Runtime推理，第一次使用某个模型（的某个版本）时导出ONNX文件，之后直接加载缓存的文件"""
+
+    def __init__(self, model_name: str, cache_dir: str = "model_cache"):
+        import onnxruntime
+
+        config = BertConfig.from_pretrained(model_name)
+        self.hidden_size = config.hidden_size
+        safe_name = re.sub(r'[^\w.-]+', '_', model_name.strip('/\\'))
+        self.onnx_path = os.path.join(cache_dir, f"{safe_name}-{_model_fingerprint(model_name, config)}.onnx")
+        if not os.path.exists(self.onnx_path):
+            self._export(model_name)
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(self.onnx_path, options, providers=['CPUExecutionProvider'])
+        self._input_names = [node.name for node in self.session.get_inputs()]
+
+    def _export(self, model_name: str):
+        """导出ONNX文件，先写入临时文件再改名，导出中断时不会留下损坏的缓存"""
+        logger.info(f"导出ONNX模型 {model_name} -> {self.onnx_path}")
+        model = BertModel.from_pretrained(model_name, attn_implementation='eager')
+        wrapper = _LastHiddenState(model).eval()
+        sample = {name: torch.ones((1, 8), dtype=torch.long) for name in ONNX_INPUT_NAMES}
+        dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in ONNX_INPUT_NAMES + ('last_hidden_state',)}
+
+        os.makedirs(os.path.dirname(self.onnx_path) or '.', exist_ok=True)
+        tmp_path = self.onnx_path + '.tmp'
+        # 新版本torch默认使用dynamo导出，这里固定使用基于TorchScript的导出器，旧版本torch没有dynamo参数
+        extra = {'dynamo': False} if 'dynamo' in inspect.signature(torch.onnx.export).parameters else {}
+        with torch.no_grad():
+            torch.onnx.export(wrapper, tuple(sample[name] for name in ONNX_INPUT_NAMES), tmp_path,
+                              input_names=list(ONNX_INPUT_NAMES), output_names=['last_hidden_state'],
+                              dynamic_axes=dynamic_axes, opset_version=ONNX_OPSET_VERSION, **extra)
+        os.replace(tmp_path, self.onnx_path)
+
+    def __call__(self, inputs: Dict[str, torch.Tensor]) -> torch.Tensor:
+        feed = {name: inputs[name].numpy() for name in self._input_names}
+        return torch.from_numpy(self.session.run(None, feed)[0])
+
+
+def load_bert_encoder(model_name: str, backend: str = 'torch', cache_dir: str = "model_cache"):
+    """
+    根据名称创建推理后端
+
+    Args:
+        model_name: 预训练模型名称或路径
+        backend: 'torch'、'quantized'或'onnx'
+        cache_dir: onnx后端保存导出文件的目录
+    """
+    if backend == 'torch':
+        return TorchBertEncoder(model_name)
+    if backend == 'quantized':
+        return TorchBertEncoder(model_name, quantize=True)
+    if backend == 'onnx':
+        return OnnxBertEncoder(model_name, cache_dir)
+    raise ValueError(f"未知的BERT推理后端: {backend}，可选值为 {', '.join(BERT_BACKENDS)}")
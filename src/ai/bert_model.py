@@ -1,34 +1,225 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
+from collections import OrderedDict
+import hashlib
+import threading
+import time
+import numpy as np
 import torch
-from transformers import BertModel, BertTokenizer
+from transformers import BertTokenizerFast
 from .ai_model import AIModel
+from .bert_backends import load_bert_encoder
+
+POOLING_METHODS = ('mean', 'max')
 
 class BERTModel(AIModel):
     """基于BERT的文本匹配模型"""
-    
-    def __init__(self, model_name: str = 'bert-base-uncased'):
-        self.tokenizer = BertTokenizer.from_pretrained(model_name)
-        self.model = BertModel.from_pretrained(model_name)
-        self.model.eval()
-    
+
+    supports_batch = True
+
+    def __init__(self, model_name: str = 'bert-base-uncased', batch_size: int = 16,
+                 requirements_cache_size: int = 8, backend: str = 'torch', cache_dir: str = "model_cache",
+                 max_length: int = 512, max_chunks: int = 1, chunk_overlap: int = 64, pooling: str = 'mean',
+                 tokenization_cache_size: int = 4096):
+        """
+        Args:
+            model_name: 预训练模型名称或路径
+            batch_size: 批量编码职位描述时每个batch的大小
+            requirements_cache_size: 缓存多少份用户需求的编码结果
+            backend: 推理后端，'torch'（FP32）、'quantized'（动态int8量化）或'onnx'（ONNX Runtime），见bert_backends
+            cache_dir: onnx后端缓存导出文件的目录
+            max_length: 每个窗口的最大token数（包括[CLS]和[SEP]），不能超过模型的max_position_embeddings
+            max_chunks: 每段文本最多切分为多少个窗口，1表示只编码开头的max_length个token（截断）；
+                长文本的编码成本与窗口数成正比，这里限制上限使成本可预期
+            chunk_overlap: 相邻窗口重叠的token数，避免句子被窗口边界截断后丢失上下文
+            pooling: 多个窗口的[CLS]向量合并为一个向量的方式，'mean'或'max'
+            tokenization_cache_size: 缓存多少段文本的分词结果，0表示不缓存
+        """
+        if pooling not in POOLING_METHODS:
+            raise ValueError(f"未知的pooling方式: {pooling}，可选值为 {', '.join(POOLING_METHODS)}")
+        # 基于Rust的tokenizers实现，批量分词时比纯Python的BertTokenizer快得多
+        self.tokenizer = BertTokenizerFast.from_pretrained(model_name)
+        self.model_name = model_name
+        self.backend = backend
+        self.encoder = load_bert_encoder(model_name, backend, cache_dir)
+        self.batch_size = max(1, batch_size)
+        self.max_length = max_length
+        self.max_chunks = max(1, max_chunks)
+        # 窗口内除去[CLS]和[SEP]后可以容纳的token数
+        self._window_size = max_length - 2
+        self.chunk_overlap = min(max(0, chunk_overlap), self._window_size - 1)
+        self.pooling = pooling
+
+        # 同一份用户需求会和很多职位比较，缓存其[CLS]向量，避免重复编码
+        self.requirements_cache_size = requirements_cache_size
+        self._requirements_cache: "OrderedDict[str, torch.Tensor]" = OrderedDict()
+        self._requirements_cache_lock = threading.Lock()
+
+        # 分词结果的LRU缓存，键为文本的SHA-1摘要，重复出现的文本（用户需求、重新抓取到的未变化的职位描述）不再分词
+        self.tokenization_cache_size = max(0, tokenization_cache_size)
+        self._token_cache: "OrderedDict[bytes, List[int]]" = OrderedDict()
+        self._token_cache_lock = threading.Lock()
+        self._token_cache_hits = 0
+        self._token_cache_misses = 0
+        self._tokenize_seconds = 0.0
+
     def judge(self, user_requirements: str, job_description: str) -> Dict[str, Any]:
-        # 对文本进行编码
-        inputs1 = self.tokenizer(user_requirements, return_tensors="pt", padding=True, truncation=True)
-        inputs2 = self.tokenizer(job_description, return_tensors="pt", padding=True, truncation=True)
-        
-        with torch.no_grad():
-            # 获取CLS token的输出向量
-            outputs1 = self.model(**inputs1)
-            outputs2 = self.model(**inputs2)
-            
-            # 获取[CLS]标记的最后隐藏状态
-            cls1 = outputs1.last_hidden_state[:, 0, :]
-            cls2 = outputs2.last_hidden_state[:, 0, :]
-            
-            # 计算余弦相似度
-            similarity = torch.cosine_similarity(cls1, cls2)
-            score = similarity.item()
-        
+        return self.judge_batch(user_requirements, [job_description])[0]
+
+    def cache_key_attributes(self) -> Dict[str, Any]:
         return {
-            'score': score
-        } 
\ No newline at end of file
+            'model_name': self.model_name,
+            'backend': self.backend,
+            'max_length': self.max_length,
+            'max_chunks': self.max_chunks,
+            'chunk_overlap': self.chunk_overlap,
+            'pooling': self.pooling,
+        }
+
+    def judge_batch(self, user_requirements: str, job_descriptions: List[str]) -> List[Dict[str, Any]]:
+        """
+        批量计算用户需求与多个职位描述的匹配度
+
+        用户需求只编码一次，职位描述切分窗口后按batch_size分批padding编码，最后一次性计算所有余弦相似度
+        """
+        if not job_descriptions:
+            return []
+
+        requirements_vector = self._encode_requirements(user_requirements)
+        job_vectors = self._encode(job_descriptions)
+
+        # 计算余弦相似度，(1, H)与(N, H)广播
+        similarities = torch.cosine_similarity(job_vectors, requirements_vector)
+        return [{'score': score} for score in similarities.tolist()]
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        将多个文本编码为向量（[CLS]标记的最后隐藏状态），返回形状为(len(texts), hidden_size)的float32数组
+        """
+        if not texts:
+            return np.zeros((0, self.encoder.hidden_size), dtype=np.float32)
+        return self._encode(texts).numpy().astype(np.float32, copy=False)
+
+    def _encode(self, texts: List[str]) -> torch.Tensor:
+        """
+        将多个文本编码为向量，返回形状为(len(texts), hidden_size)的张量
+
+        每段文本切分为若干个重叠的窗口，所有文本的所有窗口按长度排序后一起分批编码（长度相近的窗口放在同一个batch，
+        减少padding），每个窗口取[CLS]标记的最后隐藏状态，再按pooling合并为一段文本一个向量
+        """
+        windows: List[List[int]] = []
+        spans: List[Tuple[int, int]] = []
+        for token_ids in self._tokenize(texts):
+            text_windows = self._split_windows(token_ids)
+            spans.append((len(windows), len(windows) + len(text_windows)))
+            windows.extend(text_windows)
+
+        window_vectors = torch.empty((len(windows), self.encoder.hidden_size))
+        order = sorted(range(len(windows)), key=lambda idx: len(windows[idx]))
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            inputs = self._pad_windows([windows[idx] for idx in batch])
+            window_vectors[batch] = self.encoder(inputs)[:, 0, :].float()
+
+        pooled = []
+        for start, end in spans:
+            vectors = window_vectors[start:end]
+            pooled.append(vectors.mean(dim=0) if self.pooling == 'mean' else vectors.max(dim=0).values)
+        return torch.stack(pooled)
+
+    def _tokenize(self, texts: List[str]) -> List[List[int]]:
+        """
+        把多个文本转换为token id（不包括特殊标记），缓存中没有的文本一次性批量分词
+        """
+        keys = [hashlib.sha1(text.encode('utf-8')).digest() for text in texts]
+        result: List[List[int]] = [None] * len(texts)
+        missing: Dict[bytes, List[int]] = {}
+        with self._token_cache_lock:
+            for idx, key in enumerate(keys):
+                token_ids = self._token_cache.get(key)
+                if token_ids is None:
+                    missing.setdefault(key, []).append(idx)
+                else:
+                    self._token_cache.move_to_end(key)
+                    result[idx] = token_ids
+            self._token_cache_hits += len(texts) - sum(len(indices) for indices in missing.values())
+            self._token_cache_misses += len(missing)
+        if not missing:
+            return result
+
+        start = time.perf_counter()
+        encoded = self.tokenizer([texts[indices[0]] for indices in missing.values()],
+                                 add_special_tokens=False, verbose=False)['input_ids']
+        elapsed = time.perf_counter() - start
+
+        with self._token_cache_lock:
+            self._tokenize_seconds += elapsed
+            for (key, indices), token_ids in zip(missing.items(), encoded):
+                for idx in indices:
+                    result[idx] = token_ids
+                if self.tokenization_cache_size:
+                    self._token_cache[key] = token_ids
+            while len(self._token_cache) > self.tokenization_cache_size:
+                self._token_cache.popitem(last=False)
+        return result
+
+    def tokenization_stats(self) -> Dict[str, float]:
+        """分词缓存的命中次数、未命中次数，以及累计花在分词上的时间（秒）"""
+        with self._token_cache_lock:
+            return {
+                'hits': self._token_cache_hits,
+                'misses': self._token_cache_misses,
+                'cached': len(self._token_cache),
+                'seconds': self._tokenize_seconds,
+            }
+
+    def _split_windows(self, token_ids: List[int]) -> List[List[int]]:
+        """
+        把一段文本的token切分为重叠的窗口，窗口中不包括特殊标记
+
+        需要的窗口数超过max_chunks时，max_chunks个窗口在文本中均匀分布，第一个从开头开始，最后一个在结尾结束，
+        这样放在职位描述末尾的任职要求也能被编码；此时窗口之间可能有未覆盖的部分
+        """
+        size = self._window_size
+        if len(token_ids) <= size:
+            return [token_ids]
+        if self.max_chunks == 1:
+            return [token_ids[:size]]
+
+        step = size - self.chunk_overlap
+        needed = (len(token_ids) - self.chunk_overlap + step - 1) // step
+        if needed <= self.max_chunks:
+            starts = [min(idx * step, len(token_ids) - size) for idx in range(needed)]
+        else:
+            last_start = len(token_ids) - size
+            starts = [round(idx * last_start / (self.max_chunks - 1)) for idx in range(self.max_chunks)]
+        return [token_ids[start:start + size] for start in starts]
+
+    def _pad_windows(self, windows: List[List[int]]) -> Dict[str, torch.Tensor]:
+        """给窗口加上[CLS]和[SEP]并padding为同一长度，返回与tokenizer输出格式相同的张量字典"""
+        length = max(len(window) for window in windows) + 2
+        input_ids = torch.full((len(windows), length), self.tokenizer.pad_token_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(windows), length), dtype=torch.long)
+        for row, window in enumerate(windows):
+            ids = [self.tokenizer.cls_token_id] + window + [self.tokenizer.sep_token_id]
+            input_ids[row, :len(ids)] = torch.tensor(ids, dtype=torch.long)
+            attention_mask[row, :len(ids)] = 1
+        return {
+            'input_ids': input_ids,
+            'attention_mask': attention_mask,
+            'token_type_ids': torch.zeros_like(input_ids),
+        }
+
+    def _encode_requirements(self, user_requirements: str) -> torch.Tensor:
+        """编码用户需求，结果按LRU缓存；编码在锁外进行，多个线程同时遇到同一份新需求时可能各自编码一次"""
+        with self._requirements_cache_lock:
+            vector = self._requirements_cache.get(user_requirements)
+            if vector is not None:
+                self._requirements_cache.move_to_end(user_requirements)
+                return vector
+
+        vector = self._encode([user_requirements])
+        with self._requirements_cache_lock:
+            self._requirements_cache[user_requirements] = vector
+            while len(self._requirements_cache) > self.requirements_cache_size:
+                self._requirements_cache.popitem(last=False)
+        return vector
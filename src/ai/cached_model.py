@@ -0,0 +1,252 @@
+from typing import Dict, Any, List, Optional
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from .ai_model import AIModel
+
+
+class JudgmentCache:
+    """
+    基于SQLite的判断结果缓存
+
+    每条记录保存创建时间和最近访问时间，超过ttl的记录视为失效，
+    记录数超过max_entries时按最近访问时间淘汰最旧的记录（LRU）。
+    记录数在打开时统计一次，之后随写入和删除增减，写入时不必每次COUNT整张表。
+    """
+
+    def __init__(self, path: str = "judgment_cache.sqlite3", ttl: Optional[float] = 7 * 24 * 3600,
+                 max_entries: int = 100000):
+        """
+        Args:
+            path: SQLite数据库文件路径，":memory:"表示只保存在内存中
+            ttl: 缓存有效期（秒），None表示永不过期
+            max_entries: 最多保存的记录数
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS judgments ("
+                "key TEXT PRIMARY KEY, result TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_judgments_accessed_at ON judgments (accessed_at)")
+        self._size = self._conn.execute("SELECT COUNT(*) FROM judgments").fetchone()[0]
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """读取缓存，不存在或已过期时返回None"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT result, created_at FROM judgments WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+
+            result, created_at = row
+            with self._conn:
+                if self.ttl is not None and now - created_at > self.ttl:
+                    self._conn.execute("DELETE FROM judgments WHERE key = ?", (key,))
+                    self._size -= 1
+                    return None
+                self._conn.execute("UPDATE judgments SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(result)
+
+    def set(self, key: str, result: Dict[str, Any]):
+        """写入缓存，写入后如果超出容量则淘汰最久未访问的记录"""
+        now = time.time()
+        data = json.dumps(result, ensure_ascii=False)
+        with self._lock, self._conn:
+            updated = self._conn.execute(
+                "UPDATE judgments SET result = ?, created_at = ?, accessed_at = ? WHERE key = ?",
+                (data, now, now, key)
+            ).rowcount
+            if not updated:
+                self._conn.execute(
+                    "INSERT INTO judgments (key, result, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, data, now, now)
+                )
+                self._size += 1
+
+            overflow = self._size - self.max_entries
+            if overflow > 0:
+                self._size -= self._conn.execute(
+                    "DELETE FROM judgments WHERE key IN "
+                    "(SELECT key FROM judgments ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,)
+                ).rowcount
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM judgments")
+            self._size = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._size
+
+
+class CachedModel(AIModel):
+    """
+    给任意AIModel加上持久化缓存
+
+    缓存键为 (模型类型, 模型的cache_key_attributes(), 用户需求, 职位描述) 的哈希，任何一项变化都会重新调用模型；
+    执行失败的结果（success为False）不会被缓存。被包装的模型支持批量判断时，judge_batch只把未命中缓存的职位
+    一次性交给模型，每个职位的结果分别缓存。
+    """
+
+    def __init__(self, ai_model: AIModel, cache: JudgmentCache = None):
+        """
+        Args:
+            ai_model: 被包装的模型
+            cache: 缓存存储，None时使用默认配置的JudgmentCache
+        """
+        self.ai_model = ai_model
+        self.cache = cache if cache is not None else JudgmentCache()
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    @property
+    def supports_batch(self) -> bool:
+        return getattr(self.ai_model, 'supports_batch', False)
+
+    def cache_key_attributes(self) -> Dict[str, Any]:
+        return self.ai_model.cache_key_attributes()
+
+    def make_key(self, user_requirements: str, job_description: str) -> str:
+        """计算缓存键"""
+        payload = json.dumps([
+            type(self.ai_model).__name__,
+            self.ai_model.cache_key_attributes(),
+            user_requirements,
+            job_description,
+        ], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def judge(self, user_requirements: str, job_description: str) -> Dict[str, Any]:
+        key = self.make_key(user_requirements, job_description)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        result = self.ai_model.judge(user_requirements, job_description)
+        self._store(key, result)
+        return result
+
+    def judge_batch(self, user_requirements: str, job_descriptions: List[str]) -> List[Dict[str, Any]]:
+        """逐个查询缓存，未命中的职位（相同的描述只算一次）交给被包装模型的judge_batch一次性判断"""
+        keys = [self.make_key(user_requirements, job_description) for job_description in job_descriptions]
+        results: List[Optional[Dict[str, Any]]] = [self._lookup(key) for key in keys]
+
+        missing: Dict[str, List[int]] = {}
+        for idx, result in enumerate(results):
+            if result is None:
+                missing.setdefault(keys[idx], []).append(idx)
+        if missing:
+            fresh = self.ai_model.judge_batch(user_requirements,
+                                              [job_descriptions[indices[0]] for indices in missing.values()])
+            for (key, indices), result in zip(missing.items(), fresh):
+                self._store(key, result)
+                for idx in indices:
+                    results[idx] = result if idx == indices[0] else dict(result)
+        return results
+
+    def make_packs(self, user_requirements: str, job_descriptions: List[str]) -> Optional[List[List[int]]]:
+        """被包装的模型按包判断时（例如打包模式的QwenModel）返回它的分组，否则返回None"""
+        make_packs = getattr(self.ai_model, 'make_packs', None)
+        return make_packs(user_requirements, job_descriptions) if make_packs is not None else None
+
+    def judge_pack(self, user_requirements: str, job_descriptions: List[str]) -> Dict[int, Dict[str, Any]]:
+        """逐个查询缓存，只把未命中的职位作为一个包交给被包装模型的judge_pack，返回值的格式与judge_pack相同"""
+        keys, results, missing = self._lookup_pack(user_requirements, job_descriptions)
+        if missing:
+            fresh = self.ai_model.judge_pack(user_requirements, [job_descriptions[idx] for idx in missing])
+            self._store_pack(keys, missing, fresh, results)
+        return results
+
+    async def ajudge_pack(self, user_requirements: str, job_descriptions: List[str]) -> Dict[int, Dict[str, Any]]:
+        """judge_pack的异步版本；被包装的模型没有ajudge_pack时在线程池中调用它的judge_pack"""
+        keys, results, missing = self._lookup_pack(user_requirements, job_descriptions)
+        if missing:
+            missing_descriptions = [job_descriptions[idx] for idx in missing]
+            ajudge_pack = getattr(self.ai_model, 'ajudge_pack', None)
+            if ajudge_pack is not None:
+                fresh = await ajudge_pack(user_requirements, missing_descriptions)
+            else:
+                loop = asyncio.get_running_loop()
+                fresh = await loop.run_in_executor(None, self.ai_model.judge_pack, user_requirements,
+                                                   missing_descriptions)
+            self._store_pack(keys, missing, fresh, results)
+        return results
+
+    def _lookup_pack(self, user_requirements: str, job_descriptions: List[str]):
+        """查询一个包中每个职位的缓存，返回 (缓存键, 命中的结果, 未命中的下标)"""
+        keys = [self.make_key(user_requirements, job_description) for job_description in job_descriptions]
+        results: Dict[int, Dict[str, Any]] = {}
+        missing = []
+        for idx, key in enumerate(keys):
+            cached = self._lookup(key)
+            if cached is None:
+                missing.append(idx)
+            else:
+                results[idx] = cached
+        return keys, results, missing
+
+    def _store_pack(self, keys: List[str], missing: List[int], fresh: Dict[int, Dict[str, Any]],
+                    results: Dict[int, Dict[str, Any]]):
+        """缓存未命中职位的打包判断结果，并填入results"""
+        for local_index, result in fresh.items():
+            idx = missing[local_index]
+            self._store(keys[idx], result)
+            results[idx] = result
+
+    async def ajudge(self, user_requirements: str, job_description: str) -> Dict[str, Any]:
+        key = self.make_key(user_requirements, job_description)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        result = await self.ai_model.ajudge(user_requirements, job_description)
+        self._store(key, result)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        缓存统计信息
+
+        Returns:
+            包含hits（命中次数）、misses（未命中次数）、hit_rate（命中率）、size（当前缓存记录数）的字典
+        """
+        with self._stats_lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total else 0.0,
+            'size': len(self.cache),
+        }
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        cached = self.cache.get(key)
+        with self._stats_lock:
+            if cached is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return cached
+
+    def _store(self, key: str, result: Dict[str, Any]):
+        # 失败的结果不缓存，下次重新调用模型
+        if "success" in result and not result["success"]:
+            return
+        self.cache.set(key, result)
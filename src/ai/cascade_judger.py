@@ -0,0 +1,125 @@
+from typing import Dict, Any, List, Optional
+import asyncio
+from .ai_model import AIModel
+from .ai_judger import AIJudger
+
+
+class CascadeJudger(AIJudger):
+    """
+    两阶段的AI判断协调器
+
+    第一阶段用廉价的向量模型（例如BERTModel）给所有职位打分，第二阶段只把排名靠前、分数足够高的候选职位
+    交给大模型（例如QwenModel）精判。被筛掉的职位一律不推荐（decision为False），score保留向量模型的分数，
+    只用于排序和生成原因：向量分数与大模型分数的分布不同，不能套用同一个threshold。
+    """
+
+    def __init__(self,
+                 prefilter_model: AIModel,
+                 ai_model: AIModel,
+                 user_requirements,
+                 threshold: float = 0.7,
+                 top_n: Optional[int] = 10,
+                 min_prefilter_score: Optional[float] = None,
+                 max_workers: int = 1,
+                 timeout: Optional[float] = None,
+                 dedup_threshold: Optional[float] = None):
+        """
+        Args:
+            prefilter_model: 第一阶段打分用的模型，需要返回score
+            ai_model: 第二阶段精判用的模型
+            user_requirements: 默认的用户需求
+            threshold: 判断是否推荐的分数阈值
+            top_n: 最多交给大模型的职位数量，None表示不限制
+            min_prefilter_score: 交给大模型的最低向量分数，None表示不限制；与top_n同时设置时两个条件都要满足
+            max_workers: 第二阶段并行调用大模型的最大并发数
+            timeout: 单次大模型调用的超时时间（秒）
+            dedup_threshold: 近似重复检测的相似度阈值，设置后近似重复的职位在两个阶段都只判断一次
+        """
+        super().__init__(ai_model, user_requirements, threshold, max_workers, timeout, dedup_threshold)
+        self.prefilter_model = prefilter_model
+        self.top_n = top_n
+        self.min_prefilter_score = min_prefilter_score
+        # 最近一次judge_batch的统计信息
+        self.last_stats = {'total': 0, 'llm_calls': 0, 'llm_calls_avoided': 0}
+
+    def _judge_unique(self, job_descriptions: List[str], job_info_list: Optional[List],
+                      user_requirements: str) -> List[Dict[str, Any]]:
+        """
+        两阶段判断去重之后的职位，返回结果与job_descriptions按下标一一对应
+
+        judge_batch经由这里完成判断。每个结果额外包含stage字段（"prefilter"表示被第一阶段筛掉，"llm"表示经过大模型判断）
+        和prefilter_score字段；本次调用节省的大模型调用次数记录在last_stats中（近似重复节省的调用见last_dedup_stats）。
+        """
+        prefilter_scores = self._prefilter(job_descriptions, user_requirements)
+        candidates = self._select_candidates(prefilter_scores)
+        candidate_descriptions = [job_descriptions[idx] for idx in candidates]
+        if getattr(self.ai_model, 'supports_batch', False):
+            llm_results = self._batch_judge(candidate_descriptions, user_requirements)
+        else:
+            llm_results = self._judge_many(candidate_descriptions, user_requirements)
+        return self._merge_stages(prefilter_scores, candidates, llm_results, job_info_list)
+
+    async def _ajudge_unique(self, job_descriptions: List[str], job_info_list: Optional[List],
+                             user_requirements: str) -> List[Dict[str, Any]]:
+        """
+        _judge_unique的异步版本，ajudge_batch经由这里完成判断，结果和last_stats与同步版本相同
+
+        第一阶段的向量模型在线程池中运行，避免阻塞事件循环；候选职位并发调用大模型（支持打包时按包发送）
+        """
+        loop = asyncio.get_running_loop()
+        prefilter_scores = await loop.run_in_executor(None, self._prefilter, job_descriptions, user_requirements)
+        candidates = self._select_candidates(prefilter_scores)
+        llm_results = await self._ajudge_many([job_descriptions[idx] for idx in candidates], user_requirements)
+        return self._merge_stages(prefilter_scores, candidates, llm_results, job_info_list)
+
+    def _prefilter(self, job_descriptions: List[str], user_requirements: str) -> List[Optional[float]]:
+        """第一阶段：用向量模型给所有职位打分，打分失败的职位分数为None"""
+        try:
+            prefilter_results = self.prefilter_model.judge_batch(user_requirements, job_descriptions)
+        except Exception as e:
+            prefilter_results = [{"success": False, "error": str(e)} for _ in job_descriptions]
+        return [result.get('score') for result in prefilter_results]
+
+    def _merge_stages(self, prefilter_scores: List[Optional[float]], candidates: List[int],
+                      llm_results: List[Dict[str, Any]], job_info_list: Optional[List]) -> List[Dict[str, Any]]:
+        """合并两个阶段的结果并更新last_stats，被筛掉的职位不推荐，分数和原因来自向量模型"""
+        llm_results_by_index = dict(zip(candidates, llm_results))
+
+        results = []
+        for idx, score in enumerate(prefilter_scores):
+            if idx in llm_results_by_index:
+                result = llm_results_by_index[idx]
+                result['stage'] = 'llm'
+            else:
+                result = {
+                    'score': score,
+                    'decision': False,
+                    'reason': f"向量模型预筛分数为{score:.2%}，未进入大模型精判的候选范围",
+                    'stage': 'prefilter',
+                }
+            result['prefilter_score'] = score
+            results.append(self._post_process(result, job_info_list[idx] if job_info_list else None))
+
+        self.last_stats = {
+            'total': len(prefilter_scores),
+            'llm_calls': len(candidates),
+            'llm_calls_avoided': len(prefilter_scores) - len(candidates),
+        }
+        return results
+
+    def _select_candidates(self, prefilter_scores: List[Optional[float]]) -> List[int]:
+        """
+        选出需要交给大模型的职位下标
+
+        第一阶段打分失败的职位没有分数，为了不漏掉它们，一律交给大模型
+        """
+        failed = [idx for idx, score in enumerate(prefilter_scores) if score is None]
+        scored = [idx for idx, score in enumerate(prefilter_scores) if score is not None]
+
+        if self.min_prefilter_score is not None:
+            scored = [idx for idx in scored if prefilter_scores[idx] >= self.min_prefilter_score]
+        scored.sort(key=lambda idx: prefilter_scores[idx], reverse=True)
+        if self.top_n is not None:
+            scored = scored[:self.top_n]
+
+        return sorted(scored + failed)
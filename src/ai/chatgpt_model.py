@@ -1,6 +1,11 @@
 import openai
-from typing import Dict, Any
+import json
+from typing import Dict, Any, Optional
+from openai import AsyncOpenAI
 from .ai_model import AIModel
+from .concurrency import get_endpoint_semaphore, set_endpoint_limit
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
 
 
 DEFAULT_PROMPT_TEMPLATE = """
@@ -27,11 +32,26 @@ class ChatGPTModel(AIModel):
     def __init__(self,
                  api_key: str,
                  model: str = "gpt-3.5-turbo",
-                 prompt_template: str = None):
+                 prompt_template: str = None,
+                 base_url: str = DEFAULT_BASE_URL,
+                 max_concurrency: Optional[int] = None,
+                 timeout: Optional[float] = None):
 
         openai.api_key = api_key
+        self.api_key = api_key
         self.model = model
+        self.base_url = base_url
         self.prompt_template = prompt_template if prompt_template else DEFAULT_PROMPT_TEMPLATE
+        # 单次请求的超时时间（秒），传给OpenAI客户端，None表示使用客户端的默认值
+        self.timeout = timeout
+
+        # 异步客户端在第一次调用ajudge时创建
+        self._async_client = None
+        if max_concurrency is not None:
+            set_endpoint_limit(base_url, max_concurrency)
+
+    def cache_key_attributes(self) -> Dict[str, Any]:
+        return {'model': self.model, 'prompt_template': self.prompt_template}
 
     def judge(self, user_requirements: str, job_description: str) -> Dict[str, Any]:
         prompt = self.prompt_template.format(
@@ -40,7 +60,8 @@ class ChatGPTModel(AIModel):
         try:
             response = openai.ChatCompletion.create(
                 model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}]
+                messages=[{"role": "user", "content": prompt}],
+                request_timeout=self.timeout
             )
 
             # 解析ChatGPT的JSON响应
@@ -49,3 +70,34 @@ class ChatGPTModel(AIModel):
 
         except Exception as e:
             raise Exception(f"ChatGPT API调用失败: {str(e)}")
+
+    async def ajudge(self, user_requirements: str, job_description: str) -> Dict[str, Any]:
+        """
+        judge的原生异步实现，使用AsyncOpenAI，同一端点的并发请求数受进程级信号量限制
+        """
+        prompt = self.prompt_template.format(
+            user_requirements=user_requirements, job_description=job_description)
+        if self._async_client is None:
+            client_kwargs = {'api_key': self.api_key, 'base_url': self.base_url}
+            if self.timeout is not None:
+                client_kwargs['timeout'] = self.timeout
+            self._async_client = AsyncOpenAI(**client_kwargs)
+
+        try:
+            async with get_endpoint_semaphore(self.base_url):
+                response = await self._async_client.chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}]
+                )
+
+            # 解析ChatGPT的JSON响应，兼容用```包裹的情况
+            content = response.choices[0].message.content
+            code_blocks = self._extract_code_blocks(content)
+            if isinstance(code_blocks, list):
+                content = code_blocks[0]
+            if content.lstrip().startswith('json'):
+                content = content.lstrip()[len('json'):]
+            return json.loads(content)
+
+        except Exception as e:
+            raise Exception(f"ChatGPT API调用失败: {str(e)}")
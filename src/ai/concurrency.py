@@ -0,0 +1,55 @@
+"""
+模型调用的进程级并发限制
+
+同一个API端点（base_url）的所有异步调用共享一个asyncio.Semaphore，无论创建了多少个模型实例，
+同时进行中的请求数都不会超过为该端点设置的上限。
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Dict
+
+DEFAULT_ENDPOINT_LIMIT = 8
+
+_endpoint_limits: Dict[str, int] = {}
+# asyncio.Semaphore只能在创建它的事件循环中使用，所以按事件循环分别保存
+_loop_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = \
+    weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def set_endpoint_limit(endpoint: str, limit: int):
+    """
+    设置某个端点同时进行中的请求数上限，只对之后新创建的信号量生效，应在发起请求前调用
+
+    Args:
+        endpoint: API端点，一般为base_url
+        limit: 并发上限
+    """
+    with _lock:
+        _endpoint_limits[endpoint] = max(1, limit)
+
+
+def get_endpoint_limit(endpoint: str) -> int:
+    """获取某个端点的并发上限，未设置时为DEFAULT_ENDPOINT_LIMIT"""
+    with _lock:
+        return _endpoint_limits.get(endpoint, DEFAULT_ENDPOINT_LIMIT)
+
+
+def get_endpoint_semaphore(endpoint: str) -> asyncio.Semaphore:
+    """
+    获取当前事件循环中某个端点共享的信号量，必须在协程中调用
+
+    用法:
+        async with get_endpoint_semaphore(base_url):
+            ...
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        semaphores = _loop_semaphores.setdefault(loop, {})
+        semaphore = semaphores.get(endpoint)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(_endpoint_limits.get(endpoint, DEFAULT_ENDPOINT_LIMIT))
+            semaphores[endpoint] = semaphore
+        return semaphore
@@ -0,0 +1,168 @@
+from typing import Dict, Any, List, Tuple
+import json
+import os
+import threading
+import numpy as np
+
+# 无法标识职位的job_id（解析失败时的占位值）与JobStore共用同一份定义，这些职位不加入索引
+from parsers.job_store import INVALID_JOB_IDS
+
+
+class JobEmbeddingIndex:
+    """
+    职位向量索引
+
+    每个job_id只编码一次，向量归一化后保存在磁盘上的.npy文件中，通过内存映射读取；
+    另有一个json文件保存行号对应的job_id。查询时一次矩阵向量乘法即可得到所有职位与用户需求的余弦相似度，
+    新解析到的职位可以随时追加。
+
+    encoder需要提供 encode(texts) -> np.ndarray 方法，例如BERTModel。
+    """
+
+    VECTORS_FILE = "vectors.npy"
+    META_FILE = "meta.json"
+
+    def __init__(self, encoder, index_dir: str, initial_capacity: int = 1024):
+        """
+        Args:
+            encoder: 文本编码器，需要提供encode方法
+            index_dir: 索引文件所在目录，不存在时自动创建，已存在索引时直接加载
+            initial_capacity: 新建索引时预分配的行数，容量不足时自动翻倍
+        """
+        self.encoder = encoder
+        self.index_dir = index_dir
+        self.initial_capacity = max(1, initial_capacity)
+        self._lock = threading.Lock()
+
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._vectors = None  # np.memmap，第一次添加向量时才知道维度
+
+        os.makedirs(index_dir, exist_ok=True)
+        if os.path.exists(self._meta_path):
+            self._load()
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.index_dir, self.VECTORS_FILE)
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.index_dir, self.META_FILE)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._rows
+
+    def add(self, job_ids: List[str], texts: List[str]) -> int:
+        """
+        追加职位向量，已在索引中的job_id和无效的job_id（INVALID_JOB_IDS）会被跳过
+
+        Args:
+            job_ids: 职位ID列表
+            texts: 与job_ids一一对应的职位描述文本
+
+        Returns:
+            实际新增的职位数量
+        """
+        with self._lock:
+            new_ids, new_texts, seen = [], [], set()
+            for job_id, text in zip(job_ids, texts):
+                if job_id in INVALID_JOB_IDS or job_id in self._rows or job_id in seen:
+                    continue
+                seen.add(job_id)
+                new_ids.append(job_id)
+                new_texts.append(text)
+            if not new_ids:
+                return 0
+
+            vectors = self._normalize(self.encoder.encode(new_texts))
+            start = len(self._ids)
+            self._ensure_capacity(start + len(new_ids), vectors.shape[1])
+            self._vectors[start:start + len(new_ids)] = vectors
+            self._vectors.flush()
+
+            for offset, job_id in enumerate(new_ids):
+                self._rows[job_id] = start + offset
+            self._ids.extend(new_ids)
+            self._save_meta()
+            return len(new_ids)
+
+    def add_jobs(self, jobs: List[Dict[str, Any]], job_descriptions: List[str]) -> int:
+        """
+        追加解析得到的职位
+
+        Args:
+            jobs: 职位信息字典列表，需要包含job_id
+            job_descriptions: 与jobs一一对应的格式化职位描述
+        """
+        return self.add([job.get('job_id') for job in jobs], job_descriptions)
+
+    def top_k(self, user_requirements: str, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        找出与用户需求最匹配的k个职位
+
+        Returns:
+            (job_id, 余弦相似度) 的列表，按相似度从高到低排序
+        """
+        if len(self._ids) == 0 or k <= 0:
+            return []
+
+        query = self._normalize(self.encoder.encode([user_requirements]))[0]
+        # 在锁内取得行数和向量矩阵的引用：扩容时会替换_vectors，而前count行在ids增加之前就已经写入，
+        # 之后在锁外用这份快照计算，不阻塞并发的add
+        with self._lock:
+            count = len(self._ids)
+            vectors = self._vectors
+            ids = self._ids
+        scores = vectors[:count] @ query
+
+        k = min(k, count)
+        if k < count:
+            candidates = np.argpartition(-scores, k - 1)[:k]
+        else:
+            candidates = np.arange(count)
+        ranked = candidates[np.argsort(-scores[candidates])]
+        return [(ids[row], float(scores[row])) for row in ranked]
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _ensure_capacity(self, required_rows: int, dim: int):
+        """容量不足时按翻倍扩容：新建一个更大的文件，复制已有向量后替换"""
+        if self._vectors is not None and self._vectors.shape[0] >= required_rows:
+            return
+
+        capacity = self.initial_capacity if self._vectors is None else self._vectors.shape[0]
+        while capacity < required_rows:
+            capacity *= 2
+
+        tmp_path = self._vectors_path + ".tmp"
+        new_vectors = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=(capacity, dim))
+        if self._vectors is not None:
+            count = len(self._ids)
+            new_vectors[:count] = self._vectors[:count]
+        new_vectors.flush()
+        del new_vectors
+        self._vectors = None
+        os.replace(tmp_path, self._vectors_path)
+        self._vectors = np.load(self._vectors_path, mmap_mode='r+')
+
+    def _save_meta(self):
+        tmp_path = self._meta_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'ids': self._ids}, f)
+        os.replace(tmp_path, self._meta_path)
+
+    def _load(self):
+        with open(self._meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self._ids = list(meta['ids'])
+        self._rows = {job_id: row for row, job_id in enumerate(self._ids)}
+        if os.path.exists(self._vectors_path):
+            self._vectors = np.load(self._vectors_path, mmap_mode='r+')
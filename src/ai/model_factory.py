@@ -0,0 +1,54 @@
+"""
+根据配置创建AI模型
+
+各个模型依赖的第三方库很重（BERTModel依赖torch和transformers，ChatGPTModel和QwenModel依赖openai），
+这里只在某个模型被选中时才导入它所在的模块，只用大模型API的程序不会加载torch，反之亦然。
+"""
+
+import importlib
+from typing import Dict, Any, Optional, Type
+from .ai_model import AIModel
+
+# 模型类型 -> (模块, 类名)
+MODEL_REGISTRY = {
+    'bert': ('.bert_model', 'BERTModel'),
+    'chatgpt': ('.chatgpt_model', 'ChatGPTModel'),
+    'qwen': ('.qwen_model', 'QwenModel'),
+}
+
+
+def get_model_class(model_type: str) -> Type[AIModel]:
+    """导入并返回模型类型对应的类"""
+    try:
+        module_name, class_name = MODEL_REGISTRY[model_type]
+    except KeyError:
+        raise ValueError(f"未知的模型类型: {model_type}，可选值为 {', '.join(MODEL_REGISTRY)}") from None
+    return getattr(importlib.import_module(module_name, __package__), class_name)
+
+
+def create_model(model_type: str, **kwargs) -> AIModel:
+    """创建指定类型的模型，kwargs原样传给模型的构造函数"""
+    return get_model_class(model_type)(**kwargs)
+
+
+def create_model_from_config(ai_model_config: Dict[str, Any], model_type: Optional[str] = None) -> AIModel:
+    """
+    根据配置文件中的ai_model部分创建模型
+
+    ai_model部分为 模型类型 -> 构造参数，另外可以用type字段指定使用哪一个，例如：
+        ai_model:
+          type: qwen
+          qwen: {api_key: ..., model_name: qwen-plus}
+          bert: {model_name: bert-base-uncased, backend: onnx}
+
+    Args:
+        ai_model_config: 配置文件中的ai_model部分
+        model_type: 使用的模型类型，为空时使用配置中的type；没有type且只配置了一个模型时使用该模型
+    """
+    model_type = model_type or ai_model_config.get('type')
+    if model_type is None:
+        configured = [key for key in ai_model_config if key in MODEL_REGISTRY]
+        if len(configured) != 1:
+            raise ValueError("ai_model配置中有多个模型，请用type字段指定使用哪一个")
+        model_type = configured[0]
+    return create_model(model_type, **(ai_model_config.get(model_type) or {}))
@@ -0,0 +1,123 @@
+"""
+职位描述的近似重复检测
+
+LinkedIn经常把同一个职位用不同的job_id重新发布，或者在多个地点发布描述完全相同的职位。
+这里用MinHash估计两段描述的Jaccard相似度（按词的k-shingle计算），再用LSH分桶只比较可能相似的描述，
+把近似重复的描述归为一组，每组只需要判断一个代表职位。
+"""
+
+import re
+import zlib
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+# MinHash使用的哈希函数族 (a * x + b) mod p，p为梅森素数2^31-1，保证乘积不会超出uint64
+_MERSENNE_PRIME = (1 << 31) - 1
+_WORD_PATTERN = re.compile(r'\w+')
+
+
+def _lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    选择LSH的分段数bands和每段的行数rows
+
+    两个签名至少有一段完全相同才会成为候选，相似度为s时的概率为 1 - (1 - s^rows)^bands，
+    曲线的拐点约为 (1 / bands)^(1 / rows)。这里选拐点不超过threshold的参数中拐点最高的一组，
+    尽量不漏掉相似度达到阈值的描述，误报的候选会在之后按签名估计的相似度过滤掉。
+    """
+    best = (num_perm, 1)
+    best_point = 0.0
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        point = (1.0 / bands) ** (1.0 / rows)
+        if best_point < point <= threshold:
+            best, best_point = (bands, rows), point
+    return best
+
+
+class NearDuplicateDetector:
+    """
+    基于MinHash + LSH的近似重复检测器
+
+    representatives返回每段文本所属分组的代表下标。分组是贪心进行的：按顺序处理文本，
+    与某个已有代表的估计相似度达到threshold时归入该代表的分组，否则自己成为新的代表，
+    因此每个成员都与它的代表直接相似，不会因为传递关系把差异较大的描述连在一起。
+    """
+
+    def __init__(self,
+                 threshold: float = 0.9,
+                 num_perm: int = 128,
+                 shingle_size: int = 5,
+                 min_words: int = 50,
+                 seed: int = 1):
+        """
+        Args:
+            threshold: 判定为近似重复的Jaccard相似度阈值
+            num_perm: MinHash签名的长度，越长估计越准确，计算量也越大
+            shingle_size: 每个shingle包含的词数
+            min_words: 词数少于该值的文本不参与去重（例如详情页抓取失败的职位），短文本的相似度不可靠
+            seed: 生成哈希函数参数的随机种子，固定种子使签名在多次运行之间保持一致
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold必须在(0, 1]之间")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = max(1, shingle_size)
+        self.min_words = min_words
+        self.bands, self.rows = _lsh_params(threshold, num_perm)
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+
+    def _shingles(self, text: str) -> Optional[np.ndarray]:
+        """把文本切分为词的shingle并哈希为整数，词数不足min_words时返回None"""
+        words = _WORD_PATTERN.findall(text.lower())
+        if len(words) < max(self.min_words, 1):
+            return None
+        size = min(self.shingle_size, len(words))
+        hashes = {zlib.crc32(' '.join(words[idx:idx + size]).encode('utf-8'))
+                  for idx in range(len(words) - size + 1)}
+        return np.fromiter(hashes, dtype=np.uint64, count=len(hashes)) % _MERSENNE_PRIME
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """计算文本的MinHash签名，文本太短时返回None"""
+        shingles = self._shingles(text)
+        if shingles is None:
+            return None
+        hashed = (self._a[:, None] * shingles[None, :] + self._b[:, None]) % _MERSENNE_PRIME
+        return hashed.min(axis=1)
+
+    @staticmethod
+    def similarity(signature_a: np.ndarray, signature_b: np.ndarray) -> float:
+        """根据两个MinHash签名估计Jaccard相似度"""
+        return float(np.mean(signature_a == signature_b))
+
+    def representatives(self, texts: List[str]) -> List[int]:
+        """
+        对一组文本进行近似重复分组
+
+        Returns:
+            与texts按下标一一对应的列表，每项为该文本所属分组的代表下标；代表自身对应的值就是自己的下标
+        """
+        result = list(range(len(texts)))
+        buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        signatures: Dict[int, np.ndarray] = {}
+
+        for idx, text in enumerate(texts):
+            signature = self.signature(text) if text else None
+            if signature is None:
+                continue
+            keys = [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                    for band in range(self.bands)]
+
+            candidates = sorted({candidate for key in keys for candidate in buckets.get(key, ())})
+            for candidate in candidates:
+                if self.similarity(signature, signatures[candidate]) >= self.threshold:
+                    result[idx] = candidate
+                    break
+            else:
+                # 成为新的代表，只有代表会被放入桶中参与之后的比较
+                signatures[idx] = signature
+                for key in keys:
+                    buckets.setdefault(key, []).append(idx)
+        return result
@@ -1,9 +1,10 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from .ai_model import AIModel
+from .concurrency import get_endpoint_semaphore, set_endpoint_limit
 import json
+import logging
 
-import os
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 
 DEFAULT_PROMPT_TEMPLATE = """
 请分析以下求职者的需求和职位描述的匹配程度：
@@ -22,6 +23,31 @@ DEFAULT_PROMPT_TEMPLATE = """
 请用JSON格式回答，包含score、decision和reason三个字段，注意你只需要给我一个JSON格式的内容就好了，且reason字段请尽可能的精简，整个JSON 请使用```前后包裹。
 """
 
+PACKED_PROMPT_TEMPLATE = """
+请分析以下求职者的需求和多个职位描述的匹配程度：
+
+求职者需求：
+{user_requirements}
+
+下面共有{job_count}个职位，每个职位以“### 职位 编号”开头：
+{job_descriptions}
+
+请对每个职位分别给出：
+1. job_index：职位编号（整数）
+2. score：匹配度评分（0-1之间）
+3. decision：是否推荐（true/false）
+4. reason：详细的推荐理由或不推荐理由
+
+请用一个JSON数组回答，数组中每个元素对应一个职位，包含job_index、score、decision和reason四个字段，注意你只需要给我一个JSON格式的内容就好了，且reason字段请尽可能的精简，整个JSON 请使用```前后包裹。
+"""
+
+PACKED_JOB_TEMPLATE = """
+### 职位 {job_index}
+{job_description}
+"""
+
+logger = logging.getLogger(__name__)
+
 
 class QwenModel(AIModel):
     """基于Qwen的文本匹配模型"""
@@ -30,24 +56,116 @@ class QwenModel(AIModel):
                  api_key: str,
                  model_name: str = "qwen-plus",
                  base_url: str = "https://dashscope.aliyuncs.com/compatible-mode/v1",
-                 prompt_template: str = None):
+                 prompt_template: str = None,
+                 max_concurrency: Optional[int] = None,
+                 pack_token_budget: Optional[int] = None,
+                 packed_prompt_template: str = None,
+                 timeout: Optional[float] = None):
+        """
+        Args:
+            api_key: API密钥
+            model_name: 模型名称
+            base_url: API端点
+            prompt_template: 提示词模板，包含user_requirements和job_description两个占位符
+            max_concurrency: 异步调用时该端点同时进行中的请求数上限（进程内所有实例共享），None表示使用默认值
+            pack_token_budget: 设置后启用打包模式，judge_batch会把多个职位放进同一个请求，每个请求的提示词不超过该token数（估算值）
+            packed_prompt_template: 打包模式的提示词模板，包含user_requirements、job_count和job_descriptions三个占位符
+            timeout: 单次请求的超时时间（秒），传给OpenAI客户端，超时的请求会被取消；None表示使用客户端的默认值
+        """
         self.api_key = api_key
         self.model_name = model_name
+        self.base_url = base_url
         self.prompt_template = prompt_template if prompt_template else DEFAULT_PROMPT_TEMPLATE
+        self.timeout = timeout
 
-        self.client = OpenAI(
-            api_key=self.api_key,
-            base_url=base_url,
-        )
+        self.client = OpenAI(**self._client_kwargs())
+        # 异步客户端在第一次调用ajudge时创建
+        self._async_client = None
 
-    def judge(self, user_requirements: str, job_description: str) -> Dict[str, Any]:
+        if max_concurrency is not None:
+            set_endpoint_limit(base_url, max_concurrency)
+
+        # 打包模式下AIJudger通过make_packs分组，每组调用一次judge_pack（异步时为ajudge_pack）
+        self.pack_token_budget = pack_token_budget
+        self.packed_prompt_template = packed_prompt_template if packed_prompt_template else PACKED_PROMPT_TEMPLATE
+        self.supports_batch = pack_token_budget is not None
+
+    def cache_key_attributes(self) -> Dict[str, Any]:
+        return {
+            'model_name': self.model_name,
+            'prompt_template': self.prompt_template,
+            'packed_prompt_template': self.packed_prompt_template,
+        }
+
+    def _client_kwargs(self) -> Dict[str, Any]:
+        kwargs = {'api_key': self.api_key, 'base_url': self.base_url}
+        if self.timeout is not None:
+            kwargs['timeout'] = self.timeout
+        return kwargs
+
+    def _build_messages(self, user_requirements: str, job_description: str) -> List[Dict[str, str]]:
         prompt = self.prompt_template.format(
             user_requirements=user_requirements, job_description=job_description)
-        messages = [{'role': 'system', 'content': 'You are a helpful assistant.'},
-                    {'role': 'user', 'content': prompt}]
+        return self._wrap_prompt(prompt)
+
+    @staticmethod
+    def _wrap_prompt(prompt: str) -> List[Dict[str, str]]:
+        return [{'role': 'system', 'content': 'You are a helpful assistant.'},
+                {'role': 'user', 'content': prompt}]
+
+    def _chat(self, messages: List[Dict[str, str]]) -> str:
+        """以流式方式调用模型，返回拼接后的完整回复"""
+        completion = self.client.chat.completions.create(
+            model=self.model_name,
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+
+        chunks_content = []
+        for chunk in completion:
+            chunks_content.append(chunk.choices[0].delta.content if len(chunk.choices) > 0 else "")
+        return "".join(chunks_content)
+
+    def _parse_response(self, response: str) -> Dict[str, Any]:
+        ret_json = self._extract_code_blocks(response)
+        ret_json = json.loads(ret_json[0])
+        ret_json["success"] = True
+        return ret_json
+
+    def judge(self, user_requirements: str, job_description: str) -> Dict[str, Any]:
+        messages = self._build_messages(user_requirements, job_description)
+
+        try:
+            response = self._chat(messages)
+            return self._parse_response(response)
+
+        except Exception as e:
+            logger.warning(f"Qwen API调用失败: {str(e)}")
+            ret_json = {"success": False, "error": str(e)}
+            return ret_json
+
+    async def ajudge(self, user_requirements: str, job_description: str) -> Dict[str, Any]:
+        """
+        judge的原生异步实现，使用AsyncOpenAI，同一端点的并发请求数受进程级信号量限制
+        """
+        messages = self._build_messages(user_requirements, job_description)
 
         try:
-            completion = self.client.chat.completions.create(
+            response = await self._achat(messages)
+            return self._parse_response(response)
+
+        except Exception as e:
+            logger.warning(f"Qwen API调用失败: {str(e)}")
+            return {"success": False, "error": str(e)}
+
+    async def _achat(self, messages: List[Dict[str, str]]) -> str:
+        """_chat的异步版本，同一端点的并发请求数受进程级信号量限制"""
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(**self._client_kwargs())
+
+        async with get_endpoint_semaphore(self.base_url):
+            completion = await self._async_client.chat.completions.create(
                 model=self.model_name,
                 messages=messages,
                 stream=True,
@@ -55,22 +173,123 @@ class QwenModel(AIModel):
             )
 
             chunks_content = []
-            for chunk in completion:
+            async for chunk in completion:
                 chunks_content.append(chunk.choices[0].delta.content if len(chunk.choices) > 0 else "")
+        return "".join(chunks_content)
 
-            response = "".join(chunks_content)
-            ret_json = self._extract_code_blocks(response)
-            ret_json = json.loads(ret_json[0])
-            ret_json["success"] = True
-            return ret_json
+    def judge_batch(self, user_requirements: str, job_descriptions: List[str]) -> List[Dict[str, Any]]:
+        """
+        批量判断多个职位
 
-        except Exception as e:
-            # TODO: 考虑改成日志
-            print(f"Qwen API调用失败: {str(e)}")
-            ret_json = {"success": False, "error": str(e)}
-            return ret_json
+        打包模式下，在不超过pack_token_budget的前提下把尽可能多的职位放进同一个请求，要求模型返回
+        {job_index, score, decision, reason} 组成的JSON数组，再按job_index对应回各个职位；
+        回复格式错误或缺少某些职位时，只对缺少的职位单独调用judge。未启用打包模式时逐个调用judge。
+        这里依次发送各个请求；AIJudger通过make_packs和judge_pack自行调度，各个请求并行并受其timeout限制。
+        """
+        packs = self.make_packs(user_requirements, job_descriptions)
+        if packs is None:
+            return super().judge_batch(user_requirements, job_descriptions)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(job_descriptions)
+        for pack in packs:
+            if len(pack) == 1:
+                continue  # 只有一个职位时直接走单个职位的判断
+
+            try:
+                packed_results = self.judge_pack(user_requirements, [job_descriptions[idx] for idx in pack])
+            except Exception as e:
+                logger.warning(f"Qwen API打包调用失败，改为逐个判断: {str(e)}")
+                continue
+
+            for local_index, result in packed_results.items():
+                results[pack[local_index]] = result
+
+        # 打包请求中缺失的职位逐个补判
+        for idx, result in enumerate(results):
+            if result is None:
+                results[idx] = self.judge(user_requirements, job_descriptions[idx])
+        return results
+
+    def make_packs(self, user_requirements: str, job_descriptions: List[str]) -> Optional[List[List[int]]]:
+        """打包模式下按token预算把职位分组，返回每组职位的下标；未启用打包模式时返回None"""
+        if self.pack_token_budget is None:
+            return None
+        return self._make_packs(user_requirements, job_descriptions)
+
+    def judge_pack(self, user_requirements: str, job_descriptions: List[str]) -> Dict[int, Dict[str, Any]]:
+        """
+        用一个请求判断一组职位
+
+        Returns:
+            {职位在包内的编号: 判断结果}，回复中缺少的职位不在其中；请求失败或回复无法解析时抛出异常
+        """
+        prompt = self._build_packed_prompt(user_requirements, job_descriptions)
+        return self._parse_packed_response(self._chat(self._wrap_prompt(prompt)), len(job_descriptions))
+
+    async def ajudge_pack(self, user_requirements: str, job_descriptions: List[str]) -> Dict[int, Dict[str, Any]]:
+        """judge_pack的异步版本，AIJudger.ajudge_batch在打包模式下通过它发送每个包"""
+        prompt = self._build_packed_prompt(user_requirements, job_descriptions)
+        return self._parse_packed_response(await self._achat(self._wrap_prompt(prompt)), len(job_descriptions))
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """粗略估算token数：中文字符约1个token，其他字符约4个字符1个token"""
+        cjk_count = sum(1 for ch in text if '\u4e00' <= ch <= '\u9fff')
+        return cjk_count + (len(text) - cjk_count) // 4 + 1
+
+    def _make_packs(self, user_requirements: str, job_descriptions: List[str]) -> List[List[int]]:
+        """按token预算把职位分组，返回每组职位的下标；单个职位超出预算时独占一组"""
+        base_tokens = self._estimate_tokens(
+            self.packed_prompt_template.format(user_requirements=user_requirements, job_count=0, job_descriptions=""))
+
+        packs, current, current_tokens = [], [], base_tokens
+        for idx, job_description in enumerate(job_descriptions):
+            job_tokens = self._estimate_tokens(
+                PACKED_JOB_TEMPLATE.format(job_index=len(current), job_description=job_description))
+            if current and current_tokens + job_tokens > self.pack_token_budget:
+                packs.append(current)
+                current, current_tokens = [], base_tokens
+            current.append(idx)
+            current_tokens += job_tokens
+        if current:
+            packs.append(current)
+        return packs
+
+    def _build_packed_prompt(self, user_requirements: str, job_descriptions: List[str]) -> str:
+        jobs_text = "".join(PACKED_JOB_TEMPLATE.format(job_index=idx, job_description=job_description)
+                            for idx, job_description in enumerate(job_descriptions))
+        return self.packed_prompt_template.format(
+            user_requirements=user_requirements, job_count=len(job_descriptions), job_descriptions=jobs_text)
+
+    def _parse_packed_response(self, response: str, job_count: int) -> Dict[int, Dict[str, Any]]:
+        """
+        解析打包请求的回复，返回 {职位在包内的编号: 判断结果}，格式不正确的元素会被忽略
+        """
+        code_blocks = self._extract_code_blocks(response)
+        text = code_blocks[0] if isinstance(code_blocks, list) else code_blocks
+        text = text.strip()
+        if text.startswith('json'):
+            text = text[len('json'):]
+
+        items = json.loads(text)
+        if not isinstance(items, list):
+            raise ValueError("打包请求的回复不是JSON数组")
 
+        parsed = {}
+        for item in items:
+            if not isinstance(item, dict) or 'score' not in item:
+                continue
+            try:
+                job_index = int(item['job_index'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if not 0 <= job_index < job_count or job_index in parsed:
+                continue
 
+            result = {key: value for key, value in item.items() if key != 'job_index'}
+            result["success"] = True
+            parsed[job_index] = result
+        return parsed
 
 
 # 流式输出的JSON格式：
@@ -3,5 +3,7 @@
 """
 
 from .job_match_server import JobMatchServer
+from .watcher import SearchWatcher, SavedSearch
+from .service import JobMatchService, MatchRequest
 
-__all__ = ["JobMatchServer"]
\ No newline at end of file
+__all__ = ["JobMatchServer", "SearchWatcher", "SavedSearch", "JobMatchService", "MatchRequest"]
\ No newline at end of file
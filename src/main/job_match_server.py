@@ -1,7 +1,24 @@
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List
+import queue
+import threading
 import yaml
 from parsers import WebParser, LinkedInParser
-from ai import AIJudger, QwenModel
+from ai import AIJudger, create_model_from_config
+
+# 流水线各阶段之间传递的结束标记
+_STREAM_END = object()
+
+
+def rank_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    按推荐程度排序判断结果：推荐的职位在前，同一决策内按分数从高到低，判断失败的职位排在最后
+    """
+    def sort_key(result: Dict[str, Any]):
+        failed = result.get('success') is False
+        score = result.get('score')
+        return failed, result.get('decision') is not True, -(score if isinstance(score, (int, float)) else -1.0)
+
+    return sorted(results, key=sort_key)
 
 
 class JobMatchServer:
@@ -11,16 +28,27 @@ class JobMatchServer:
         self.parser = parser
         self.judger = judger
 
+    def crawl(self, job_url: str, max_num: int = -1) -> List[Dict[str, Any]]:
+        """解析一次检索结果中的所有职位"""
+        return self.parser.parse(job_url, max_num)
+
+    def judge(self, job_info_list: List[Dict[str, Any]], user_requirements: str = "") -> List[Dict[str, Any]]:
+        """判断所有职位，返回按推荐程度排序的完整结果列表"""
+        if not job_info_list:
+            return []
+        job_str_description_list = self.parser.format_all_job_descriptions(job_info_list)
+        results = self.judger.judge_batch(job_str_description_list, job_info_list, user_requirements)
+        return rank_results(results)
+
     def process_job(self, job_url: str, max_num: int = -1, user_requirements: str = "") -> Dict[str, Any]:
         """
         处理一次linkedin职位检索结果 的匹配请求
+
+        Returns:
+            {'status': 'success', 'results': 按推荐程度排序的所有职位的判断结果}，出错时为 {'status': 'failed', 'error': ...}
         """
         try:
-            # 解析职位信息
-            job_info_list = self.parser.parse(job_url, max_num)
-            job_str_description_list = self.parser.format_all_job_descriptions(job_info_list)
-            result = self.judger.judge_batch(job_str_description_list, job_info_list, user_requirements)[0]
-            return result
+            return {'status': 'success', 'results': self.judge(self.crawl(job_url, max_num), user_requirements)}
 
         except Exception as e:
             return {
@@ -28,6 +56,91 @@ class JobMatchServer:
                 'status': 'failed'
             }
 
+    def process_job_stream(self,
+                           job_url: str,
+                           max_num: int = -1,
+                           user_requirements: str = "",
+                           queue_size: int = 8,
+                           judge_workers: int = 1) -> Iterator[Dict[str, Any]]:
+        """
+        以流水线方式处理一次linkedin职位检索结果的匹配请求，每判断完一个职位就产出一个结果
+
+        解析、判断两个阶段在不同线程中同时运行：解析线程通过parser.iter_parse逐个产出职位，
+        判断线程拿到职位后立即格式化并调用judger.judge_single。阶段之间使用有界队列，
+        下游处理不过来时上游会阻塞等待，总耗时约为 max(抓取耗时, 判断耗时)。
+        职位逐个判断，judger的近似重复检测（dedup_threshold）需要整批职位，在这里不生效；需要去重时使用process_job。
+
+        Args:
+            job_url: 搜索结果页的URL
+            max_num: 最多处理的职位数量，-1表示不限制
+            user_requirements: 用户需求，为空时使用judger中的默认需求
+            queue_size: 阶段之间队列的容量
+            judge_workers: 判断线程的数量
+
+        Returns:
+            产出判断结果的迭代器，顺序为完成顺序；解析失败时产出一个包含error的字典
+        """
+        judge_workers = max(1, judge_workers)
+        job_queue = queue.Queue(maxsize=queue_size)
+        result_queue = queue.Queue(maxsize=queue_size)
+        stop_event = threading.Event()
+
+        def put(q: queue.Queue, item) -> bool:
+            # 带停止检查的put，调用方提前结束迭代时各线程可以退出
+            while not stop_event.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def parse_stage():
+            try:
+                for job_info in self.parser.iter_parse(job_url, max_num):
+                    if not put(job_queue, job_info):
+                        return
+            except Exception as e:
+                put(result_queue, {'error': str(e), 'status': 'failed'})
+            finally:
+                for _ in range(judge_workers):
+                    put(job_queue, _STREAM_END)
+
+        def judge_stage():
+            try:
+                while not stop_event.is_set():
+                    try:
+                        job_info = job_queue.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                    if job_info is _STREAM_END:
+                        break
+                    job_description = self.parser.format_job_description_str(job_info)
+                    try:
+                        result = self.judger.judge_single(job_description, job_info, user_requirements)
+                    except Exception as e:
+                        result = {'success': False, 'error': str(e), 'job_info': job_info}
+                    if not put(result_queue, result):
+                        return
+            finally:
+                put(result_queue, _STREAM_END)
+
+        threads = [threading.Thread(target=parse_stage, daemon=True)]
+        threads += [threading.Thread(target=judge_stage, daemon=True) for _ in range(judge_workers)]
+        for thread in threads:
+            thread.start()
+
+        try:
+            finished_workers = 0
+            while finished_workers < judge_workers:
+                item = result_queue.get()
+                if item is _STREAM_END:
+                    finished_workers += 1
+                    continue
+                yield item
+        finally:
+            stop_event.set()
+
 
 if __name__ == '__main__':
     # 加载配置
@@ -38,10 +151,11 @@ if __name__ == '__main__':
     parser = LinkedInParser()
 
     # 初始化AI模型
-    ai_model = QwenModel(**config['ai_model']['qwen'])
+    ai_model = create_model_from_config(config['ai_model'])
     judger = AIJudger(
         ai_model,
         user_requirements=config['user_requirements'],
+        dedup_threshold=config.get('dedup_threshold'),
     )
 
     # 初始化主服务
@@ -0,0 +1,337 @@
+from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+import json
+import logging
+import queue
+import threading
+import time
+import uuid
+import yaml
+from parsers import LinkedInParser
+from ai import AIJudger, create_model_from_config
+from main.job_match_server import JobMatchServer
+
+# 请求队列已满时建议客户端等待的秒数
+RETRY_AFTER_SECONDS = 5
+# 抓取线程等待请求或判断名额时，每隔这么多秒检查一次是否已经停止
+POLL_INTERVAL = 0.1
+# 服务停止时仍未处理的请求的错误信息
+STOPPED_ERROR = "服务已停止，请求未被处理"
+
+
+class MatchRequest:
+    """一次匹配请求及其处理状态：queued -> crawling -> judging -> done / failed"""
+
+    def __init__(self, url: str, max_num: int = -1, user_requirements: str = ""):
+        self.id = uuid.uuid4().hex
+        self.url = url
+        self.max_num = max_num
+        self.user_requirements = user_requirements
+        self.status = 'queued'
+        self.results: Optional[List[Dict[str, Any]]] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.done = threading.Event()
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            'id': self.id,
+            'url': self.url,
+            'status': self.status,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+        }
+        if self.results is not None:
+            data['results'] = self.results
+        if self.error is not None:
+            data['error'] = self.error
+        return data
+
+
+class JobMatchService:
+    """
+    长期运行的求职匹配服务
+
+    通过本地HTTP接口接收匹配请求，模型只在启动时加载一次并一直保持在内存中。请求的处理分为两个阶段：
+    抓取线程从有界的请求队列中取出请求并解析职位，然后把职位交给判断线程池，抓取线程立即处理下一个请求。
+    判断阶段最多积压judge_backlog个请求，积压满时抓取线程等待，请求队列随之被填满，
+    队列满时新的请求直接返回429，而不是无限制地排队。
+
+    HTTP接口：
+        POST /match       请求体为JSON：url（必填）、max_num、user_requirements、wait、timeout，
+                          返回202和请求id；wait为true时等待处理完成（最多timeout秒）后返回完整结果
+        GET  /match/<id>  查询请求的状态，完成后包含按推荐程度排序的所有职位的判断结果
+        GET  /health      队列长度和各阶段的请求数
+    """
+
+    def __init__(self,
+                 server: JobMatchServer,
+                 host: str = "127.0.0.1",
+                 port: int = 8000,
+                 queue_size: int = 16,
+                 crawl_workers: int = 2,
+                 judge_workers: int = 2,
+                 judge_backlog: int = None,
+                 max_finished: int = 1000):
+        """
+        Args:
+            server: 负责解析和判断的JobMatchServer
+            host: 监听地址
+            port: 监听端口，0表示由系统分配（启动后通过port属性获取）
+            queue_size: 等待抓取的请求数量上限，超过时返回429
+            crawl_workers: 抓取线程数
+            judge_workers: 判断线程数
+            judge_backlog: 已抓取完成、等待或正在判断的请求数量上限，默认为judge_workers的两倍
+            max_finished: 保留多少个已完成请求的结果供查询，超过时丢弃最早完成的
+        """
+        self.server = server
+        self.host = host
+        self.queue_size = max(1, queue_size)
+        self.crawl_workers = max(1, crawl_workers)
+        self.judge_workers = max(1, judge_workers)
+        self.judge_backlog = max(1, judge_backlog if judge_backlog is not None else 2 * self.judge_workers)
+        self.max_finished = max(1, max_finished)
+        self.logger = logging.getLogger(__name__)
+
+        self._queue: "queue.Queue[MatchRequest]" = queue.Queue(maxsize=self.queue_size)
+        self._judge_slots = threading.BoundedSemaphore(self.judge_backlog)
+        self._requests: Dict[str, MatchRequest] = {}
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+        self._crawl_threads: List[threading.Thread] = []
+        self._judge_executor: Optional[ThreadPoolExecutor] = None
+        self._http_server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._http_server.daemon_threads = True
+        self._http_thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._http_server.server_address[1]
+
+    def start(self) -> "JobMatchService":
+        """预热模型，启动抓取线程、判断线程池和HTTP服务，立即返回"""
+        self._warm_up()
+        self._stop_event.clear()
+        self._judge_executor = ThreadPoolExecutor(max_workers=self.judge_workers, thread_name_prefix="match-judge")
+        self._crawl_threads = [threading.Thread(target=self._crawl_loop, name=f"match-crawl-{idx}", daemon=True)
+                               for idx in range(self.crawl_workers)]
+        for thread in self._crawl_threads:
+            thread.start()
+        self._http_thread = threading.Thread(target=self._http_server.serve_forever, name="match-http", daemon=True)
+        self._http_thread.start()
+        self.logger.info(f"匹配服务已启动: http://{self.host}:{self.port}")
+        return self
+
+    def run(self):
+        """启动服务并阻塞，直到调用stop或收到KeyboardInterrupt"""
+        self.start()
+        try:
+            self._stop_event.wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        """
+        停止接收请求，等待正在处理的请求完成后关闭各线程
+
+        队列中还没开始处理的请求、以及抓取完成后还在等待判断名额的请求都标记为failed，等待结果的客户端随之返回
+        """
+        self._stop_event.set()
+        if self._http_thread is not None:
+            self._http_server.shutdown()
+            self._http_thread.join()
+            self._http_thread = None
+        self._http_server.server_close()
+        for thread in self._crawl_threads:
+            thread.join()
+        self._crawl_threads = []
+        self._fail_queued()
+        if self._judge_executor is not None:
+            self._judge_executor.shutdown(wait=True)
+            self._judge_executor = None
+
+    def _fail_queued(self):
+        """清空请求队列，把其中的请求标记为failed"""
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self._finish(request, 'failed', error=STOPPED_ERROR)
+
+    def _warm_up(self):
+        """让本地向量模型先完成一次推理（例如ONNX Runtime的初始化），第一个请求不必承担这部分延迟"""
+        judger = self.server.judger
+        for model in (judger.ai_model, getattr(judger, 'prefilter_model', None)):
+            if model is not None and hasattr(model, 'encode'):
+                model.encode(["warm up"])
+
+    def submit(self, url: str, max_num: int = -1, user_requirements: str = "") -> MatchRequest:
+        """
+        提交一个匹配请求
+
+        Raises:
+            queue.Full: 请求队列已满
+        """
+        request = MatchRequest(url, max_num, user_requirements)
+        with self._lock:
+            self._requests[request.id] = request
+        try:
+            self._queue.put_nowait(request)
+        except queue.Full:
+            with self._lock:
+                del self._requests[request.id]
+            raise
+        return request
+
+    def get(self, request_id: str) -> Optional[MatchRequest]:
+        with self._lock:
+            return self._requests.get(request_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = list(self._requests.values())
+        counts = {'queued': 0, 'crawling': 0, 'judging': 0, 'done': 0, 'failed': 0}
+        for request in requests:
+            counts[request.status] += 1
+        return {
+            'queue_size': self.queue_size,
+            'queue_length': self._queue.qsize(),
+            'crawl_workers': self.crawl_workers,
+            'judge_workers': self.judge_workers,
+            'requests': counts,
+        }
+
+    def _crawl_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                request = self._queue.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+
+            request.status = 'crawling'
+            try:
+                job_info_list = self.server.crawl(request.url, request.max_num)
+            except Exception as e:
+                self.logger.error(f"解析失败 {request.url}: {str(e)}")
+                self._finish(request, 'failed', error=str(e))
+                continue
+
+            # 判断阶段积压已满时在这里等待，抓取线程不再从队列中取请求，新的请求因队列已满而被拒绝
+            if not self._acquire_judge_slot():
+                self._finish(request, 'failed', error=STOPPED_ERROR)
+                break
+            request.status = 'judging'
+            self._judge_executor.submit(self._judge, request, job_info_list)
+
+    def _acquire_judge_slot(self) -> bool:
+        """等待一个判断名额，服务停止时放弃等待并返回False"""
+        while not self._stop_event.is_set():
+            if self._judge_slots.acquire(timeout=POLL_INTERVAL):
+                return True
+        return False
+
+    def _judge(self, request: MatchRequest, job_info_list: List[Dict[str, Any]]):
+        try:
+            results = self.server.judge(job_info_list, request.user_requirements)
+        except Exception as e:
+            self.logger.error(f"判断失败 {request.url}: {str(e)}")
+            self._finish(request, 'failed', error=str(e))
+        else:
+            self._finish(request, 'done', results=results)
+        finally:
+            self._judge_slots.release()
+
+    def _finish(self, request: MatchRequest, status: str, results: List[Dict[str, Any]] = None, error: str = None):
+        request.results = results
+        request.error = error
+        request.finished_at = time.time()
+        request.status = status
+        request.done.set()
+        with self._lock:
+            self._finished[request.id] = None
+            while len(self._finished) > self.max_finished:
+                old_id, _ = self._finished.popitem(last=False)
+                self._requests.pop(old_id, None)
+
+    def _make_handler(self):
+        service = self
+
+        class MatchRequestHandler(BaseHTTPRequestHandler):
+
+            def do_POST(self):
+                if urlsplit(self.path).path.rstrip('/') != '/match':
+                    return self._send_json(404, {'error': 'not found'})
+                try:
+                    body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                    url = body['url']
+                    max_num = int(body.get('max_num', -1))
+                    timeout = body.get('timeout')
+                    timeout = float(timeout) if timeout is not None else None
+                except (ValueError, KeyError, TypeError) as e:
+                    return self._send_json(400, {'error': f"请求格式错误: {str(e)}"})
+
+                try:
+                    request = service.submit(url, max_num, body.get('user_requirements', ""))
+                except queue.Full:
+                    return self._send_json(429, {'error': "请求队列已满，请稍后重试"},
+                                           {'Retry-After': str(RETRY_AFTER_SECONDS)})
+
+                if body.get('wait') and request.done.wait(timeout):
+                    return self._send_json(200, request.to_dict())
+                self._send_json(202, {'id': request.id, 'status': request.status})
+
+            def do_GET(self):
+                path = urlsplit(self.path).path.rstrip('/')
+                if path == '/health':
+                    return self._send_json(200, service.stats())
+                if path.startswith('/match/'):
+                    request = service.get(path[len('/match/'):])
+                    if request is not None:
+                        return self._send_json(200, request.to_dict())
+                self._send_json(404, {'error': 'not found'})
+
+            def _send_json(self, status: int, payload: Dict[str, Any], headers: Dict[str, str] = None):
+                data = json.dumps(payload, ensure_ascii=False, default=dict).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                service.logger.debug(f"{self.address_string()} {format % args}")
+
+        return MatchRequestHandler
+
+
+if __name__ == '__main__':
+    # 加载配置
+    with open('config/config.yaml', 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    service_config = config.get('service', {})
+
+    parser = LinkedInParser(max_workers=service_config.get('parser_workers', 1))
+    ai_model = create_model_from_config(config['ai_model'])
+    judger = AIJudger(ai_model, user_requirements=config['user_requirements'],
+                      dedup_threshold=config.get('dedup_threshold'))
+
+    logging.basicConfig(level=logging.INFO)
+    JobMatchService(
+        JobMatchServer(parser, judger),
+        host=service_config.get('host', "127.0.0.1"),
+        port=service_config.get('port', 8000),
+        queue_size=service_config.get('queue_size', 16),
+        crawl_workers=service_config.get('crawl_workers', 2),
+        judge_workers=service_config.get('judge_workers', 2),
+    ).run()
@@ -0,0 +1,265 @@
+from typing import Dict, Any, List, Optional, Callable
+import heapq
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+import yaml
+from parsers import WebParser, LinkedInParser, JobStore
+from parsers.job_store import card_fingerprint
+from ai import AIJudger, create_model_from_config
+
+
+class SavedSearch:
+    """一个需要定期重新检查的搜索"""
+
+    def __init__(self, url: str, name: str = None, interval: float = 3600, max_num: int = -1,
+                 user_requirements: str = ""):
+        """
+        Args:
+            url: 搜索结果页的URL
+            name: 搜索的名称，用于日志和结果报告，默认为URL；已判断职位的记录也按名称区分，改名后会重新判断所有职位
+            interval: 检查间隔（秒）
+            max_num: 每次检查最多看多少个搜索结果，-1表示不限制
+            user_requirements: 该搜索使用的用户需求，为空时使用judger中的默认需求
+        """
+        self.url = url
+        self.name = name or url
+        self.interval = interval
+        self.max_num = max_num
+        self.user_requirements = user_requirements
+
+
+class SearchWatcher:
+    """
+    定期轮询多个保存的搜索，只判断新出现或有变化的职位
+
+    每个搜索分别记录判断成功的职位及其卡片指纹（保存在job_store中），轮询时通过iter_parse的card_filter
+    去掉该搜索已经判断过且卡片没有变化的职位，这些职位不会被抓取详情页，所以每次轮询的成本只与变化的职位数量成正比。
+    同一个职位出现在多个搜索中时在每个搜索里各判断一次（各搜索的用户需求可能不同）；判断失败的职位不做记录，
+    下次轮询时重新判断。
+    多个搜索在同一个抓取线程池中并发检查，所有搜索产出的职位在同一个判断线程池中排队，大模型调用的总并发数受judge_workers限制。
+    crawl_workers限制的是同时检查的搜索数，每个搜索内部仍由解析器自己的线程池抓取（详情页最多parser.max_workers个，
+    翻页最多parser.page_concurrency页），所以同时进行中的HTTP请求最多约为
+    crawl_workers × max(parser.max_workers, parser.page_concurrency)；对同一网站的请求速率由解析器共享的rate_limiter控制。
+    """
+
+    def __init__(self,
+                 parser: WebParser,
+                 judger: AIJudger,
+                 searches: List[SavedSearch],
+                 crawl_workers: int = 2,
+                 judge_workers: int = 2,
+                 jitter: float = 0.1,
+                 on_results: Callable[[SavedSearch, List[Dict[str, Any]]], None] = None):
+        """
+        Args:
+            parser: 网页解析器，应配置job_store；没有配置时使用内存中的JobStore，重启后会重新判断所有职位。
+                    轮询时对每次调用关闭增量模式（否则一个搜索中出现过的职位在其他搜索中不会再产出），
+                    解析器自身的incremental配置不变，可以与其他调用方共用
+            judger: AI判断器
+            searches: 需要轮询的搜索
+            crawl_workers: 同时检查的搜索数量上限（不是HTTP请求的并发数上限，见类的说明）
+            judge_workers: 同时进行的AI判断数量上限
+            jitter: 检查间隔的随机抖动比例，例如0.1表示实际间隔在interval的±10%之间，避免多个搜索同时触发
+            on_results: 每个搜索检查完成后的回调，参数为搜索和本次新职位的判断结果；默认打印推荐的职位
+        """
+        self.parser = parser
+        self.judger = judger
+        self.searches = list(searches)
+        self.crawl_workers = max(1, crawl_workers)
+        self.judge_workers = max(1, judge_workers)
+        self.jitter = max(0.0, jitter)
+        self.on_results = on_results or self._print_results
+        self.logger = logging.getLogger(__name__)
+
+        # 已判断职位的记录与解析器共用job_store；解析器没有配置时watcher自己使用内存中的JobStore，不修改解析器
+        self.job_store: JobStore = getattr(parser, 'job_store', None)
+        if self.job_store is None:
+            self.logger.warning("parser没有配置job_store，使用内存中的JobStore，重启后会重新判断所有职位")
+            self.job_store = JobStore(":memory:")
+
+        self._stop_event = threading.Event()
+        self._wake_up = threading.Event()
+        # run循环没有在运行时为set状态，stop通过它等待run退出
+        self._run_finished = threading.Event()
+        self._run_finished.set()
+        self._crawl_executor: Optional[ThreadPoolExecutor] = None
+        self._judge_executor: Optional[ThreadPoolExecutor] = None
+
+    def _executors(self):
+        if self._crawl_executor is None:
+            self._crawl_executor = ThreadPoolExecutor(max_workers=self.crawl_workers, thread_name_prefix="watch-crawl")
+            self._judge_executor = ThreadPoolExecutor(max_workers=self.judge_workers, thread_name_prefix="watch-judge")
+        return self._crawl_executor, self._judge_executor
+
+    def _unjudged(self, search: SavedSearch, job_cards: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """去掉该搜索中已经判断成功、且卡片指纹没有变化的职位"""
+        judged = self.job_store.judged_fingerprints(search.name, (card.get('job_id') for card in job_cards))
+        return [card for card in job_cards if judged.get(card.get('job_id')) != card_fingerprint(card)]
+
+    def _judge(self, search: SavedSearch, job_info: Dict[str, Any]) -> Dict[str, Any]:
+        job_description = self.parser.format_job_description_str(job_info)
+        try:
+            return self.judger.judge_single(job_description, job_info, search.user_requirements)
+        except Exception as e:
+            return {'success': False, 'error': str(e), 'job_info': job_info}
+
+    def poll(self, search: SavedSearch) -> List[Dict[str, Any]]:
+        """
+        检查一个搜索，返回其中新职位或有变化职位的判断结果
+
+        judger没有开启近似重复检测时，解析器每产出一个职位就提交到判断线程池，抓取和判断同时进行；
+        开启时等本次轮询的职位全部抓取完成，按详情页描述分组后每组只判断代表职位，其余职位复制代表的结果。
+        判断成功的职位（包括复制了成功结果的重复职位）被记录为该搜索已判断。
+        """
+        _, judge_executor = self._executors()
+        jobs = self.parser.iter_parse(search.url, search.max_num,
+                                      card_filter=lambda job_cards: self._unjudged(search, job_cards),
+                                      incremental=False)
+        if self.judger.duplicate_detector is None:
+            submitted = [(job_info, judge_executor.submit(self._judge, search, job_info)) for job_info in jobs]
+            jobs = [job_info for job_info, _ in submitted]
+            results = [future.result() for _, future in submitted]
+        else:
+            jobs = list(jobs)
+            representatives, unique = self.judger.group_duplicates(
+                self.parser.format_all_job_descriptions(jobs), jobs)
+            futures = {idx: judge_executor.submit(self._judge, search, jobs[idx]) for idx in unique}
+            results = self.judger.expand_duplicates(
+                representatives, {idx: future.result() for idx, future in futures.items()}, jobs)
+
+        # 只记录判断成功的职位，超时、限流等失败的职位下次轮询时重新判断
+        self.job_store.mark_judged(
+            search.name, [job_info for job_info, result in zip(jobs, results) if result.get('success', True)])
+        return results
+
+    def _poll_and_report(self, search: SavedSearch) -> List[Dict[str, Any]]:
+        try:
+            results = self.poll(search)
+        except Exception as e:
+            self.logger.error(f"检查搜索失败 {search.name}: {str(e)}")
+            return []
+        self.logger.info(f"检查搜索完成 {search.name}: {len(results)}个新职位")
+        try:
+            self.on_results(search, results)
+        except Exception as e:
+            self.logger.error(f"处理搜索结果时出错 {search.name}: {str(e)}")
+        return results
+
+    def run_once(self) -> Dict[str, List[Dict[str, Any]]]:
+        """并发检查所有搜索一次，返回 搜索名称 -> 新职位的判断结果"""
+        crawl_executor, _ = self._executors()
+        futures = [(search, crawl_executor.submit(self._poll_and_report, search)) for search in self.searches]
+        return {search.name: future.result() for search, future in futures}
+
+    def _next_delay(self, interval: float) -> float:
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def run(self):
+        """
+        按各自的间隔持续轮询所有搜索，直到调用stop
+
+        第一次检查的时间在[0, jitter * interval]内随机分布；同一个搜索上一次检查还没结束时不会重复提交，
+        下一次检查的时间从上一次检查结束时开始计算。
+        线程池由run负责关闭：循环退出后等待正在进行的检查完成，再关闭线程池并返回。
+        """
+        self._stop_event.clear()
+        self._run_finished.clear()
+        try:
+            self._run_loop()
+        finally:
+            self._shutdown_executors()
+            self._run_finished.set()
+
+    def _run_loop(self):
+        crawl_executor, _ = self._executors()
+        now = time.monotonic()
+        schedule = [(now + random.uniform(0, self.jitter * search.interval), idx)
+                    for idx, search in enumerate(self.searches)]
+        heapq.heapify(schedule)
+        lock = threading.Lock()
+
+        def reschedule(idx: int, _: Future):
+            # 停止之后完成的检查不再排期
+            if self._stop_event.is_set():
+                return
+            with lock:
+                heapq.heappush(schedule, (time.monotonic() + self._next_delay(self.searches[idx].interval), idx))
+            self._wake_up.set()
+
+        while not self._stop_event.is_set():
+            with lock:
+                due = []
+                while schedule and schedule[0][0] <= time.monotonic():
+                    due.append(heapq.heappop(schedule)[1])
+                wait = schedule[0][0] - time.monotonic() if schedule else None
+            for idx in due:
+                future = crawl_executor.submit(self._poll_and_report, self.searches[idx])
+                future.add_done_callback(lambda f, idx=idx: reschedule(idx, f))
+            if due:
+                continue
+
+            # 等到下一个搜索到期，或者有搜索检查完成、被stop唤醒
+            self._wake_up.wait(wait)
+            self._wake_up.clear()
+
+    def stop(self):
+        """
+        停止run循环并等待它退出（run会等待正在进行的检查完成并关闭线程池）
+
+        没有在运行run时（只调用过poll或run_once），直接关闭线程池。不要在on_results回调中调用，
+        回调运行在抓取线程池中，等待run关闭线程池会造成死锁。
+        """
+        self._stop_event.set()
+        self._wake_up.set()
+        if not self._run_finished.is_set():
+            self._run_finished.wait()
+        else:
+            self._shutdown_executors()
+
+    def _shutdown_executors(self):
+        """
+        等待正在进行的检查完成并关闭线程池
+
+        先关闭抓取线程池：正在进行的检查还会向判断线程池提交任务，所以判断线程池要等它们结束后再关闭
+        """
+        if self._crawl_executor is not None:
+            self._crawl_executor.shutdown(wait=True)
+            self._judge_executor.shutdown(wait=True)
+            self._crawl_executor = self._judge_executor = None
+
+    @staticmethod
+    def _print_results(search: SavedSearch, results: List[Dict[str, Any]]):
+        for result in results:
+            if result.get('decision') is True:
+                job_info = result.get('job_info') or {}
+                print(f"[{search.name}] {job_info.get('title')} @ {job_info.get('company')} "
+                      f"score={result.get('score')}: {job_info.get('job_link')}")
+
+
+if __name__ == '__main__':
+    # 加载配置
+    with open('config/config.yaml', 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    watch_config = config.get('watch', {})
+
+    parser = LinkedInParser(job_store=JobStore(watch_config.get('job_store', 'jobs.sqlite3')))
+    ai_model = create_model_from_config(config['ai_model'])
+    judger = AIJudger(ai_model, user_requirements=config['user_requirements'],
+                     dedup_threshold=config.get('dedup_threshold'))
+
+    searches = [SavedSearch(**search) for search in watch_config.get('searches', [])]
+    watcher = SearchWatcher(
+        parser,
+        judger,
+        searches,
+        crawl_workers=watch_config.get('crawl_workers', 2),
+        judge_workers=watch_config.get('judge_workers', 2),
+        jitter=watch_config.get('jitter', 0.1),
+    )
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        watcher.stop()
@@ -4,5 +4,13 @@
 
 from .web_parser import WebParser
 from .linkedin_parser import LinkedInParser
+from .async_web_parser import AsyncWebParser
+from .async_linkedin_parser import AsyncLinkedInParser
+from .rate_limiter import HostRateLimiter
+from .proxy_pool import ProxyPool
+from .http_cache import HttpCache
+from .job_store import JobStore
+from .job_record import JobRecord
 
-__all__ = ["WebParser", "LinkedInParser"] 
\ No newline at end of file
+__all__ = ["WebParser", "LinkedInParser", "AsyncWebParser", "AsyncLinkedInParser", "HostRateLimiter", "ProxyPool",
+           "HttpCache", "JobStore", "JobRecord"] 
@@ -0,0 +1,305 @@
+import asyncio
+import time
+from typing import Dict, Any, List, Optional, AsyncIterator, Union
+
+import httpx
+
+from .async_web_parser import AsyncWebParser
+from .html_backends import HtmlBackend
+from .job_record import JobRecord
+from .linkedin_base import LinkedInParserBase, SEARCH_PAGE_SIZE, SAVE_BATCH_SIZE
+from .rate_limiter import HostRateLimiter, default_rate_limiter, parse_retry_after, THROTTLE_STATUS_CODES
+from .proxy_pool import ProxyPool
+from .http_cache import HttpCache
+from .job_store import JobStore
+
+BACKOFF_MAX = 120
+
+
+class AsyncLinkedInParser(LinkedInParserBase, AsyncWebParser):
+    """
+    异步LinkedIn招聘信息解析器
+
+    解析流程与LinkedInParser相同，但使用httpx.AsyncClient发送请求，限速等待和重试都通过asyncio.sleep完成，
+    一个事件循环里就可以同时抓取多个搜索结果页，不需要为每个连接占用一个线程。
+
+    用法:
+        async with AsyncLinkedInParser(max_concurrency=8) as parser:
+            async for job in parser.iter_jobs(url):
+                ...
+    """
+
+    def __init__(self,
+                 proxies: Union[List[str], ProxyPool] = None,
+                 cookies: str = None,
+                 html_backend: Union[str, HtmlBackend] = "strained",
+                 max_concurrency: int = 4,
+                 rate_limiter: HostRateLimiter = None,
+                 total_retries: int = 5,
+                 backoff_factor: float = 1,
+                 timeout: float = 10,
+                 connect_timeout: float = 3,
+                 pool_maxsize: int = None,
+                 http_cache: HttpCache = None,
+                 job_store: JobStore = None,
+                 incremental: bool = True,
+                 max_pages: int = 40,
+                 page_concurrency: int = 3):
+        """
+        Args:
+            proxies: 代理列表，或者多个解析器共享的ProxyPool实例
+            cookies: 请求时携带的Cookie
+            html_backend: HTML解析后端，可选 bs4 / strained / lxml / selectolax，也可以传入HtmlBackend实例
+            max_concurrency: 同时进行中的请求数上限（包括在限速器上的等待）
+            rate_limiter: 按host限速的限速器，默认使用进程内共享的default_rate_limiter，可以与LinkedInParser共用
+            total_retries: 单次请求遇到连接错误或429/5xx时的最大重试次数，对应urllib3 Retry的total
+            backoff_factor: 连接错误重试的退避系数，对应urllib3 Retry的backoff_factor
+            timeout: 单次请求的超时时间（秒）
+            connect_timeout: 建立连接的超时时间（秒），失效的代理不必等满整个超时才被发现
+            pool_maxsize: 每个代理（以及直连）的客户端保持的最大keep-alive连接数，默认与max_concurrency相同
+            http_cache: 页面缓存，None表示不缓存；可以与LinkedInParser共用同一个缓存
+            job_store: 职位存储，抓取完成的职位会批量写入其中，None表示不保存
+            incremental: 配置了job_store时是否启用增量模式，规则与LinkedInParser相同
+            max_pages: 最多翻多少页搜索结果（每页25个职位）
+            page_concurrency: 翻页时同时抓取的页数
+        """
+        super().__init__(proxies, cookies, html_backend, max_pages, page_concurrency)
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate_limiter = rate_limiter if rate_limiter is not None else default_rate_limiter
+        self.http_cache = http_cache
+        self.job_store = job_store
+        self.incremental = incremental
+        self.total_retries = total_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.pool_maxsize = max(1, pool_maxsize) if pool_maxsize is not None else self.max_concurrency
+
+        # 每个代理一个持久客户端及其连接池，None表示直连
+        self._clients: Dict[Optional[str], httpx.AsyncClient] = {}
+        self._start_proxy_pool(self.rate_limiter)
+
+        # asyncio的同步原语在第一次使用时再创建，保证绑定到正在运行的事件循环
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncLinkedInParser":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """关闭所有HTTP客户端，并停止自己创建的代理池的健康检查"""
+        self._stop_proxy_pool()
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+    def _get_client(self, proxy: Optional[str]) -> httpx.AsyncClient:
+        """获取对应代理的客户端，不存在时创建；公共请求头在创建时设置，请求时只传入本次请求特有的请求头"""
+        client = self._clients.get(proxy)
+        if client is None:
+            client = httpx.AsyncClient(proxy=proxy,
+                                       headers=self.headers,
+                                       timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                                       limits=httpx.Limits(max_keepalive_connections=self.pool_maxsize),
+                                       follow_redirects=True)
+            self._clients[proxy] = client
+        return client
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _backoff_time(self, retries: int) -> float:
+        """与urllib3 Retry.get_backoff_time相同：第一次重试不等待，之后为 backoff_factor * 2 ** (retries - 1)"""
+        if retries <= 1:
+            return 0
+        return min(BACKOFF_MAX, self.backoff_factor * (2 ** (retries - 1)))
+
+    async def _send_with_retries(self, proxy: Optional[str], url: str, headers: Dict[str, str] = None) -> httpx.Response:
+        """
+        经过限速器发送GET请求，重试次数用尽后返回最后一次的响应或抛出异常
+
+        连接错误按照urllib3 Retry的语义退避重试，但通过代理连接失败时立即抛出，由调用方反馈给代理池并换一个代理；
+        429/5xx先反馈给限速器再重试，等待时间由限速器降低后的速率和Retry-After决定。
+        """
+        client = self._get_client(proxy)
+        request_headers = {'User-Agent': self._get_random_user_agent()}
+        if headers:
+            request_headers.update(headers)
+        retries = 0
+        while True:
+            await self.rate_limiter.aacquire(url)
+            start = time.monotonic()
+            try:
+                response = await client.get(url, headers=request_headers)
+            except httpx.TransportError as e:
+                if proxy and isinstance(e, (httpx.ProxyError, httpx.ConnectError, httpx.ConnectTimeout)):
+                    raise
+                if retries >= self.total_retries:
+                    raise
+                retries += 1
+                await asyncio.sleep(self._backoff_time(retries))
+                continue
+
+            self._handle_proxy_response(proxy, response.status_code, time.monotonic() - start)
+            self.rate_limiter.on_response(url, response.status_code,
+                                          parse_retry_after(response.headers.get('Retry-After')))
+            if response.status_code not in THROTTLE_STATUS_CODES or retries >= self.total_retries:
+                return response
+            retries += 1
+
+    async def _make_request(self, url: str, max_retries: int = 3, headers: Dict[str, str] = None) -> httpx.Response:
+        """发送请求并处理可能的错误，逻辑与LinkedInParser._make_request一致，headers为本次请求额外的请求头"""
+        last_exception = None
+
+        for attempt in range(max_retries):
+            current_proxy = None
+            try:
+                async with self._get_semaphore():
+                    proxies = self._get_next_proxy()
+                    current_proxy = proxies['https'] if proxies else None
+
+                    response = await self._send_with_retries(current_proxy, url, headers)
+                if response.status_code != 304:  # 304是条件请求的正常结果，httpx会把它当作重定向错误
+                    response.raise_for_status()
+                return response
+
+            except httpx.ProxyError as e:
+                self.logger.error(f"Proxy error with {current_proxy}: {str(e)}")
+                self._handle_proxy_failure(current_proxy)
+                last_exception = e
+
+            except httpx.HTTPError as e:
+                self.logger.warning(f"Request failed (attempt {attempt + 1}/{max_retries}): {str(e)}")
+                if isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout)):
+                    self._handle_proxy_failure(current_proxy)
+
+                last_exception = e
+
+        # 如果所有重试都失败了，且没有可用代理，最后尝试一次直连
+        if not self.proxy_pool.available_count():
+            try:
+                response = await self._send_with_retries(None, url, headers)
+                if response.status_code != 304:
+                    response.raise_for_status()
+                return response
+            except httpx.HTTPError as e:
+                self.logger.error(f"Final attempt without proxy failed: {str(e)}")
+                last_exception = e
+
+        raise Exception(
+            f"LinkedIn访问失败 - 已尝试{max_retries}次\n"
+            f"最后错误: {str(last_exception)}\n"
+            f"剩余可用代理: {self.proxy_pool.available_count()}"
+        )
+
+    async def _fetch_html(self, url: str, is_search: bool = False) -> str:
+        """获取页面HTML，缓存规则与LinkedInParser._fetch_html相同"""
+        entry, fresh = self._lookup_cache(url, is_search)
+        if fresh:
+            return entry.body
+        response = await self._make_request(url, headers=entry.validators() if entry else None)
+        return self._store_response(url, response.status_code, response.text, response.headers, entry)
+
+    async def _fetch_job_cards(self, url: str, max_num: int) -> List[Dict[str, Any]]:
+        """翻页获取搜索结果中的职位卡片，规则与LinkedInParser._collect_job_cards相同"""
+        try:
+            html = await self._fetch_html(url, is_search=True)
+        except Exception as e:
+            self.logger.error(f"解析LinkedIn页面失败: {str(e)}")
+            raise
+
+        job_cards, seen_ids = [], set()
+        if not self._merge_page_cards(job_cards, seen_ids, self._extract_job_cards(html)):
+            return job_cards
+
+        next_page = 1
+        while not 0 < max_num <= len(job_cards):
+            wave = self._next_page_wave(next_page, len(job_cards), max_num)
+            if not wave:
+                break
+            next_page = wave[-1] + 1
+
+            pages = await asyncio.gather(
+                *(self._safe_fetch_page_cards(self._page_url(url, page * SEARCH_PAGE_SIZE)) for page in wave))
+            exhausted = False
+            for page_cards in pages:
+                if not page_cards or not self._merge_page_cards(job_cards, seen_ids, page_cards):
+                    exhausted = True
+                    break
+            if exhausted:
+                break
+
+        if max_num > 0:
+            job_cards = job_cards[:max_num]
+        return job_cards
+
+    async def _safe_fetch_page_cards(self, page_url: str) -> Optional[List[Dict[str, Any]]]:
+        """抓取一页搜索结果并提取职位卡片，失败时返回None"""
+        try:
+            return self._extract_job_cards(await self._fetch_html(page_url, is_search=True))
+        except Exception as e:
+            self.logger.warning(f"获取搜索结果分页失败: {page_url}: {str(e)}")
+            return None
+
+    async def parse(self, url: str, max_num: int = -1) -> List[Dict[str, Any]]:
+        """解析LinkedIn职位搜索结果页面，并发抓取职位详情页，结果顺序与搜索结果页一致"""
+        job_cards = self._filter_new_cards(await self._fetch_job_cards(url, max_num))
+        results = await asyncio.gather(*(self._get_info_from_card(card) for card in job_cards),
+                                       return_exceptions=True)
+
+        jobs_info = []
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.error(f"解析单个职位卡片时出错: {str(result)}")
+                continue
+            jobs_info.append(result)
+        self._save_jobs(jobs_info)
+        return jobs_info
+
+    async def iter_jobs(self, url: str, max_num: int = -1) -> AsyncIterator[Dict[str, Any]]:
+        """解析LinkedIn职位搜索结果页面，每个职位的详情页抓取完成后立即产出，顺序为完成顺序"""
+        job_cards = self._filter_new_cards(await self._fetch_job_cards(url, max_num))
+        tasks = [asyncio.ensure_future(self._get_info_from_card(card)) for card in job_cards]
+        unsaved = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    job_info = await next_done
+                except Exception as e:
+                    self.logger.error(f"解析单个职位卡片时出错: {str(e)}")
+                    continue
+                unsaved.append(job_info)
+                if len(unsaved) >= SAVE_BATCH_SIZE:
+                    self._save_jobs(unsaved)
+                    unsaved = []
+                yield job_info
+        finally:
+            # 调用方提前退出时取消尚未完成的抓取，并保存已经产出的职位
+            for task in tasks:
+                task.cancel()
+            self._save_jobs(unsaved)
+
+    async def parse_many(self, urls: List[str], max_num: int = -1) -> List[List[Dict[str, Any]]]:
+        """同时解析多个搜索结果页面，返回值与urls一一对应，某个页面失败时对应位置为空列表"""
+        results = await asyncio.gather(*(self.parse(url, max_num) for url in urls), return_exceptions=True)
+        return [[] if isinstance(result, Exception) else result for result in results]
+
+    async def _get_info_from_card(self, card: Dict[str, Any]) -> Dict[str, Any]:
+        """补全职位卡片的信息，card是从搜索结果页面中提取的基本信息，这里进入职位详情页面获取详细描述"""
+        job_info = JobRecord.from_mapping(card)
+        job_info['full_description'] = await self._extract_job_detailed_description(job_info['job_link'])
+        return job_info
+
+    async def _extract_job_detailed_description(self, job_link: str) -> str:
+        """获取职位详细描述"""
+        try:
+            return self._parse_job_description(await self._fetch_html(job_link))
+
+        except Exception as e:
+            self.logger.error(f"获取职位详细描述失败: {str(e)}")
+            return 'Description not available'
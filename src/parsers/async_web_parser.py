@@ -0,0 +1,60 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, AsyncIterator
+
+
+class AsyncWebParser(ABC):
+    """异步网页解析的抽象基类，接口与WebParser对应，网络请求不阻塞事件循环"""
+
+    @abstractmethod
+    async def parse(self, url: str, max_num: int) -> List[Dict[str, Any]]:
+        """
+        解析给定URL的招聘信息，URL是搜索结果页，返回多个招聘信息，顺序与搜索结果页一致
+
+        Args:
+            url: 搜索结果页的URL
+            max_num: 最多解析的招聘信息数量，-1表示不限制
+
+        Returns:
+            包含招聘信息字典的列表，字段与WebParser.parse的返回值相同
+        """
+        pass
+
+    @abstractmethod
+    def iter_jobs(self, url: str, max_num: int) -> AsyncIterator[Dict[str, Any]]:
+        """
+        以异步生成器的形式解析招聘信息，每个职位解析完成后立即yield，用法为 async for job in parser.iter_jobs(...)
+
+        Args:
+            url: 搜索结果页的URL
+            max_num: 最多解析的招聘信息数量，-1表示不限制
+
+        Returns:
+            按完成顺序产出招聘信息字典的异步迭代器
+        """
+        pass
+
+    @abstractmethod
+    def format_job_description_str(self, job_info: Dict[str, Any]) -> str:
+        """
+        将职位信息转换为文本
+
+        Args:
+            job_info: 包含招聘信息的字典
+
+        Returns:
+            包含职位信息的文本
+        """
+        pass
+
+    @abstractmethod
+    def format_all_job_descriptions(self, jobs: List[Dict[str, Any]]) -> List[str]:
+        """
+        格式化多个职位信息为字符串
+
+        Args:
+            jobs: 包含多个职位信息的列表
+
+        Returns:
+            包含多个格式化职位描述字符串的列表
+        """
+        pass
@@ -0,0 +1,332 @@
+"""
+LinkedIn页面的HTML解析后端
+
+解析器只需要搜索结果页中的职位卡片和详情页中的职位描述两部分内容，不同后端在速度和内存上有差异：
+- bs4: 用html.parser构建完整的BeautifulSoup树，最慢，作为其他后端的参照
+- strained: 用SoupStrainer限制BeautifulSoup只构建职位卡片/职位描述节点，无额外依赖
+- lxml: 基于lxml的C实现，需要安装lxml
+- selectolax: 基于lexbor的C实现，需要安装selectolax
+
+所有后端提取出的字段与 extract_card_info_bs4 完全一致，职位卡片以JobRecord返回，缺失的字段为None。
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from typing import List, Optional, Union
+from bs4 import BeautifulSoup, SoupStrainer
+from .job_record import JobRecord, DESCRIPTION_NOT_AVAILABLE
+
+logger = logging.getLogger(__name__)
+
+JOB_CARD_CLASS = 'job-search-card'
+DESCRIPTION_CLASS = 'show-more-less-html__markup'
+
+# 与BeautifulSoup.get_text的默认行为一致，这些标签中的文本不计入
+_NON_TEXT_TAGS = ('script', 'style', 'template')
+
+
+def _job_id_from_urn(urn) -> Optional[str]:
+    """从data-entity-urn属性（例如 urn:li:jobPosting:4077875677）中取出job_id"""
+    return urn.split(':')[-1] if urn else None
+
+
+def extract_card_info_bs4(card) -> JobRecord:
+    """
+    提取单个职位卡片的详细信息
+
+    Args:
+        card: BeautifulSoup解析后的职位卡片HTML元素
+
+    Returns:
+        职位信息，缺失的字段为None
+    """
+    try:
+        # 职位标题
+        title_elem = card.find('h3', class_='base-search-card__title')
+        title = title_elem.get_text(strip=True) if title_elem else None
+
+        # 公司名称
+        company_elem = card.find('h4', class_='base-search-card__subtitle')
+        company = company_elem.get_text(strip=True) if company_elem else None
+
+        # 公司链接
+        company_link_elem = company_elem.find('a') if company_elem else None
+        company_link = company_link_elem.get('href') if company_link_elem else None
+
+        # 职位链接
+        link_elem = card.find('a', class_='base-card__full-link')
+        job_link = link_elem.get('href') if link_elem else None
+
+        # 工作地点
+        location_elem = card.find('span', class_='job-search-card__location')
+        location = location_elem.get_text(strip=True) if location_elem else None
+
+        # 发布时间
+        time_elem = card.find('time', class_='job-search-card__listdate')
+        post_time = time_elem.get('datetime') if time_elem else None
+
+        # 公司 Logo 链接
+        logo_elem = card.find('img', class_='artdeco-entity-image')
+        company_logo = logo_elem.get('data-delayed-url') if logo_elem else None
+
+        # 职位福利信息 (例如 "Be an early applicant")
+        benefits_elem = card.find('span', class_='job-posting-benefits__text')
+        benefits = benefits_elem.get_text(strip=True) if benefits_elem else None
+
+        # 职位元数据 (如 ID、参考ID、跟踪ID等)
+        job_id = _job_id_from_urn(card.get('data-entity-urn'))
+        reference_id = card.get('data-reference-id')
+        tracking_id = card.get('data-tracking-id')
+
+        # 汇总提取信息
+        return JobRecord(
+            title=title,
+            company=company,
+            company_link=company_link,
+            job_link=job_link,
+            location=location,
+            post_time=post_time,
+            company_logo=company_logo,
+            benefits=benefits,
+            job_id=job_id,
+            reference_id=reference_id,
+            tracking_id=tracking_id,
+        )
+
+    except Exception as e:
+        logger.error(f"提取职位卡片信息时出错: {str(e)}")
+        return JobRecord.error()
+
+
+class HtmlBackend(ABC):
+    """HTML解析后端的抽象基类"""
+
+    name = ""
+
+    @abstractmethod
+    def extract_job_cards(self, html: str) -> List[JobRecord]:
+        """
+        从搜索结果页面中提取所有职位卡片的基本信息
+
+        Returns:
+            职位基本信息的列表，字段与extract_card_info_bs4相同
+        """
+        pass
+
+    @abstractmethod
+    def extract_job_description(self, html: str) -> str:
+        """从职位详情页面中提取职位详细描述，找不到时返回'Description not available'"""
+        pass
+
+
+class BS4Backend(HtmlBackend):
+    """构建完整BeautifulSoup树的后端"""
+
+    name = "bs4"
+
+    def extract_job_cards(self, html: str) -> List[JobRecord]:
+        soup = BeautifulSoup(html, 'html.parser')
+        return [extract_card_info_bs4(card) for card in soup.find_all('div', class_=JOB_CARD_CLASS)]
+
+    def extract_job_description(self, html: str) -> str:
+        soup = BeautifulSoup(html, 'html.parser')
+        description_elem = soup.find('div', class_=DESCRIPTION_CLASS)
+        return description_elem.get_text(strip=True) if description_elem else DESCRIPTION_NOT_AVAILABLE
+
+
+def _class_matcher(class_name: str):
+    """
+    生成SoupStrainer使用的class匹配函数
+
+    解析过程中传给SoupStrainer的class可能是未拆分的原始字符串（新版bs4），直接写class_=class_name
+    只能匹配class完全相等的元素，所以这里自己按空白拆分后判断
+    """
+    def match(value) -> bool:
+        if not value:
+            return False
+        classes = value.split() if isinstance(value, str) else value
+        return class_name in classes
+    return match
+
+
+class StrainedBS4Backend(HtmlBackend):
+    """用SoupStrainer限制解析范围的BeautifulSoup后端，只构建职位卡片和职位描述节点"""
+
+    name = "strained"
+
+    def __init__(self):
+        self._card_strainer = SoupStrainer('div', class_=_class_matcher(JOB_CARD_CLASS))
+        self._description_strainer = SoupStrainer('div', class_=_class_matcher(DESCRIPTION_CLASS))
+
+    def extract_job_cards(self, html: str) -> List[JobRecord]:
+        soup = BeautifulSoup(html, 'html.parser', parse_only=self._card_strainer)
+        return [extract_card_info_bs4(card) for card in soup.find_all('div', class_=JOB_CARD_CLASS)]
+
+    def extract_job_description(self, html: str) -> str:
+        soup = BeautifulSoup(html, 'html.parser', parse_only=self._description_strainer)
+        description_elem = soup.find('div', class_=DESCRIPTION_CLASS)
+        return description_elem.get_text(strip=True) if description_elem else DESCRIPTION_NOT_AVAILABLE
+
+
+def _class_xpath(tag: str, class_name: str, prefix: str = ".//") -> str:
+    """生成按class匹配元素的XPath，与BeautifulSoup的class_匹配规则相同（class中包含该值即可）"""
+    return f"{prefix}{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+
+class LxmlBackend(HtmlBackend):
+    """基于lxml的后端"""
+
+    name = "lxml"
+
+    def __init__(self):
+        try:
+            import lxml.html
+        except ImportError as e:
+            raise ImportError("使用lxml解析后端需要先安装lxml: pip install lxml") from e
+        self._lxml_html = lxml.html
+
+    def extract_job_cards(self, html: str) -> List[JobRecord]:
+        if not html.strip():
+            return []
+        root = self._lxml_html.fromstring(html)
+        return [self._extract_card_info(card) for card in root.xpath(_class_xpath('div', JOB_CARD_CLASS, '//'))]
+
+    def extract_job_description(self, html: str) -> str:
+        if not html.strip():
+            return DESCRIPTION_NOT_AVAILABLE
+        root = self._lxml_html.fromstring(html)
+        description_elems = root.xpath(_class_xpath('div', DESCRIPTION_CLASS, '//'))
+        return self._get_text(description_elems[0]) if description_elems else DESCRIPTION_NOT_AVAILABLE
+
+    @staticmethod
+    def _get_text(elem) -> str:
+        """与BeautifulSoup的get_text(strip=True)相同：拼接所有去除首尾空白后的文本，跳过注释和脚本"""
+        parts = []
+
+        def walk(node):
+            if not isinstance(node.tag, str) or node.tag in _NON_TEXT_TAGS:
+                return
+            if node.text:
+                parts.append(node.text)
+            for child in node:
+                walk(child)
+                if child.tail:
+                    parts.append(child.tail)
+
+        walk(elem)
+        return "".join(part.strip() for part in parts if part.strip())
+
+    def _find(self, card, tag: str, class_name: str):
+        elems = card.xpath(_class_xpath(tag, class_name))
+        return elems[0] if elems else None
+
+    def _extract_card_info(self, card) -> JobRecord:
+        try:
+            title_elem = self._find(card, 'h3', 'base-search-card__title')
+            company_elem = self._find(card, 'h4', 'base-search-card__subtitle')
+            company_link_elems = company_elem.xpath('.//a') if company_elem is not None else []
+            link_elem = self._find(card, 'a', 'base-card__full-link')
+            location_elem = self._find(card, 'span', 'job-search-card__location')
+            time_elem = self._find(card, 'time', 'job-search-card__listdate')
+            logo_elem = self._find(card, 'img', 'artdeco-entity-image')
+            benefits_elem = self._find(card, 'span', 'job-posting-benefits__text')
+
+            return JobRecord(
+                title=self._get_text(title_elem) if title_elem is not None else None,
+                company=self._get_text(company_elem) if company_elem is not None else None,
+                company_link=company_link_elems[0].get('href') if company_link_elems else None,
+                job_link=link_elem.get('href') if link_elem is not None else None,
+                location=self._get_text(location_elem) if location_elem is not None else None,
+                post_time=time_elem.get('datetime') if time_elem is not None else None,
+                company_logo=logo_elem.get('data-delayed-url') if logo_elem is not None else None,
+                benefits=self._get_text(benefits_elem) if benefits_elem is not None else None,
+                job_id=_job_id_from_urn(card.get('data-entity-urn')),
+                reference_id=card.get('data-reference-id'),
+                tracking_id=card.get('data-tracking-id'),
+            )
+
+        except Exception as e:
+            logger.error(f"提取职位卡片信息时出错: {str(e)}")
+            return JobRecord.error()
+
+
+class SelectolaxBackend(HtmlBackend):
+    """基于selectolax（lexbor引擎）的后端"""
+
+    name = "selectolax"
+
+    def __init__(self):
+        try:
+            from selectolax.lexbor import LexborHTMLParser
+        except ImportError as e:
+            raise ImportError("使用selectolax解析后端需要先安装selectolax: pip install selectolax") from e
+        self._parser_class = LexborHTMLParser
+
+    def _parse(self, html: str):
+        tree = self._parser_class(html)
+        tree.strip_tags(list(_NON_TEXT_TAGS))
+        return tree
+
+    @staticmethod
+    def _get_text(node) -> str:
+        return node.text(deep=True, separator='', strip=True)
+
+    def extract_job_cards(self, html: str) -> List[JobRecord]:
+        tree = self._parse(html)
+        return [self._extract_card_info(card) for card in tree.css(f'div.{JOB_CARD_CLASS}')]
+
+    def extract_job_description(self, html: str) -> str:
+        description_elem = self._parse(html).css_first(f'div.{DESCRIPTION_CLASS}')
+        return self._get_text(description_elem) if description_elem is not None else DESCRIPTION_NOT_AVAILABLE
+
+    def _extract_card_info(self, card) -> JobRecord:
+        try:
+            title_elem = card.css_first('h3.base-search-card__title')
+            company_elem = card.css_first('h4.base-search-card__subtitle')
+            company_link_elem = company_elem.css_first('a') if company_elem is not None else None
+            link_elem = card.css_first('a.base-card__full-link')
+            location_elem = card.css_first('span.job-search-card__location')
+            time_elem = card.css_first('time.job-search-card__listdate')
+            logo_elem = card.css_first('img.artdeco-entity-image')
+            benefits_elem = card.css_first('span.job-posting-benefits__text')
+            attributes = card.attributes
+
+            return JobRecord(
+                title=self._get_text(title_elem) if title_elem is not None else None,
+                company=self._get_text(company_elem) if company_elem is not None else None,
+                company_link=company_link_elem.attributes.get('href') if company_link_elem is not None else None,
+                job_link=link_elem.attributes.get('href') if link_elem is not None else None,
+                location=self._get_text(location_elem) if location_elem is not None else None,
+                post_time=time_elem.attributes.get('datetime') if time_elem is not None else None,
+                company_logo=logo_elem.attributes.get('data-delayed-url') if logo_elem is not None else None,
+                benefits=self._get_text(benefits_elem) if benefits_elem is not None else None,
+                job_id=_job_id_from_urn(attributes.get('data-entity-urn')),
+                reference_id=attributes.get('data-reference-id'),
+                tracking_id=attributes.get('data-tracking-id'),
+            )
+
+        except Exception as e:
+            logger.error(f"提取职位卡片信息时出错: {str(e)}")
+            return JobRecord.error()
+
+
+HTML_BACKENDS = {
+    BS4Backend.name: BS4Backend,
+    StrainedBS4Backend.name: StrainedBS4Backend,
+    LxmlBackend.name: LxmlBackend,
+    SelectolaxBackend.name: SelectolaxBackend,
+}
+
+
+def get_html_backend(backend: Union[str, HtmlBackend] = "strained") -> HtmlBackend:
+    """
+    根据名称创建解析后端，传入HtmlBackend实例时直接返回
+
+    Args:
+        backend: 后端名称，可选 bs4 / strained / lxml / selectolax
+    """
+    if isinstance(backend, HtmlBackend):
+        return backend
+    if backend not in HTML_BACKENDS:
+        raise ValueError(f"未知的HTML解析后端: {backend}，可选: {', '.join(HTML_BACKENDS)}")
+    return HTML_BACKENDS[backend]()
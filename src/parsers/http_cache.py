@@ -0,0 +1,202 @@
+"""
+LinkedIn页面的磁盘HTTP缓存
+
+响应正文经zlib压缩后保存在SQLite中，键为去掉跟踪参数并规范化之后的URL。
+搜索结果页和职位详情页使用不同的有效期；过期的记录如果带有ETag/Last-Modified，会先发条件请求重新验证，
+服务端返回304时直接沿用缓存的正文。总大小超过上限时按最近访问时间淘汰（LRU）。
+"""
+
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# 不影响页面内容、只用于跟踪来源的查询参数；pageNum、start等分页参数决定了返回哪一页结果，不能去掉
+TRACKING_PARAMS = frozenset({
+    'trackingId', 'refId', 'trk', 'trkInfo', 'position', 'lipi', 'originalSubdomain',
+    'eBP', 'midToken', 'midSig', 'trkEmail', 'otpToken', 'alternateChannel',
+})
+TRACKING_PREFIXES = ('utm_',)
+
+
+def normalize_url(url: str) -> str:
+    """
+    规范化URL作为缓存键：scheme和host转小写，去掉fragment和跟踪参数，剩余参数按名称排序，去掉路径末尾的斜杠
+    """
+    parts = urlsplit(url)
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in TRACKING_PARAMS and not key.startswith(TRACKING_PREFIXES)
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+
+class CacheEntry:
+    """一条缓存记录"""
+
+    __slots__ = ('body', 'etag', 'last_modified', 'fetched_at')
+
+    def __init__(self, body: str, etag: Optional[str], last_modified: Optional[str], fetched_at: float):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def validators(self) -> Dict[str, str]:
+        """条件请求需要的请求头，没有验证信息时返回空字典"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    基于SQLite的HTTP响应缓存，线程安全，可以在多个解析器之间共享
+
+    正文的总大小在打开时统计一次，之后随写入和淘汰增减，写入时不必每次SUM整张表
+    """
+
+    def __init__(self,
+                 path: str = "http_cache.sqlite3",
+                 search_ttl: float = 3600,
+                 detail_ttl: float = 7 * 24 * 3600,
+                 max_bytes: int = 256 * 1024 * 1024,
+                 compress_level: int = 6):
+        """
+        Args:
+            path: SQLite数据库文件路径，":memory:"表示只保存在内存中
+            search_ttl: 搜索结果页的有效期（秒），搜索结果变化快，应设置得较短
+            detail_ttl: 职位详情页的有效期（秒），职位描述很少变化，可以设置得较长
+            max_bytes: 压缩后正文的总大小上限（字节），压缩后超过该值的单个页面不缓存
+            compress_level: zlib压缩级别
+        """
+        self.path = path
+        self.search_ttl = search_ttl
+        self.detail_ttl = detail_ttl
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, body BLOB NOT NULL, size INTEGER NOT NULL, etag TEXT, last_modified TEXT, "
+                "fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses (accessed_at)")
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """读取缓存记录（可能已经过期，由调用方根据age判断），不存在时返回None"""
+        key = normalize_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        body, etag, last_modified, fetched_at = row
+        return CacheEntry(zlib.decompress(body).decode('utf-8'), etag, last_modified, fetched_at)
+
+    def set(self, url: str, body: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """
+        写入缓存，写入前先淘汰最久未访问的记录，为新记录腾出空间
+
+        压缩后仍超过max_bytes的正文不缓存（同一URL的旧记录也一并删除，避免之后读到过时的内容），
+        否则它会把其余记录全部挤出缓存，自己却仍然超出上限
+        """
+        key = normalize_url(url)
+        data = zlib.compress(body.encode('utf-8'), self.compress_level)
+        now = time.time()
+        with self._lock, self._conn:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            if old:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._total_bytes -= old[0]
+            if len(data) > self.max_bytes:
+                return
+            self._evict(self.max_bytes - len(data))
+            self._conn.execute(
+                "INSERT INTO responses (key, body, size, etag, last_modified, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, sqlite3.Binary(data), len(data), etag, last_modified, now, now)
+            )
+            self._total_bytes += len(data)
+
+    def refresh(self, url: str):
+        """服务端确认内容未变化（304），把记录的获取时间更新为现在"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE key = ?", (now, now, normalize_url(url))
+            )
+
+    def _evict(self, limit: int):
+        """按最近访问时间淘汰记录，直到总大小不超过limit"""
+        while self._total_bytes > limit:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at ASC LIMIT 100"
+            ).fetchall()
+            if not rows:
+                break
+            doomed = []
+            for key, size in rows:
+                doomed.append((key,))
+                self._total_bytes -= size
+                if self._total_bytes <= limit:
+                    break
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def record(self, hit: bool = False, revalidated: bool = False):
+        """记录一次缓存查询的结果，供stats统计"""
+        with self._lock:
+            if revalidated:
+                self.revalidated += 1
+            elif hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'revalidated': self.revalidated,
+                'entries': self._count(),
+                'bytes': self._total_bytes,
+            }
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+            self._total_bytes = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
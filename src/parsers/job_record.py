@@ -0,0 +1,181 @@
+"""
+紧凑的职位记录
+
+解析得到的每个职位原来是一个包含十几个字符串键的dict，缺失的字段用'Not specified'/'Error'占位。
+JobRecord用__slots__保存固定字段，缺失的字段保存为None，同时实现了MutableMapping接口：
+按键访问时缺失的卡片字段仍然返回占位字符串，与原来的dict完全一致，已有的调用方不需要修改。
+格式化后的职位描述在第一次使用时生成并缓存，字段被修改时失效。
+
+项目需要兼容Python 3.8，dataclass(slots=True)要到3.10才支持，所以这里直接手写__slots__。
+"""
+
+import sys
+from typing import Dict, Any, Iterator, Mapping, Optional
+from collections.abc import MutableMapping
+
+LINKEDIN_FORMAT_TEMPLATE = """
+**Job Title**: {title}
+**Company**: {company}  
+**Company Link**: [Visit Company]({company_link})  
+**Job Location**: {location}  
+**Posted On**: {post_time}  
+**Job Benefits**: {benefits}  
+
+---
+
+### **Job Description**:
+{full_description}
+"""
+
+# 占位字符串全部驻留，所有记录共享同一个对象
+NOT_SPECIFIED = sys.intern('Not specified')
+ERROR = sys.intern('Error')
+DESCRIPTION_NOT_AVAILABLE = sys.intern('Description not available')
+
+# 搜索结果卡片中的字段，按键访问时总是存在（缺失时返回占位字符串）
+CARD_FIELDS = ('title', 'company', 'company_link', 'job_link', 'location', 'post_time', 'company_logo',
+               'benefits', 'job_id', 'reference_id', 'tracking_id')
+# 抓取详情页后才有的字段，缺失时按键访问视为不存在
+DETAIL_FIELDS = ('full_description',)
+FIELDS = CARD_FIELDS + DETAIL_FIELDS
+_FIELD_SET = frozenset(FIELDS)
+
+
+class JobRecord(MutableMapping):
+    """
+    一个职位的信息
+
+    属性访问（record.title）得到原始值，缺失时为None；按键访问（record['title']）与原来的dict行为一致。
+    不在固定字段中的键保存在一个按需创建的dict中，因此仍然可以像dict一样添加任意键。
+    """
+
+    __slots__ = FIELDS + ('_placeholder', '_extra', '_formatted')
+
+    def __init__(self, placeholder: str = NOT_SPECIFIED, **fields):
+        """
+        Args:
+            placeholder: 缺失的卡片字段按键访问时返回的占位字符串，提取出错的记录使用ERROR
+            fields: 字段值，值为None或与placeholder相同都视为缺失
+        """
+        for name in FIELDS:
+            object.__setattr__(self, name, None)
+        self._placeholder = placeholder
+        self._extra: Optional[Dict[str, Any]] = None
+        self._formatted: Optional[str] = None
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def error(cls) -> "JobRecord":
+        """提取出错时使用的记录，所有卡片字段都为'Error'"""
+        return cls(placeholder=ERROR)
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> "JobRecord":
+        """从dict或另一个JobRecord复制出一个新的记录"""
+        if isinstance(data, JobRecord):
+            return data.copy()
+        record = cls()
+        for key, value in data.items():
+            record[key] = value
+        return record
+
+    def copy(self) -> "JobRecord":
+        record = JobRecord(placeholder=self._placeholder)
+        for name in FIELDS:
+            object.__setattr__(record, name, getattr(self, name))
+        if self._extra:
+            record._extra = dict(self._extra)
+        record._formatted = self._formatted
+        return record
+
+    def __setattr__(self, name: str, value):
+        if name in _FIELD_SET:
+            if isinstance(value, str) and value == self._placeholder:
+                value = None
+            object.__setattr__(self, '_formatted', None)
+        object.__setattr__(self, name, value)
+
+    # ---- MutableMapping接口 ----
+
+    def __getitem__(self, key: str):
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+            if key in CARD_FIELDS:
+                return self._placeholder
+            raise KeyError(key)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value):
+        if key in _FIELD_SET:
+            setattr(self, key, value)
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key in _FIELD_SET:
+            if key in DETAIL_FIELDS and getattr(self, key) is None:
+                raise KeyError(key)
+            # 卡片字段删除后恢复为缺失（按键访问返回占位字符串）
+            setattr(self, key, None)
+            return
+        if self._extra is None or key not in self._extra:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from CARD_FIELDS
+        for name in DETAIL_FIELDS:
+            if getattr(self, name) is not None:
+                yield name
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return (len(CARD_FIELDS) + sum(1 for name in DETAIL_FIELDS if getattr(self, name) is not None)
+                + (len(self._extra) if self._extra else 0))
+
+    def __contains__(self, key) -> bool:
+        if key in CARD_FIELDS:
+            return True
+        if key in _FIELD_SET:
+            return getattr(self, key) is not None
+        return self._extra is not None and key in self._extra
+
+    def __repr__(self) -> str:
+        return f"JobRecord({dict(self)!r})"
+
+    def __getstate__(self):
+        return {'placeholder': self._placeholder, 'fields': {name: getattr(self, name) for name in FIELDS},
+                'extra': self._extra}
+
+    def __setstate__(self, state):
+        object.__setattr__(self, '_placeholder', state['placeholder'])
+        object.__setattr__(self, '_extra', state['extra'])
+        object.__setattr__(self, '_formatted', None)
+        for name, value in state['fields'].items():
+            object.__setattr__(self, name, value)
+
+    # ---- 格式化 ----
+
+    @property
+    def formatted(self) -> str:
+        """按LINKEDIN_FORMAT_TEMPLATE格式化的职位描述，第一次访问时生成并缓存"""
+        if self._formatted is None:
+            self._formatted = LINKEDIN_FORMAT_TEMPLATE.format(
+                title=self['title'],
+                company=self['company'],
+                company_link=self['company_link'],
+                location=self['location'],
+                post_time=self['post_time'],
+                benefits=self['benefits'],
+                full_description=self.full_description if self.full_description is not None
+                else DESCRIPTION_NOT_AVAILABLE,
+            )
+        return self._formatted
@@ -0,0 +1,180 @@
+"""
+职位的持久化存储
+
+用SQLite按job_id保存解析过的职位，解析器的增量模式依靠它跳过已经抓取过、且搜索结果卡片没有变化的职位，
+这样重复运行时只有新发布（或有变化）的职位才会抓取详情页并交给AI判断。
+另外按 (搜索, job_id, 指纹) 记录哪些职位已经判断成功，供SearchWatcher区分各个搜索中的新职位。
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional, Iterable, Mapping
+
+# 卡片中参与指纹计算的字段，任何一项变化都视为职位有更新
+FINGERPRINT_FIELDS = ('title', 'company', 'location', 'post_time', 'benefits')
+# 提取失败时job_id的占位值，这样的职位无法跨运行识别，不会被保存
+INVALID_JOB_IDS = frozenset({'Not specified', 'Error', '', None})
+# SQLite单条语句的参数个数上限较小，批量查询时分块
+_QUERY_CHUNK_SIZE = 500
+
+
+def card_fingerprint(card: Mapping[str, Any]) -> str:
+    """计算职位卡片基本信息的指纹"""
+    payload = json.dumps([card.get(field) for field in FINGERPRINT_FIELDS], ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class JobStore:
+    """
+    基于SQLite的职位存储，线程安全，可以在多个解析器之间共享
+
+    job_id为主键，另外在post_time上建有索引；upsert_many在一个事务中用executemany批量写入，
+    大批量抓取时不会每行提交一次。
+    """
+
+    def __init__(self, path: str = "jobs.sqlite3"):
+        """
+        Args:
+            path: SQLite数据库文件路径，":memory:"表示只保存在内存中
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "job_id TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, post_time TEXT, data TEXT NOT NULL, "
+                "first_seen REAL NOT NULL, last_seen REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_post_time ON jobs (post_time)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS judgments ("
+                "search TEXT NOT NULL, job_id TEXT NOT NULL, fingerprint TEXT NOT NULL, judged_at REAL NOT NULL, "
+                "PRIMARY KEY (search, job_id))"
+            )
+
+    def fingerprints(self, job_ids: Iterable[str]) -> Dict[str, str]:
+        """查询已保存职位的卡片指纹，返回 job_id -> 指纹，未保存的job_id不在结果中"""
+        job_ids = [job_id for job_id in dict.fromkeys(job_ids) if job_id not in INVALID_JOB_IDS]
+        result = {}
+        with self._lock:
+            for start in range(0, len(job_ids), _QUERY_CHUNK_SIZE):
+                chunk = job_ids[start:start + _QUERY_CHUNK_SIZE]
+                rows = self._conn.execute(
+                    f"SELECT job_id, fingerprint FROM jobs WHERE job_id IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                result.update(rows)
+        return result
+
+    def upsert_many(self, jobs: Iterable[Mapping[str, Any]]) -> int:
+        """
+        批量插入或更新职位，已存在的职位保留first_seen
+
+        Returns:
+            写入的职位数量（job_id无效的职位被跳过）
+        """
+        now = time.time()
+        rows = [
+            (job['job_id'], card_fingerprint(job), job.get('post_time'),
+             json.dumps(dict(job), ensure_ascii=False), now, now)
+            for job in jobs if job.get('job_id') not in INVALID_JOB_IDS
+        ]
+        if not rows:
+            return 0
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO jobs (job_id, fingerprint, post_time, data, first_seen, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(job_id) DO UPDATE SET fingerprint = excluded.fingerprint, "
+                "post_time = excluded.post_time, data = excluded.data, last_seen = excluded.last_seen",
+                rows
+            )
+        return len(rows)
+
+    def touch(self, job_ids: Iterable[str]):
+        """批量更新职位的最近出现时间（职位再次出现在搜索结果中但没有变化时调用）"""
+        now = time.time()
+        rows = [(now, job_id) for job_id in dict.fromkeys(job_ids) if job_id not in INVALID_JOB_IDS]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany("UPDATE jobs SET last_seen = ? WHERE job_id = ?", rows)
+
+    def judged_fingerprints(self, search: str, job_ids: Iterable[str]) -> Dict[str, str]:
+        """查询某个搜索中已判断成功的职位在判断时的卡片指纹，返回 job_id -> 指纹"""
+        job_ids = [job_id for job_id in dict.fromkeys(job_ids) if job_id not in INVALID_JOB_IDS]
+        result = {}
+        with self._lock:
+            for start in range(0, len(job_ids), _QUERY_CHUNK_SIZE):
+                chunk = job_ids[start:start + _QUERY_CHUNK_SIZE]
+                rows = self._conn.execute(
+                    f"SELECT job_id, fingerprint FROM judgments WHERE search = ? "
+                    f"AND job_id IN ({','.join('?' * len(chunk))})", [search] + chunk
+                ).fetchall()
+                result.update(rows)
+        return result
+
+    def mark_judged(self, search: str, jobs: Iterable[Mapping[str, Any]]) -> int:
+        """
+        记录某个搜索中的职位已经判断成功，之后卡片指纹不变时不再判断
+
+        Returns:
+            记录的职位数量（job_id无效的职位被跳过）
+        """
+        now = time.time()
+        rows = [(search, job['job_id'], card_fingerprint(job), now)
+                for job in jobs if job.get('job_id') not in INVALID_JOB_IDS]
+        if not rows:
+            return 0
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO judgments (search, job_id, fingerprint, judged_at) VALUES (?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """读取一个职位的完整信息，不存在时返回None"""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_many(self, job_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """批量读取职位，返回 job_id -> 职位信息"""
+        job_ids = list(dict.fromkeys(job_ids))
+        result = {}
+        with self._lock:
+            for start in range(0, len(job_ids), _QUERY_CHUNK_SIZE):
+                chunk = job_ids[start:start + _QUERY_CHUNK_SIZE]
+                rows = self._conn.execute(
+                    f"SELECT job_id, data FROM jobs WHERE job_id IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                result.update((job_id, json.loads(data)) for job_id, data in rows)
+        return result
+
+    def recent(self, since_post_time: str = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """按发布时间从新到旧列出职位，since_post_time为发布时间下限（与post_time相同的字符串格式）"""
+        with self._lock:
+            if since_post_time is None:
+                rows = self._conn.execute(
+                    "SELECT data FROM jobs ORDER BY post_time DESC LIMIT ?", (limit,)
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT data FROM jobs WHERE post_time >= ? ORDER BY post_time DESC LIMIT ?",
+                    (since_post_time, limit)
+                ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def __contains__(self, job_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM jobs WHERE job_id = ?", (job_id,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
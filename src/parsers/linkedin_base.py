@@ -0,0 +1,277 @@
+from typing import Dict, Any, List, Optional, Union, Set, Tuple, Mapping
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import random
+import logging
+from .html_backends import HtmlBackend, get_html_backend, DESCRIPTION_NOT_AVAILABLE
+from .job_record import JobRecord, LINKEDIN_FORMAT_TEMPLATE
+from .proxy_pool import ProxyPool
+from .http_cache import HttpCache, CacheEntry
+from .job_store import JobStore, card_fingerprint
+
+
+# LinkedIn搜索结果每页的职位数量，翻页时通过start参数指定偏移
+SEARCH_PAGE_SIZE = 25
+
+# 格式化dict形式的职位信息时，缺失字段使用的默认值
+FORMAT_DEFAULTS = {
+    'title': 'Not specified',
+    'company': 'Not specified',
+    'company_link': '#',
+    'job_link': '#',
+    'location': 'Not specified',
+    'post_time': 'Not specified',
+    'company_logo': 'Not specified',
+    'benefits': 'Not specified',
+    'job_id': 'Not specified',
+    'reference_id': 'Not specified',
+    'tracking_id': 'Not specified',
+    'full_description': 'Description not available',
+}
+
+# 逐个产出职位时，每攒够这么多个职位批量写入一次job_store
+SAVE_BATCH_SIZE = 50
+
+# 代理的出口IP被网站封禁或限流时返回的状态码，这类响应计为代理的失败而不是成功
+PROXY_BLOCKED_STATUS_CODES = (403, 429)
+
+
+class LinkedInParserBase:
+    """
+    LinkedIn解析器的公共部分
+
+    同步的LinkedInParser和异步的AsyncLinkedInParser共用这里的请求头、代理轮换、HTML解析和格式化逻辑，
+    子类只需要负责发送网络请求。HTML解析交给可替换的HtmlBackend，见html_backends模块。
+    """
+
+    def __init__(self, proxies: Union[List[str], ProxyPool] = None, cookies: str = None,
+                 html_backend: Union[str, HtmlBackend] = "strained",
+                 max_pages: int = 40, page_concurrency: int = 3):
+        # 更真实的请求头
+        self.headers = {
+            'User-Agent': self._get_random_user_agent(),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Accept-Encoding': 'gzip, deflate, br',
+            'DNT': '1',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1',
+            'Sec-Fetch-Dest': 'document',
+            'Sec-Fetch-Mode': 'navigate',
+            'Sec-Fetch-Site': 'none',
+            'Sec-Fetch-User': '?1',
+            'Cache-Control': 'max-age=0',
+        }
+
+        # 代理池：可以传入代理列表，也可以传入多个解析器共享的ProxyPool实例；共享的实例由调用方管理其健康检查
+        self._owns_proxy_pool = not isinstance(proxies, ProxyPool)
+        self.proxy_pool = ProxyPool(proxies) if self._owns_proxy_pool else proxies
+
+        # 设置Cookie
+        if cookies:
+            self.headers['Cookie'] = cookies
+
+        # HTML解析后端
+        self.html_backend = get_html_backend(html_backend)
+
+        # 翻页配置：最多翻多少页，同时抓取多少页
+        self.max_pages = max(1, max_pages)
+        self.page_concurrency = max(1, page_concurrency)
+
+        # HTTP缓存和职位存储，由子类按需设置
+        self.http_cache: Optional[HttpCache] = None
+        self.job_store: Optional[JobStore] = None
+        self.incremental = False
+
+        # 配置日志
+        self.logger = logging.getLogger(type(self).__module__)
+
+    def _get_random_user_agent(self) -> str:
+        """返回随机User-Agent"""
+        user_agents = [
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0',
+            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.1 Safari/605.1.15',
+        ]
+        return random.choice(user_agents)
+
+    def _get_next_proxy(self) -> Optional[Dict[str, str]]:
+        """从代理池中按分数选择一个代理，没有可用代理时返回None（直连）"""
+        proxy = self.proxy_pool.acquire()
+        return {'https': proxy} if proxy else None
+
+    def _start_proxy_pool(self, rate_limiter):
+        """解析器自己创建的代理池使用解析器的限速器，并启动后台健康检查；子类设置好限速器后调用"""
+        if self._owns_proxy_pool:
+            self.proxy_pool.rate_limiter = rate_limiter
+            self.proxy_pool.start_health_checks()
+
+    def _stop_proxy_pool(self):
+        """停止解析器自己创建的代理池的后台健康检查"""
+        if self._owns_proxy_pool:
+            self.proxy_pool.stop_health_checks()
+
+    def _handle_proxy_response(self, proxy: Optional[str], status_code: int, latency: float):
+        """根据响应状态码记录代理的一次成功或失败：403/429说明代理的出口IP被封禁或限流"""
+        if status_code in PROXY_BLOCKED_STATUS_CODES:
+            self._handle_proxy_failure(proxy)
+        else:
+            self._handle_proxy_success(proxy, latency)
+
+    def _handle_proxy_success(self, proxy: Optional[str], latency: float):
+        """记录代理的一次成功请求及其耗时"""
+        if proxy:
+            self.proxy_pool.report_success(proxy, latency)
+
+    def _handle_proxy_failure(self, proxy: Optional[str]):
+        """处理代理失败的情况，连续失败的代理会被代理池暂时隔离"""
+        if proxy:
+            self.proxy_pool.report_failure(proxy)
+
+    def _lookup_cache(self, url: str, is_search: bool) -> Tuple[Optional[CacheEntry], bool]:
+        """
+        查询HTTP缓存
+
+        Returns:
+            (缓存记录, 是否仍在有效期内)，没有配置缓存或没有记录时缓存记录为None
+        """
+        if self.http_cache is None:
+            return None, False
+        entry = self.http_cache.get(url)
+        if entry is None:
+            return None, False
+        ttl = self.http_cache.search_ttl if is_search else self.http_cache.detail_ttl
+        if entry.age <= ttl:
+            self.http_cache.record(hit=True)
+            return entry, True
+        return entry, False
+
+    def _store_response(self, url: str, status_code: int, text: str, headers: Mapping[str, str],
+                        entry: Optional[CacheEntry]) -> str:
+        """把网络响应写入HTTP缓存并返回页面HTML；304表示缓存内容未变化，直接返回缓存的正文"""
+        if self.http_cache is None:
+            return text
+        if status_code == 304 and entry is not None:
+            self.http_cache.refresh(url)
+            self.http_cache.record(revalidated=True)
+            return entry.body
+        self.http_cache.record(hit=False)
+        if status_code == 200:
+            self.http_cache.set(url, text, headers.get('ETag'), headers.get('Last-Modified'))
+        return text
+
+    def _extract_job_cards(self, html: str) -> List[Dict[str, Any]]:
+        """从搜索结果页面的HTML中提取所有职位卡片的基本信息"""
+        return self.html_backend.extract_job_cards(html)
+
+    @staticmethod
+    def _page_url(url: str, start: int) -> str:
+        """生成搜索结果第start个职位开始的那一页的URL，start为0时返回原URL"""
+        if start <= 0:
+            return url
+        parts = urlsplit(url)
+        query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != 'start']
+        query.append(('start', str(start)))
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
+    def _next_page_wave(self, next_page: int, collected: int, max_num: int) -> List[int]:
+        """
+        计算下一批要同时抓取的页码
+
+        指定了max_num时只抓取凑够数量所需的页数，避免多抓；否则每批抓取page_concurrency页，总页数不超过max_pages
+        """
+        remaining_pages = self.max_pages - next_page
+        if max_num > 0:
+            needed = max_num - collected
+            remaining_pages = min(remaining_pages, (needed + SEARCH_PAGE_SIZE - 1) // SEARCH_PAGE_SIZE)
+        wave_size = max(0, min(self.page_concurrency, remaining_pages))
+        return list(range(next_page, next_page + wave_size))
+
+    @staticmethod
+    def _merge_page_cards(job_cards: List[Dict[str, Any]], seen_ids: Set[str],
+                          page_cards: List[Dict[str, Any]]) -> int:
+        """
+        把一页的职位卡片按job_id去重后加入job_cards，返回新增的数量
+
+        没有有效job_id的卡片（'Not specified'、'Error'）无法去重，直接加入
+        """
+        added = 0
+        for card in page_cards:
+            job_id = card.get('job_id')
+            if job_id and job_id not in ('Not specified', 'Error'):
+                if job_id in seen_ids:
+                    continue
+                seen_ids.add(job_id)
+            job_cards.append(card)
+            added += 1
+        return added
+
+    def _filter_new_cards(self, job_cards: List[Dict[str, Any]],
+                          incremental: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        增量模式下过滤掉已保存且卡片没有变化的职位，只返回需要抓取详情页的职位
+
+        被跳过的职位会更新最近出现时间；没有配置job_store或未开启增量模式时原样返回。
+        incremental为None时使用self.incremental
+        """
+        if incremental is None:
+            incremental = self.incremental
+        if self.job_store is None or not incremental or not job_cards:
+            return job_cards
+        known = self.job_store.fingerprints(card.get('job_id') for card in job_cards)
+        new_cards, unchanged_ids = [], []
+        for card in job_cards:
+            if known.get(card.get('job_id')) == card_fingerprint(card):
+                unchanged_ids.append(card['job_id'])
+            else:
+                new_cards.append(card)
+        self.job_store.touch(unchanged_ids)
+        if unchanged_ids:
+            self.logger.info(f"增量模式跳过{len(unchanged_ids)}个已保存的职位，剩余{len(new_cards)}个新职位")
+        return new_cards
+
+    def _save_jobs(self, jobs: List[Dict[str, Any]]):
+        """把抓取完成的职位批量写入job_store；详情页抓取失败的职位不保存，下次运行时会重新抓取"""
+        if self.job_store is None or not jobs:
+            return
+        self.job_store.upsert_many(
+            job for job in jobs if job.get('full_description') != DESCRIPTION_NOT_AVAILABLE)
+
+    def _parse_job_description(self, html: str) -> str:
+        """从职位详情页面的HTML中提取职位详细描述"""
+        return self.html_backend.extract_job_description(html)
+
+    def format_all_job_descriptions(self, jobs: List[Dict[str, Any]]) -> List[str]:
+        """
+        格式化多个职位信息为字符串
+
+        Args:
+            jobs: 包含多个职位信息的列表
+
+        Returns:
+            包含多个格式化职位描述字符串的列表
+        """
+        return [self.format_job_description_str(job) for job in jobs]
+
+    def format_job_description_str(self, job_info: Mapping[str, Any]) -> str:
+        """
+        根据职位信息生成格式化描述字符串
+
+        Args:
+            job_info: 职位信息，JobRecord或dict
+
+        Returns:
+            格式化的职位描述字符串，JobRecord的格式化结果会缓存在记录中
+        """
+        if isinstance(job_info, JobRecord):
+            return job_info.formatted
+
+        try:
+            # 使用默认值补全缺失字段
+            complete_job_info = {key: job_info.get(key, default_value) for key, default_value in FORMAT_DEFAULTS.items()}
+
+            # 格式化模板字符串
+            return LINKEDIN_FORMAT_TEMPLATE.format(**complete_job_info)
+        except Exception as e:
+            print(f"Error formatting job description: {str(e)}")
+            return "An error occurred while formatting the job description."
@@ -1,30 +1,21 @@
 import requests
-from bs4 import BeautifulSoup
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterator, Union, Callable
 from .web_parser import WebParser
+from .html_backends import HtmlBackend
+from .job_record import JobRecord
+from .linkedin_base import LinkedInParserBase, LINKEDIN_FORMAT_TEMPLATE, SEARCH_PAGE_SIZE, SAVE_BATCH_SIZE
+from .rate_limiter import HostRateLimiter, default_rate_limiter, parse_retry_after
+from .proxy_pool import ProxyPool
+from .session_pool import SessionPool
+from .http_cache import HttpCache
+from .job_store import JobStore
 import time
-import random
-from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from urllib3.util.retry import Retry
-import logging
 import requests.exceptions
 
-LINKEDIN_FORMAT_TEMPLATE = """
-**Job Title**: {title}
-**Company**: {company}  
-**Company Link**: [Visit Company]({company_link})  
-**Job Location**: {location}  
-**Posted On**: {post_time}  
-**Job Benefits**: {benefits}  
 
----
-
-### **Job Description**:
-{full_description}
-"""
-
-
-class LinkedInParser(WebParser):
+class LinkedInParser(LinkedInParserBase, WebParser):
     """
     LinkedIn招聘信息解析器
 
@@ -32,122 +23,96 @@ class LinkedInParser(WebParser):
     解析的过程分了两步，这是因为职位列表页面只提供了部分信息，需要进入职位详情页面获取完整信息。
     """
 
-    def __init__(self, proxies: List[str] = None, cookies: str = None):
-        # 更真实的请求头
-        self.headers = {
-            'User-Agent': self._get_random_user_agent(),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Cache-Control': 'max-age=0',
-        }
-
-        # 修改代理相关的初始化
-        self.proxies = list(proxies) if proxies else []  # 转换为列表以支持修改
-        self.current_proxy_index = 0
-        self.failed_proxies = set()  # 记录失败的代理
-        
-        # 添加代理健康检查的配置
-        self.proxy_max_fails = 3  # 代理失败次数阈值
-        self.proxy_fail_counts = {}  # 记录每个代理的失败次数
-
-        # 设置Cookie
-        if cookies:
-            self.headers['Cookie'] = cookies
-
-        # 配置重试策略
-        self.session = requests.Session()
+    def __init__(self,
+                 proxies: Union[List[str], ProxyPool] = None,
+                 cookies: str = None,
+                 html_backend: Union[str, HtmlBackend] = "strained",
+                 max_workers: int = 1,
+                 rate_limiter: HostRateLimiter = None,
+                 connect_timeout: float = 3,
+                 pool_maxsize: int = None,
+                 http_cache: HttpCache = None,
+                 job_store: JobStore = None,
+                 incremental: bool = True,
+                 max_pages: int = 40,
+                 page_concurrency: int = 3):
+        """
+        Args:
+            proxies: 代理列表，或者多个解析器共享的ProxyPool实例
+            cookies: 请求时携带的Cookie
+            html_backend: HTML解析后端，可选 bs4 / strained / lxml / selectolax，也可以传入HtmlBackend实例
+            max_workers: 并发抓取职位详情页时的最大并发数，1表示串行抓取
+            rate_limiter: 按host限速的限速器，默认使用进程内共享的default_rate_limiter，
+                多个解析器实例共用同一个限速器时，对同一网站的总请求速率受同一个令牌桶控制
+            connect_timeout: 建立连接的超时时间（秒），失效的代理不必等满整个读取超时才被发现
+            pool_maxsize: 每个代理（以及直连）保持的最大连接数，默认与最大并发数相同
+            http_cache: 页面缓存，None表示不缓存；重复运行时未过期的页面不再访问网络
+            job_store: 职位存储，抓取完成的职位会批量写入其中，None表示不保存
+            incremental: 配置了job_store时是否启用增量模式：已保存且卡片没有变化的职位不再抓取详情页，也不会出现在解析结果中
+            max_pages: 最多翻多少页搜索结果（每页25个职位）
+            page_concurrency: 翻页时同时抓取的页数
+        """
+        super().__init__(proxies, cookies, html_backend, max_pages, page_concurrency)
+        self.connect_timeout = connect_timeout
+
+        # 并发抓取的配置
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = rate_limiter if rate_limiter is not None else default_rate_limiter
+        self.http_cache = http_cache
+        self.job_store = job_store
+        self.incremental = incremental
+
+        # 配置重试策略：429/5xx交给_make_request处理，这样限速器才能根据它们调整速率；
+        # 连接失败也不在urllib3内部重试，而是立即反馈给代理池并换一个代理
         retries = Retry(
             total=5,
+            connect=0,
             backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=False,
         )
-        self.session.mount('https://', HTTPAdapter(max_retries=retries))
-
-        # 配置日志
-        self.logger = logging.getLogger(__name__)
-
-    def _get_random_user_agent(self) -> str:
-        """返回随机User-Agent"""
-        user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.1 Safari/605.1.15',
-        ]
-        return random.choice(user_agents)
-
-    def _get_next_proxy(self) -> Optional[Dict[str, str]]:
-        """获取下一个可用的代理"""
-        if not self.proxies:
-            return None
-            
-        # 尝试所有代理直到找到一个可用的
-        attempts = len(self.proxies)
-        while attempts > 0:
-            proxy = self.proxies[self.current_proxy_index]
-            self.current_proxy_index = (self.current_proxy_index + 1) % len(self.proxies)
-            
-            # 如果代理未被标记为失败，则使用它
-            if proxy not in self.failed_proxies:
-                return {'https': proxy}
-                
-            attempts -= 1
-            
-        # 如果所有代理都失败了，返回None
-        return None
-        
-    def _check_proxy_health(self, proxy: str) -> bool:
-        """检查代理是否可用"""
-        try:
-            test_url = "https://www.linkedin.com/robots.txt"  # 使用robots.txt作为测试URL
-            response = requests.get(
-                test_url,
-                proxies={'https': proxy},
-                headers=self.headers,
-                timeout=5
-            )
-            return response.status_code == 200
-        except:
-            return False
-            
-    def _handle_proxy_failure(self, proxy: str):
-        """处理代理失败的情况"""
-        if not proxy:
-            return
-            
-        # 更新失败计数
-        self.proxy_fail_counts[proxy] = self.proxy_fail_counts.get(proxy, 0) + 1
-        
-        # 如果失败次数超过阈值，将代理标记为失败并从代理池中移除
-        if self.proxy_fail_counts[proxy] >= self.proxy_max_fails:
-            self.failed_proxies.add(proxy)
-            if proxy in self.proxies:
-                self.logger.warning(f"Removing failed proxy: {proxy}")
-                self.proxies.remove(proxy)
-                # 重置当前代理索引
-                self.current_proxy_index = 0 if self.proxies else -1
-                
-    def _make_request(self, url: str, max_retries: int = 3) -> requests.Response:
-        """发送请求并处理可能的错误"""
+        # 每个代理一个持久Session，同一代理上的并发请求复用已建立的连接
+        if pool_maxsize is None:
+            pool_maxsize = max(self.max_workers, self.page_concurrency)
+        self.session_pool = SessionPool(self.headers, pool_maxsize=pool_maxsize, max_retries=retries)
+        # 代理被隔离或移除时关闭它的Session，不再占用到失效代理的连接；冷却后重新启用时会创建新的Session
+        self.proxy_pool.add_listener(self.session_pool.discard)
+        self._start_proxy_pool(self.rate_limiter)
+
+    def close(self):
+        """关闭所有代理的Session及其连接，并停止自己创建的代理池的健康检查"""
+        self.proxy_pool.remove_listener(self.session_pool.discard)
+        self.session_pool.close()
+        self._stop_proxy_pool()
+
+    def _send(self, url: str, proxy: Optional[str], headers: Dict[str, str] = None) -> requests.Response:
+        """
+        经过限速器，用代理对应的Session发送一次GET请求，并把响应状态反馈给限速器，把耗时和状态反馈给代理池
+
+        公共请求头在Session创建时已经设置好，这里只传入本次请求随机选择的User-Agent和headers，不修改共享状态
+        """
+        request_headers = {'User-Agent': self._get_random_user_agent()}
+        if headers:
+            request_headers.update(headers)
+
+        self.rate_limiter.acquire(url)
+        start = time.monotonic()
+        response = self.session_pool.get(proxy).get(
+            url,
+            headers=request_headers,
+            timeout=(self.connect_timeout, 10)
+        )
+        self._handle_proxy_response(proxy, response.status_code, time.monotonic() - start)
+        self.rate_limiter.on_response(url, response.status_code,
+                                      parse_retry_after(response.headers.get('Retry-After')))
+        return response
+
+    def _make_request(self, url: str, max_retries: int = 3, headers: Dict[str, str] = None) -> requests.Response:
+        """发送请求并处理可能的错误，headers为本次请求额外的请求头"""
         last_exception = None
         failed_attempts = []  # 记录所有失败的尝试
         
         for attempt in range(max_retries):
             try:
-                # 随机延迟
-                time.sleep(random.uniform(2, 5))
-                
-                # 更新请求头
-                self.headers['User-Agent'] = self._get_random_user_agent()
-                
                 # 获取代理
                 proxies = self._get_next_proxy()
                 current_proxy = proxies['https'] if proxies else None
@@ -159,13 +124,8 @@ class LinkedInParser(WebParser):
                     'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
                 }
                 
-                # 发送请求
-                response = self.session.get(
-                    url,
-                    headers=self.headers,
-                    proxies=proxies,
-                    timeout=10
-                )
+                # 发送请求，等待时间由限速器决定
+                response = self._send(url, current_proxy, headers)
                 
                 # 检查响应状态
                 response.raise_for_status()
@@ -192,22 +152,15 @@ class LinkedInParser(WebParser):
                 if isinstance(e, (requests.exceptions.ProxyError, requests.exceptions.ConnectTimeout)):
                     self._handle_proxy_failure(current_proxy)
                     
+                # 429/5xx已经反馈给限速器，下一次请求前会按降低后的速率和Retry-After等待
                 last_exception = e
-                if attempt == max_retries - 1:
-                    break
-                    
-                time.sleep(random.uniform(5, 10))  # 失败后等待更长时间
                 
         # 如果所有重试都失败了
-        if not self.proxies:
+        if not self.proxy_pool.available_count():
             self.logger.error("All proxies have failed, trying without proxy")
             # 尝试不使用代理发送请求
             try:
-                response = self.session.get(
-                    url,
-                    headers=self.headers,
-                    timeout=10
-                )
+                response = self._send(url, None, headers)
                 response.raise_for_status()
                 return response
             except requests.exceptions.RequestException as e:
@@ -225,8 +178,9 @@ class LinkedInParser(WebParser):
         print("\n=== LinkedIn访问失败详细信息 ===")
         print(f"目标URL: {url}")
         print(f"总尝试次数: {len(failed_attempts)}")
-        print(f"剩余可用代理数量: {len(self.proxies)}")
-        print(f"已失败代理数量: {len(self.failed_proxies)}")
+        pool_stats = self.proxy_pool.stats()
+        print(f"剩余可用代理数量: {pool_stats['active']}")
+        print(f"已隔离代理数量: {pool_stats['quarantined']}")
         print("\n失败记录:")
         for attempt in failed_attempts:
             print(f"\n尝试 {attempt['attempt']}:")
@@ -239,180 +193,185 @@ class LinkedInParser(WebParser):
         raise Exception(
             f"LinkedIn访问失败 - 已尝试{len(failed_attempts)}次\n"
             f"最后错误: {str(last_exception)}\n"
-            f"剩余可用代理: {len(self.proxies)}"
+            f"剩余可用代理: {pool_stats['active']}"
         )
 
-    def parse(self, url: str, max_num: int = -1) -> List[Dict[str, Any]]:
-        """解析LinkedIn职位搜索结果页面"""
-        try:
-            response = self._make_request(url)
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # 获取所有职位卡片
-            job_cards = soup.find_all('div', class_='job-search-card')
-            jobs_info = []
+    def _fetch_html(self, url: str, is_search: bool = False) -> str:
+        """
+        获取页面HTML
 
-            for card in job_cards:
-                try:
-                    job_info = self._get_info_from_card(card)
-                    jobs_info.append(job_info)
+        配置了http_cache时，有效期内的页面直接从缓存读取；过期的页面带上ETag/Last-Modified发送条件请求，
+        服务端返回304时沿用缓存的内容。搜索结果页和职位详情页使用不同的有效期。
+        """
+        entry, fresh = self._lookup_cache(url, is_search)
+        if fresh:
+            return entry.body
+        response = self._make_request(url, headers=entry.validators() if entry else None)
+        return self._store_response(url, response.status_code, response.text, response.headers, entry)
 
-                    if 0 < max_num <= len(jobs_info):
-                        break
+    def parse(self, url: str, max_num: int = -1) -> List[Dict[str, Any]]:
+        """
+        解析LinkedIn职位搜索结果页面，自动翻页直到凑够max_num个职位或没有更多结果
 
-                except Exception as e:
-                    self.logger.error(f"解析单个职位卡片时出错: {str(e)}")
-                    continue
+        增量模式下max_num限制的是搜索结果中的职位数量，已保存的职位会被跳过，因此返回的职位可能更少
+        """
+        try:
+            # 获取所有职位卡片，增量模式下只保留新职位
+            job_cards = self._filter_new_cards(self._collect_job_cards(url, max_num))
 
+            jobs_info = self._get_info_from_cards(job_cards)
+            self._save_jobs(jobs_info)
             return jobs_info
 
         except Exception as e:
             self.logger.error(f"解析LinkedIn页面失败: {str(e)}")
             raise
 
-    def format_all_job_descriptions(self, jobs: List[Dict[str, Any]]) -> List[str]:
+    def _collect_job_cards(self, url: str, max_num: int) -> List[Dict[str, Any]]:
         """
-        格式化多个职位信息为字符串
-
-        Args:
-            jobs: 包含多个职位信息的列表
+        翻页收集职位卡片的基本信息
 
-        Returns:
-            包含多个格式化职位描述字符串的列表
+        第一页单独抓取（失败时抛出异常），之后每批同时抓取多页，按job_id去重；
+        凑够max_num个、某一页没有新职位、某一页抓取失败或达到max_pages时停止。
         """
-        return [self.format_job_description_str(job) for job in jobs]
+        job_cards, seen_ids = [], set()
+        first_page = self._extract_job_cards(self._fetch_html(url, is_search=True))
+        if not self._merge_page_cards(job_cards, seen_ids, first_page):
+            return job_cards
+
+        next_page = 1
+        while not 0 < max_num <= len(job_cards):
+            wave = self._next_page_wave(next_page, len(job_cards), max_num)
+            if not wave:
+                break
+            next_page = wave[-1] + 1
+
+            page_urls = [self._page_url(url, page * SEARCH_PAGE_SIZE) for page in wave]
+            if len(page_urls) == 1:
+                pages = [self._safe_fetch_page_cards(page_urls[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=len(page_urls)) as executor:
+                    pages = list(executor.map(self._safe_fetch_page_cards, page_urls))
+
+            exhausted = False
+            for page_cards in pages:
+                if not page_cards or not self._merge_page_cards(job_cards, seen_ids, page_cards):
+                    exhausted = True
+                    break
+            if exhausted:
+                break
 
-    def format_job_description_str(self, job_info: Dict[str, Any]) -> str:
-        """
-        根据职位信息生成格式化描述字符串
+        if max_num > 0:
+            job_cards = job_cards[:max_num]
+        return job_cards
 
-        Args:
-            job_info: 包含职位基本信息的字典
+    def _safe_fetch_page_cards(self, page_url: str) -> Optional[List[Dict[str, Any]]]:
+        """抓取一页搜索结果并提取职位卡片，失败时返回None"""
+        try:
+            return self._extract_job_cards(self._fetch_html(page_url, is_search=True))
+        except Exception as e:
+            self.logger.warning(f"获取搜索结果分页失败: {page_url}: {str(e)}")
+            return None
 
-        Returns:
-            格式化的职位描述字符串
+    def iter_parse(self, url: str, max_num: int = -1,
+                   card_filter: Optional[Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]] = None,
+                   incremental: Optional[bool] = None) -> Iterator[Dict[str, Any]]:
         """
-        # 定义默认值
-        default_values = {
-            'title': 'Not specified',
-            'company': 'Not specified',
-            'company_link': '#',
-            'job_link': '#',
-            'location': 'Not specified',
-            'post_time': 'Not specified',
-            'company_logo': 'Not specified',
-            'benefits': 'Not specified',
-            'job_id': 'Not specified',
-            'reference_id': 'Not specified',
-            'tracking_id': 'Not specified',
-            'full_description': 'Description not available',
-        }
+        以生成器的形式解析LinkedIn职位搜索结果页面，每个职位的详情页抓取完成后立即产出
 
+        max_workers > 1 时最多同时抓取 max_workers 个详情页，产出顺序为完成顺序；
+        调用方消费得慢时不会继续提交新的抓取，从而形成背压。
+        card_filter在增量模式的过滤之后、抓取详情页之前应用，被它去掉的职位不会抓取详情页。
+        incremental不为None时只对本次调用覆盖self.incremental，不影响共用同一个解析器的其他调用方。
+        """
         try:
-            # 使用默认值补全缺失字段
-            complete_job_info = {key: job_info.get(key, default_value) for key, default_value in default_values.items()}
-
-            # 格式化模板字符串
-            return LINKEDIN_FORMAT_TEMPLATE.format(**complete_job_info)
+            job_cards = self._filter_new_cards(self._collect_job_cards(url, max_num), incremental)
+            if card_filter is not None:
+                job_cards = card_filter(job_cards)
         except Exception as e:
-            print(f"Error formatting job description: {str(e)}")
-            return "An error occurred while formatting the job description."
+            self.logger.error(f"解析LinkedIn页面失败: {str(e)}")
+            raise
 
-    def _get_info_from_card(self, card) -> Dict[str, Any]:
-        """从职位卡片中提取所有可以提取的信息，首先从搜索结果页面card中提取的信息，然后进入职位详情页面获取详细描述"""
-        job_info = self._extract_job_card_basic_info(card)
-        job_info['full_description'] = self._extract_job_detailed_description(job_info['job_link'])
-        return job_info
+        # 产出的职位先攒起来，分批写入job_store
+        unsaved = []
+        jobs = self._iter_info_from_cards(job_cards)
+        try:
+            for job_info in jobs:
+                unsaved.append(job_info)
+                if len(unsaved) >= SAVE_BATCH_SIZE:
+                    self._save_jobs(unsaved)
+                    unsaved = []
+                yield job_info
+        finally:
+            # 调用方提前结束迭代时，先停止抓取，再保存已经产出的职位
+            jobs.close()
+            self._save_jobs(unsaved)
+
+    def _iter_info_from_cards(self, job_cards: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """逐个产出职位卡片的完整信息，max_workers > 1 时按完成顺序产出"""
+        if self.max_workers <= 1:
+            for card in job_cards:
+                job_info = self._safe_get_info_from_card(card)
+                if job_info is not None:
+                    yield job_info
+            return
 
-    def _extract_job_card_basic_info(self, card) -> dict:
-        """
-        提取单个职位卡片的详细信息
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending_cards = iter(job_cards)
+            in_flight = set()
+            try:
+                while True:
+                    # 补充提交任务，保持最多 max_workers 个抓取在进行
+                    for card in pending_cards:
+                        in_flight.add(executor.submit(self._safe_get_info_from_card, card))
+                        if len(in_flight) >= self.max_workers:
+                            break
+                    if not in_flight:
+                        break
 
-        Args:
-            card: BeautifulSoup解析后的职位卡片HTML元素
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        job_info = future.result()
+                        if job_info is not None:
+                            yield job_info
+            finally:
+                # 调用方提前结束迭代时，取消还未开始的抓取
+                for future in in_flight:
+                    future.cancel()
+
+    def _get_info_from_cards(self, cards) -> List[Dict[str, Any]]:
+        """
+        获取多个职位卡片的完整信息
 
-        Returns:
-            包含职位信息的字典
+        max_workers > 1 时使用线程池并发抓取职位详情页，最多同时有 max_workers 个请求在进行。
+        返回结果的顺序与cards一致，单个卡片出错时跳过该卡片，不影响其他卡片。
         """
-        try:
-            # 职位标题
-            title_elem = card.find('h3', class_='base-search-card__title')
-            title = title_elem.get_text(strip=True) if title_elem else 'Not specified'
-
-            # 公司名称
-            company_elem = card.find('h4', class_='base-search-card__subtitle')
-            company = company_elem.get_text(strip=True) if company_elem else 'Not specified'
-
-            # 公司链接
-            company_link_elem = company_elem.find('a') if company_elem else None
-            company_link = company_link_elem.get('href') if company_link_elem else 'Not specified'
-
-            # 职位链接
-            link_elem = card.find('a', class_='base-card__full-link')
-            job_link = link_elem.get('href') if link_elem else 'Not specified'
-
-            # 工作地点
-            location_elem = card.find('span', class_='job-search-card__location')
-            location = location_elem.get_text(strip=True) if location_elem else 'Not specified'
-
-            # 发布时间
-            time_elem = card.find('time', class_='job-search-card__listdate')
-            post_time = time_elem.get('datetime') if time_elem else 'Not specified'
-
-            # 公司 Logo 链接
-            logo_elem = card.find('img', class_='artdeco-entity-image')
-            company_logo = logo_elem.get('data-delayed-url') if logo_elem else 'Not specified'
-
-            # 职位福利信息 (例如 "Be an early applicant")
-            benefits_elem = card.find('span', class_='job-posting-benefits__text')
-            benefits = benefits_elem.get_text(strip=True) if benefits_elem else 'Not specified'
-
-            # 职位元数据 (如 ID、参考ID、跟踪ID等)
-            job_id = card.get('data-entity-urn', 'Not specified').split(':')[-1]
-            reference_id = card.get('data-reference-id', 'Not specified')
-            tracking_id = card.get('data-tracking-id', 'Not specified')
-
-            # 汇总提取信息
-            job_details = {
-                'title': title,
-                'company': company,
-                'company_link': company_link,
-                'job_link': job_link,
-                'location': location,
-                'post_time': post_time,
-                'company_logo': company_logo,
-                'benefits': benefits,
-                'job_id': job_id,
-                'reference_id': reference_id,
-                'tracking_id': tracking_id
-            }
-
-            return job_details
+        if self.max_workers <= 1 or len(cards) <= 1:
+            results = [self._safe_get_info_from_card(card) for card in cards]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(cards))) as executor:
+                results = list(executor.map(self._safe_get_info_from_card, cards))
+
+        return [job_info for job_info in results if job_info is not None]
 
+    def _safe_get_info_from_card(self, card) -> Optional[Dict[str, Any]]:
+        """同 _get_info_from_card，出错时记录日志并返回None"""
+        try:
+            return self._get_info_from_card(card)
         except Exception as e:
-            print(f"提取职位卡片信息时出错: {str(e)}")
-            return {
-                'title': 'Error',
-                'company': 'Error',
-                'company_link': 'Error',
-                'job_link': 'Error',
-                'location': 'Error',
-                'post_time': 'Error',
-                'company_logo': 'Error',
-                'benefits': 'Error',
-                'job_id': 'Error',
-                'reference_id': 'Error',
-                'tracking_id': 'Error'
-            }
+            self.logger.error(f"解析单个职位卡片时出错: {str(e)}")
+            return None
+
+    def _get_info_from_card(self, card: Dict[str, Any]) -> Dict[str, Any]:
+        """补全职位卡片的信息，card是从搜索结果页面中提取的基本信息，这里进入职位详情页面获取详细描述"""
+        job_info = JobRecord.from_mapping(card)
+        job_info['full_description'] = self._extract_job_detailed_description(job_info['job_link'])
+        return job_info
 
     def _extract_job_detailed_description(self, job_link: str) -> str:
         """获取职位详细描述"""
         try:
-            response = self._make_request(job_link)
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            description_elem = soup.find('div', class_='show-more-less-html__markup')
-            return description_elem.get_text(strip=True) if description_elem else 'Description not available'
+            return self._parse_job_description(self._fetch_html(job_link))
 
         except Exception as e:
             self.logger.error(f"获取职位详细描述失败: {str(e)}")
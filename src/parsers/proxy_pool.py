@@ -0,0 +1,292 @@
+"""
+代理池
+
+为每个代理维护延迟和成功率的指数加权移动平均（EWMA），选择代理时按分数加权随机，快且稳定的代理被选中的概率更高。
+连续失败的代理进入隔离状态，冷却时间过后自动重新启用（冷却时间随连续隔离次数翻倍）；
+调用start_health_checks后，后台线程定期并发探测所有代理，隔离中的代理探测成功后也会提前重新启用。
+探测请求与解析器的请求一样经过限速器。
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional
+
+import requests
+
+from .rate_limiter import HostRateLimiter, default_rate_limiter, parse_retry_after
+
+ACTIVE = 'active'
+QUARANTINED = 'quarantined'
+
+
+class ProxyState:
+    """单个代理的统计信息"""
+
+    __slots__ = ('proxy', 'latency', 'success_rate', 'consecutive_failures', 'status',
+                 'quarantined_until', 'quarantine_count', 'requests', 'failures')
+
+    def __init__(self, proxy: str, initial_latency: float):
+        self.proxy = proxy
+        self.latency = initial_latency  # 延迟的EWMA（秒）
+        self.success_rate = 1.0  # 成功率的EWMA
+        self.consecutive_failures = 0
+        self.status = ACTIVE
+        self.quarantined_until = 0.0
+        self.quarantine_count = 0  # 连续被隔离的次数，成功一次后清零
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def score(self) -> float:
+        """选择权重：成功率越高、延迟越低，分数越高"""
+        return self.success_rate / max(self.latency, 0.05)
+
+
+class ProxyPool:
+    """
+    按延迟和成功率打分的代理池，线程安全，可以在多个解析器之间共享
+
+    用法:
+        pool = ProxyPool(["http://1.2.3.4:8080", ...])
+        proxy = pool.acquire()          # None表示没有可用代理，应直连
+        ...
+        pool.report_success(proxy, latency) / pool.report_failure(proxy)
+
+    后台健康检查需要显式启动：pool.start_health_checks()，不再使用时调用pool.stop_health_checks()。
+    LinkedInParser根据代理列表自己创建的代理池由解析器启动，并在close时停止。
+
+    add_listener注册的回调在代理被隔离或移除时以代理地址为参数调用，解析器借此关闭该代理的Session及其连接。
+    """
+
+    def __init__(self,
+                 proxies: List[str] = None,
+                 alpha: float = 0.3,
+                 max_fails: int = 3,
+                 cooldown: float = 60,
+                 max_cooldown: float = 900,
+                 initial_latency: float = 1.0,
+                 health_check_url: str = "https://www.linkedin.com/robots.txt",
+                 health_check_interval: Optional[float] = 60,
+                 health_check_timeout: float = 5,
+                 health_check_workers: int = 8,
+                 rate_limiter: HostRateLimiter = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            proxies: 代理列表
+            alpha: EWMA的平滑系数，越大越看重最近的结果
+            max_fails: 连续失败多少次后隔离该代理
+            cooldown: 第一次隔离的冷却时间（秒），之后每次连续隔离翻倍
+            max_cooldown: 冷却时间上限（秒）
+            initial_latency: 还没有测量数据的代理使用的延迟估计（秒）
+            health_check_url: 健康检查请求的URL
+            health_check_interval: 后台健康检查的间隔（秒），None表示start_health_checks不启动后台检查
+            health_check_timeout: 健康检查请求的超时时间（秒）
+            health_check_workers: 健康检查的并发数
+            rate_limiter: 健康检查请求经过的限速器，默认使用进程内共享的default_rate_limiter
+            clock: 返回当前时间（秒）的单调时钟，测试时可以替换
+        """
+        self.alpha = alpha
+        self.max_fails = max(1, max_fails)
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.initial_latency = initial_latency
+        self.health_check_url = health_check_url
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.health_check_workers = max(1, health_check_workers)
+        self.rate_limiter = rate_limiter if rate_limiter is not None else default_rate_limiter
+        self.clock = clock
+
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._states: Dict[str, ProxyState] = {}
+        self._listeners: List[Callable[[str], None]] = []
+        for proxy in proxies or []:
+            self.add(proxy)
+
+        self._health_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def add(self, proxy: str):
+        """添加代理，已存在时忽略"""
+        with self._lock:
+            if proxy not in self._states:
+                self._states[proxy] = ProxyState(proxy, self.initial_latency)
+
+    def remove(self, proxy: str):
+        with self._lock:
+            removed = self._states.pop(proxy, None) is not None
+        if removed:
+            self._notify(proxy)
+
+    def add_listener(self, callback: Callable[[str], None]):
+        """注册代理被隔离或移除时的回调"""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str], None]):
+        """取消注册的回调，未注册时忽略"""
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def _notify(self, proxy: str):
+        """在锁外调用回调，回调出错不影响代理池本身"""
+        with self._lock:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback(proxy)
+            except Exception as e:
+                self.logger.error(f"代理{proxy}的回调出错: {str(e)}")
+
+    def _readmit_expired(self, now: float):
+        """冷却时间已过的代理重新启用，但只给一次机会：再失败一次就会重新隔离"""
+        for state in self._states.values():
+            if state.status == QUARANTINED and state.quarantined_until <= now:
+                state.status = ACTIVE
+                state.consecutive_failures = self.max_fails - 1
+                self.logger.info(f"Re-admitting proxy after cooldown: {state.proxy}")
+
+    def available_count(self) -> int:
+        """当前可用（未被隔离）的代理数量"""
+        with self._lock:
+            self._readmit_expired(self.clock())
+            return sum(1 for state in self._states.values() if state.status == ACTIVE)
+
+    def acquire(self) -> Optional[str]:
+        """按分数加权随机选择一个可用代理，没有可用代理时返回None"""
+        with self._lock:
+            self._readmit_expired(self.clock())
+            active = [state for state in self._states.values() if state.status == ACTIVE]
+            if not active:
+                return None
+            state = random.choices(active, weights=[state.score for state in active])[0]
+            state.requests += 1
+            return state.proxy
+
+    def report_success(self, proxy: Optional[str], latency: float):
+        """记录一次成功的请求及其耗时（秒）"""
+        with self._lock:
+            state = self._states.get(proxy)
+            if state is None:
+                return
+            state.latency += self.alpha * (latency - state.latency)
+            state.success_rate += self.alpha * (1.0 - state.success_rate)
+            state.consecutive_failures = 0
+            state.quarantine_count = 0
+            if state.status == QUARANTINED:
+                state.status = ACTIVE
+                self.logger.info(f"Re-admitting healthy proxy: {proxy}")
+
+    def report_failure(self, proxy: Optional[str]):
+        """记录一次失败的请求，连续失败达到max_fails次时隔离该代理"""
+        quarantined = False
+        with self._lock:
+            state = self._states.get(proxy)
+            if state is None:
+                return
+            state.failures += 1
+            state.success_rate -= self.alpha * state.success_rate
+            state.consecutive_failures += 1
+            if state.status == ACTIVE and state.consecutive_failures >= self.max_fails:
+                cooldown = min(self.max_cooldown, self.cooldown * (2 ** state.quarantine_count))
+                state.status = QUARANTINED
+                state.quarantined_until = self.clock() + cooldown
+                state.quarantine_count += 1
+                quarantined = True
+                self.logger.warning(f"Quarantining failed proxy for {cooldown:.0f}s: {proxy}")
+        if quarantined:
+            self._notify(proxy)
+
+    def _probe(self, proxy: str) -> bool:
+        """探测单个代理，并把结果计入统计"""
+        self.rate_limiter.acquire(self.health_check_url)
+        start = self.clock()
+        try:
+            response = requests.get(
+                self.health_check_url,
+                proxies={'http': proxy, 'https': proxy},
+                timeout=self.health_check_timeout
+            )
+            self.rate_limiter.on_response(self.health_check_url, response.status_code,
+                                          parse_retry_after(response.headers.get('Retry-After')))
+            healthy = response.status_code == 200
+        except requests.exceptions.RequestException:
+            healthy = False
+
+        if healthy:
+            self.report_success(proxy, self.clock() - start)
+        else:
+            self.report_failure(proxy)
+        return healthy
+
+    def check_health(self) -> Dict[str, bool]:
+        """并发探测所有代理，返回每个代理是否健康"""
+        with self._lock:
+            proxies = list(self._states)
+        if not proxies:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.health_check_workers, len(proxies))) as executor:
+            return dict(zip(proxies, executor.map(self._probe, proxies)))
+
+    def _health_loop(self):
+        # 启动后立即探测一次，尽早隔离已经失效的代理
+        while True:
+            try:
+                self.check_health()
+            except Exception as e:
+                self.logger.error(f"代理健康检查出错: {str(e)}")
+            if self._stop_event.wait(self.health_check_interval):
+                break
+
+    def start_health_checks(self):
+        """启动后台健康检查线程，已启动、没有代理或health_check_interval为None时忽略"""
+        with self._lock:
+            if self._health_thread is not None or not self.health_check_interval or not self._states:
+                return
+            self._stop_event.clear()
+            self._health_thread = threading.Thread(target=self._health_loop, name="proxy-health-check",
+                                                   daemon=True)
+            self._health_thread.start()
+
+    def stop_health_checks(self):
+        """停止后台健康检查线程"""
+        with self._lock:
+            thread, self._health_thread = self._health_thread, None
+        if thread is not None:
+            self._stop_event.set()
+            thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        """代理池的统计信息"""
+        with self._lock:
+            now = self.clock()
+            self._readmit_expired(now)
+            proxies = {
+                state.proxy: {
+                    'status': state.status,
+                    'latency': state.latency,
+                    'success_rate': state.success_rate,
+                    'score': state.score,
+                    'consecutive_failures': state.consecutive_failures,
+                    'requests': state.requests,
+                    'failures': state.failures,
+                    'cooldown_remaining': max(0.0, state.quarantined_until - now)
+                    if state.status == QUARANTINED else 0.0,
+                }
+                for state in self._states.values()
+            }
+        return {
+            'total': len(proxies),
+            'active': sum(1 for info in proxies.values() if info['status'] == ACTIVE),
+            'quarantined': sum(1 for info in proxies.values() if info['status'] == QUARANTINED),
+            'proxies': proxies,
+        }
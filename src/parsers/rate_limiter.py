@@ -0,0 +1,183 @@
+"""
+出站请求的限速器
+
+每个host一个令牌桶，所有线程和协程共享。桶的速率按AIMD（加性增、乘性减）自适应调整：
+请求成功时速率缓慢增加，遇到429/5xx时速率减半，响应带Retry-After时在该时间内暂停对该host的所有请求。
+这样总的请求速率会稳定在网站能接受的上限附近。
+"""
+
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Any, Optional
+from urllib.parse import urlsplit
+
+# 视为限流或服务端过载的状态码
+THROTTLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析Retry-After响应头，支持秒数和HTTP日期两种格式，返回需要等待的秒数"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    自适应速率的令牌桶
+
+    acquire/aacquire会预约一个令牌并等待到可用时刻，令牌可以被预约成负数，
+    所以并发的调用方会按到达顺序依次放行，不会同时涌出。内部状态由threading.Lock保护，且不会在持锁时等待，
+    因此可以同时被多个线程和多个事件循环使用。
+    """
+
+    def __init__(self,
+                 rate: float = 0.5,
+                 capacity: float = 2,
+                 min_rate: float = 0.05,
+                 max_rate: float = 2.0,
+                 increase: float = 0.05,
+                 decrease_factor: float = 0.5,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            rate: 初始速率（每秒请求数）
+            capacity: 桶容量，即允许的最大突发请求数
+            min_rate: 速率下限
+            max_rate: 速率上限
+            increase: 每次成功后速率增加的量
+            decrease_factor: 每次被限流后速率乘以的系数
+            clock: 返回当前时间（秒）的单调时钟，测试时可以替换
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._tokens = capacity
+        self._last_refill = clock()
+        self._blocked_until = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def _reserve(self) -> float:
+        """预约一个令牌，返回需要等待的秒数"""
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def acquire(self):
+        """阻塞直到可以发送下一个请求"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self):
+        """acquire的异步版本，等待时不阻塞事件循环"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self):
+        """请求成功，加性增加速率"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """
+        请求被限流或服务端出错，乘性降低速率
+
+        Args:
+            retry_after: 服务端要求等待的秒数，期间该桶不再放行任何请求
+        """
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self._tokens = min(self._tokens, 0)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'rate': self.rate,
+                'tokens': self._tokens,
+                'blocked_for': max(0.0, self._blocked_until - self.clock()),
+            }
+
+
+class HostRateLimiter:
+    """
+    按host划分的限速器
+
+    同一个HostRateLimiter实例可以在多个解析器实例、工作线程和事件循环之间共享，
+    对同一个host的请求总速率由同一个令牌桶控制。
+    """
+
+    def __init__(self, host_rates: Dict[str, float] = None, **bucket_kwargs):
+        """
+        Args:
+            host_rates: 指定某些host的初始速率，例如 {"www.linkedin.com": 0.3}
+            bucket_kwargs: 创建TokenBucket时使用的其他参数
+        """
+        self.host_rates = dict(host_rates) if host_rates else {}
+        self.bucket_kwargs = bucket_kwargs
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        """获取URL所属host的令牌桶，不存在时创建"""
+        host = urlsplit(url).hostname or ''
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                kwargs = dict(self.bucket_kwargs)
+                if host in self.host_rates:
+                    kwargs['rate'] = self.host_rates[host]
+                bucket = TokenBucket(**kwargs)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url: str):
+        self.bucket_for(url).acquire()
+
+    async def aacquire(self, url: str):
+        await self.bucket_for(url).aacquire()
+
+    def on_response(self, url: str, status_code: int, retry_after: Optional[float] = None):
+        """根据响应状态码调整该host的速率"""
+        bucket = self.bucket_for(url)
+        if status_code in THROTTLE_STATUS_CODES:
+            bucket.on_throttle(retry_after)
+        elif status_code < 400:
+            bucket.on_success()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """各host令牌桶的当前状态"""
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {host: bucket.stats() for host, bucket in buckets.items()}
+
+
+# 进程内默认共享的限速器，未显式指定时所有解析器都使用它
+default_rate_limiter = HostRateLimiter()
@@ -0,0 +1,83 @@
+"""
+按代理划分的requests.Session池
+
+每个代理（以及直连）各自持有一个持久的Session和连接池，同一代理上的并发请求可以复用已经建立的TLS连接，
+而不必每次切换proxies参数、重新握手。
+"""
+
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class SessionPool:
+    """
+    线程安全的Session池，键为代理地址，None表示直连
+
+    Session创建时设置好代理和公共请求头，请求时只需通过headers参数传入本次请求特有的请求头（例如User-Agent），
+    不会修改任何共享状态。
+    """
+
+    def __init__(self,
+                 headers: Dict[str, str] = None,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 10,
+                 max_retries: Optional[Retry] = None):
+        """
+        Args:
+            headers: 所有请求共用的请求头
+            pool_connections: 每个Session缓存的连接池数量（每个host一个连接池）
+            pool_maxsize: 每个连接池保留的最大连接数，应不小于同时通过同一代理进行的请求数
+            max_retries: 传给HTTPAdapter的重试策略
+        """
+        self.headers = dict(headers) if headers else {}
+        self.pool_connections = max(1, pool_connections)
+        self.pool_maxsize = max(1, pool_maxsize)
+        self.max_retries = max_retries if max_retries is not None else Retry(0, read=False)
+
+        self._sessions: Dict[Optional[str], requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _create_session(self, proxy: Optional[str]) -> requests.Session:
+        session = requests.Session()
+        session.headers.update(self.headers)
+        if proxy:
+            session.proxies = {'http': proxy, 'https': proxy}
+        adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                              pool_maxsize=self.pool_maxsize,
+                              max_retries=self.max_retries)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def get(self, proxy: Optional[str] = None) -> requests.Session:
+        """获取代理对应的Session，不存在时创建"""
+        session = self._sessions.get(proxy)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(proxy)
+                if session is None:
+                    session = self._create_session(proxy)
+                    self._sessions[proxy] = session
+        return session
+
+    def discard(self, proxy: Optional[str]):
+        """关闭并移除某个代理的Session，例如代理被隔离时释放它的连接"""
+        with self._lock:
+            session = self._sessions.pop(proxy, None)
+        if session is not None:
+            session.close()
+
+    def close(self):
+        """关闭所有Session"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator, Callable, Optional
 
 
 class WebParser(ABC):
@@ -25,6 +25,27 @@ class WebParser(ABC):
         """
         pass
 
+    def iter_parse(self, url: str, max_num: int,
+                   card_filter: Optional[Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]] = None,
+                   incremental: Optional[bool] = None) -> Iterator[Dict[str, Any]]:
+        """
+        以生成器的形式解析招聘信息，每解析完一个职位就产出一个，方便下游在抓取的同时开始处理
+
+        默认实现直接调用parse，再用card_filter过滤结果；子类可以重写以实现真正的流式产出，
+        并在抓取详情页之前对搜索结果卡片应用card_filter
+
+        Args:
+            url: 招聘信息网页的URL
+            max_num: 最多解析的招聘信息数量，-1表示不限制
+            card_filter: 可选，接收职位列表、返回其中需要产出的职位
+            incremental: 本次调用是否使用增量模式，None表示使用解析器自身的配置；没有增量模式的解析器忽略该参数
+
+        Returns:
+            产出招聘信息字典的迭代器，字段与parse的返回值相同
+        """
+        jobs = self.parse(url, max_num)
+        yield from (card_filter(jobs) if card_filter is not None else jobs)
+
     @abstractmethod
     def format_job_description_str(self, job_info: Dict[str, Any]) -> Dict[str, Any]:
         """
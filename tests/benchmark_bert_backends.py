@@ -0,0 +1,88 @@
+"""
+BERT推理后端的延迟和吞吐量基准测试
+
+对每个后端统计单条职位描述的平均延迟，以及按batch_size批量编码时每秒处理的职位数量，
+同时给出与FP32模型分数的最大误差。分词时间单独统计：cold为清空分词缓存后对全部职位分词的时间，
+warm为缓存命中时的时间；吞吐量在分词缓存命中的情况下测量，只反映推理本身。
+运行方式（在项目根目录）：
+    PYTHONPATH=src python tests/benchmark_bert_backends.py [模型名称或路径]
+"""
+
+import sys
+import tempfile
+import time
+
+from ai.bert_backends import BERT_BACKENDS
+from ai.bert_model import BERTModel
+
+ROUNDS = 5
+NUM_JOBS = 64
+
+USER_REQUIREMENTS = "Python backend developer in Shanghai, 3 years of Django and Flask experience, salary 25k-35k."
+JOB_DESCRIPTION = (
+    "We are looking for a backend engineer to design and build scalable services. "
+    "You will work with Python, Django, PostgreSQL and Redis, own features end to end, "
+    "and collaborate with product and data teams. Requirements: 3+ years of experience, "
+    "solid understanding of REST APIs, testing and code review. Location: Shanghai, hybrid. "
+)
+
+
+def make_jobs():
+    # 每个职位描述长度不同，让padding的影响接近真实情况
+    return [f"Job #{idx}. " + JOB_DESCRIPTION * (1 + idx % 2) for idx in range(NUM_JOBS)]
+
+
+def measure_tokenization(model: BERTModel, jobs):
+    """返回 (冷缓存分词耗时毫秒, 热缓存分词耗时毫秒)"""
+    model._token_cache.clear()
+    start = time.perf_counter()
+    model._tokenize(jobs)
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        model._tokenize(jobs)
+    warm_ms = (time.perf_counter() - start) / ROUNDS * 1000
+    return cold_ms, warm_ms
+
+
+def measure(model: BERTModel, jobs):
+    """返回 (单条平均延迟毫秒, 批量吞吐量 职位/秒, 分数列表)"""
+    scores = [result['score'] for result in model.judge_batch(USER_REQUIREMENTS, jobs)]  # 预热，同时缓存用户需求
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        model.judge(USER_REQUIREMENTS, jobs[0])
+    latency_ms = (time.perf_counter() - start) / ROUNDS * 1000
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        model.judge_batch(USER_REQUIREMENTS, jobs)
+    throughput = ROUNDS * len(jobs) / (time.perf_counter() - start)
+    return latency_ms, throughput, scores
+
+
+def main():
+    model_name = sys.argv[1] if len(sys.argv) > 1 else 'bert-base-uncased'
+    jobs = make_jobs()
+    reference = None
+
+    print(f"{'backend':<12}{'tok cold(ms)':>14}{'tok warm(ms)':>14}{'latency(ms)':>14}{'jobs/s':>12}{'max |diff|':>14}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for backend in BERT_BACKENDS:
+            try:
+                model = BERTModel(model_name, backend=backend, cache_dir=cache_dir)
+            except ImportError as e:
+                print(f"{backend:<12}skipped: {e}")
+                continue
+
+            cold_ms, warm_ms = measure_tokenization(model, jobs)
+            latency_ms, throughput, scores = measure(model, jobs)
+            if reference is None:
+                reference = scores
+            max_diff = max(abs(score - ref) for score, ref in zip(scores, reference))
+            print(f"{backend:<12}{cold_ms:>14.2f}{warm_ms:>14.2f}{latency_ms:>14.2f}{throughput:>12.1f}{max_diff:>14.5f}")
+
+
+if __name__ == "__main__":
+    main()
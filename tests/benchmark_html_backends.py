@@ -0,0 +1,54 @@
+"""
+HTML解析后端的微基准测试
+
+对保存下来的LinkedIn搜索结果页和职位详情页，分别统计每个后端解析一页的平均CPU时间和峰值内存。
+峰值内存用tracemalloc统计，只包含Python分配器上的内存，lxml/selectolax在C层分配的树不计入。
+运行方式（在项目根目录）：
+    PYTHONPATH=src python tests/benchmark_html_backends.py
+"""
+
+import time
+import tracemalloc
+from pathlib import Path
+
+from parsers.html_backends import HTML_BACKENDS, get_html_backend
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+ROUNDS = 50
+
+
+def measure(func, html: str):
+    """返回 (每页平均CPU时间毫秒, 单页解析峰值内存KB)"""
+    func(html)  # 预热
+
+    start = time.process_time()
+    for _ in range(ROUNDS):
+        func(html)
+    cpu_ms = (time.process_time() - start) / ROUNDS * 1000
+
+    tracemalloc.start()
+    func(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu_ms, peak / 1024
+
+
+def main():
+    search_html = (FIXTURES_DIR / "linkedin_search.html").read_text(encoding="utf-8")
+    job_html = (FIXTURES_DIR / "linkedin_job.html").read_text(encoding="utf-8")
+
+    print(f"{'backend':<12}{'search cpu(ms)':>16}{'search mem(KB)':>16}{'detail cpu(ms)':>16}{'detail mem(KB)':>16}")
+    for name in HTML_BACKENDS:
+        try:
+            backend = get_html_backend(name)
+        except ImportError as e:
+            print(f"{name:<12}skipped: {e}")
+            continue
+
+        search_cpu, search_mem = measure(backend.extract_job_cards, search_html)
+        job_cpu, job_mem = measure(backend.extract_job_description, job_html)
+        print(f"{name:<12}{search_cpu:>16.2f}{search_mem:>16.1f}{job_cpu:>16.2f}{job_mem:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+导入时间基准测试
+
+在新的子进程中分别执行各个入口需要的导入语句，统计平均耗时（扣除解释器启动时间）和子进程的峰值内存。
+包的导入不应随着新增模型而变慢；重量级依赖只有在真正用到对应模型时才会出现在耗时中。
+运行方式（在项目根目录）：
+    PYTHONPATH=src python tests/benchmark_imports.py
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+ROUNDS = 5
+
+STATEMENTS = [
+    "pass",
+    "import parsers",
+    "import ai",
+    "import main",
+    "import src",
+    "from ai import QwenModel",
+    "from ai import BERTModel",
+]
+
+# 子进程结束前打印自己的峰值内存（KB，Linux上ru_maxrss的单位）
+REPORT_RSS = "import resource; print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+
+
+def run(statement: str):
+    """返回 (平均耗时秒, 峰值内存MB)，导入失败时返回None"""
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src"))
+    elapsed, rss_kb = 0.0, 0
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, "-c", f"{statement}\n{REPORT_RSS}"], cwd=ROOT, env=env,
+                                   capture_output=True, text=True)
+        elapsed += time.perf_counter() - start
+        if completed.returncode != 0:
+            return None
+        rss_kb = max(rss_kb, int(completed.stdout.strip().splitlines()[-1]))
+    return elapsed / ROUNDS, rss_kb / 1024
+
+
+def main():
+    baseline = None
+    print(f"{'statement':<28}{'import(ms)':>12}{'peak rss(MB)':>14}")
+    for statement in STATEMENTS:
+        result = run(statement)
+        if result is None:
+            print(f"{statement:<28}{'failed':>12}")
+            continue
+        seconds, rss_mb = result
+        if baseline is None:
+            baseline = seconds
+        print(f"{statement:<28}{(seconds - baseline) * 1000:>12.1f}{rss_mb:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
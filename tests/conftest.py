@@ -0,0 +1,101 @@
+"""
+测试共用的工具
+
+把src加入sys.path（直接运行pytest即可，不需要设置PYTHONPATH），并提供tests/fixtures中保存的LinkedIn页面、
+替代LinkedInParser._make_request的假LinkedIn站点，以及可以手动拨动的假时钟。
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+SEARCH_URL = "https://www.linkedin.com/jobs/search?keywords=python"
+
+
+def load_fixture(name: str) -> str:
+    """读取保存下来的LinkedIn页面"""
+    return (FIXTURES_DIR / name).read_text(encoding="utf-8")
+
+
+SEARCH_HTML = load_fixture("linkedin_search.html")
+JOB_HTML = load_fixture("linkedin_job.html")
+
+
+class FakeResponse:
+    """requests.Response的替身，只包含解析器用到的属性"""
+
+    def __init__(self, text: str = "", status_code: int = 200, headers: dict = None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+
+class FakeLinkedIn:
+    """
+    替代LinkedInParser._make_request的假LinkedIn站点
+
+    搜索结果第一页返回search_html，之后的分页为空；其余URL都是职位详情页，返回JOB_HTML并记录在detail_requests中。
+    详情页URL中包含failing中任一字符串（职位链接或job_id）时抛出异常；每个详情页请求等待delay秒，
+    max_in_flight记录同时进行中的详情页请求数的最大值。
+    """
+
+    def __init__(self, search_html: str = SEARCH_HTML, failing=(), delay: float = 0.0):
+        self.search_html = search_html
+        self.failing = set(failing)
+        self.delay = delay
+        self.detail_requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url: str, max_retries: int = 3, headers=None) -> FakeResponse:
+        if "/jobs/search" in url:
+            return FakeResponse("" if "start=" in url else self.search_html)
+        with self._lock:
+            self.detail_requests.append(url)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            if any(failing in url for failing in self.failing):
+                raise Exception("detail page unavailable")
+            return FakeResponse(JOB_HTML)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class FakeClock:
+    """手动拨动的时钟：可以作为clock参数直接调用，也可以替换模块中导入的time模块（提供time()）"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(request, monkeypatch) -> FakeClock:
+    """
+    假时钟
+
+    测试模块定义了FAKE_TIME_MODULE时，该模块中的time被替换为这个时钟，被测代码调用time.time()得到的是clock.now
+    """
+    fake = FakeClock()
+    module = getattr(request.module, "FAKE_TIME_MODULE", None)
+    if module is not None:
+        monkeypatch.setattr(module, "time", fake)
+    return fake
@@ -0,0 +1,99 @@
+"""
+AIJudger并行判断的测试：并发数上限、结果顺序，以及超时和异常转换为失败结果
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+from ai import AIJudger, AIModel
+
+
+class SleepyModel(AIModel):
+    """描述形如"<秒数> <文本>"，按指定的秒数等待后返回分数；描述中包含boom时抛出异常"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def judge(self, user_requirements: str, job_description: str) -> Dict[str, Any]:
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            delay, text = job_description.split(" ", 1)
+            time.sleep(float(delay))
+            if "boom" in text:
+                raise RuntimeError("model exploded")
+            return {'success': True, 'score': 0.9 if "good" in text else 0.1, 'reason': text}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_parallel_judging_is_capped_and_ordered():
+    model = SleepyModel()
+    judger = AIJudger(model, user_requirements="anything", max_workers=3)
+    # 前面的职位耗时更长，完成顺序与输入顺序相反
+    descriptions = [f"{0.02 * (8 - idx)} job-{idx} {'good' if idx % 2 else 'bad'}" for idx in range(8)]
+    job_infos = [{'job_id': str(idx)} for idx in range(8)]
+
+    results = judger.judge_batch(descriptions, job_infos)
+
+    assert model.max_in_flight == 3
+    assert [result['job_info']['job_id'] for result in results] == [str(idx) for idx in range(8)]
+    assert [result['reason'].split()[0] for result in results] == [f"job-{idx}" for idx in range(8)]
+    assert [result['decision'] for result in results] == [idx % 2 == 1 for idx in range(8)]
+
+
+def test_parallel_judging_is_faster_than_serial():
+    descriptions = [f"0.1 job-{idx}" for idx in range(4)]
+
+    start = time.monotonic()
+    AIJudger(SleepyModel(), user_requirements="anything", max_workers=4).judge_batch(descriptions)
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.3
+
+
+def test_timeout_and_errors_become_failed_results():
+    model = SleepyModel()
+    judger = AIJudger(model, user_requirements="anything", max_workers=2, timeout=0.2)
+    descriptions = ["0 job-0 good", "1 job-1 slow", "0 job-2 boom", "0 job-3 bad"]
+    job_infos = [{'job_id': str(idx)} for idx in range(4)]
+
+    start = time.monotonic()
+    results = judger.judge_batch(descriptions, job_infos)
+
+    assert time.monotonic() - start < 0.8
+    assert results[0]['success'] and results[0]['decision'] is True
+    assert results[1] == {'success': False, 'error': "模型调用超时（超过0.2秒）", 'job_info': job_infos[1]}
+    assert results[2] == {'success': False, 'error': "model exploded", 'job_info': job_infos[2]}
+    assert results[3]['success'] and results[3]['decision'] is False
+
+
+def test_timeout_applies_to_serial_judging():
+    judger = AIJudger(SleepyModel(), user_requirements="anything", timeout=0.1)
+
+    results = judger.judge_batch(["0.5 job-0", "0 job-1 good"])
+
+    assert results[0]['success'] is False and "超时" in results[0]['error']
+    assert results[1]['decision'] is True
+
+
+def test_timed_out_calls_still_count_against_max_workers():
+    model = SleepyModel()
+    judger = AIJudger(model, user_requirements="anything", max_workers=2, timeout=0.1)
+    try:
+        # 第一批的两个调用都超时，但仍在后台运行，第二批只能等它们结束后才开始
+        first = judger.judge_batch(["0.4 job-0", "0.4 job-1"])
+        second = judger.judge_batch(["0 job-2 good", "0 job-3 good", "0 job-4 good"])
+
+        assert [result['success'] for result in first] == [False, False]
+        assert [result['decision'] for result in second] == [True, True, True]
+        assert model.max_in_flight == 2
+    finally:
+        judger.close()
@@ -0,0 +1,90 @@
+"""
+AsyncLinkedInParser的测试
+
+通过httpx.MockTransport返回tests/fixtures中保存的页面，与替换了_make_request的同步LinkedInParser比较解析结果。
+"""
+
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from conftest import JOB_HTML, SEARCH_HTML, SEARCH_URL, FakeResponse
+from parsers import LinkedInParser
+from parsers.async_linkedin_parser import AsyncLinkedInParser
+from parsers.rate_limiter import HostRateLimiter
+
+def fixture_page(url: str) -> str:
+    """搜索结果第一页返回保存的页面，之后的分页为空，其余URL都是职位详情页"""
+    if "/jobs/search" in url:
+        return "" if "start=" in url else SEARCH_HTML
+    return JOB_HTML
+
+
+def make_rate_limiter() -> HostRateLimiter:
+    return HostRateLimiter(rate=1000, capacity=1000, max_rate=1000)
+
+
+def fixture_handler(requested_urls: list):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested_urls.append(str(request.url))
+        return httpx.Response(200, text=fixture_page(str(request.url)))
+    return handler
+
+
+def make_async_parser(handler, **kwargs) -> AsyncLinkedInParser:
+    """创建通过MockTransport发送请求的AsyncLinkedInParser"""
+    parser = AsyncLinkedInParser(rate_limiter=make_rate_limiter(), **kwargs)
+    transport = httpx.MockTransport(handler)
+    parser._get_client = lambda proxy: parser._clients.setdefault(
+        proxy, httpx.AsyncClient(transport=transport, headers=parser.headers, follow_redirects=True))
+    return parser
+
+
+def sync_parse(max_num: int = -1):
+    parser = LinkedInParser(max_workers=4, rate_limiter=make_rate_limiter())
+    parser._make_request = lambda url, max_retries=3, headers=None: FakeResponse(fixture_page(url))
+    return parser.parse(SEARCH_URL, max_num)
+
+
+async def async_parse(max_num: int = -1, requested_urls: list = None):
+    async with make_async_parser(fixture_handler(requested_urls if requested_urls is not None else [])) as parser:
+        return await parser.parse(SEARCH_URL, max_num)
+
+
+@pytest.mark.parametrize("max_num", [-1, 4])
+def test_parse_matches_sync_parser(max_num):
+    expected = [dict(job) for job in sync_parse(max_num)]
+    requested_urls = []
+    jobs = asyncio.run(async_parse(max_num, requested_urls))
+
+    assert [dict(job) for job in jobs] == expected
+    assert all(job['full_description'] != 'Description not available' for job in jobs)
+    assert sum("/jobs/view/" in url for url in requested_urls) == len(expected)
+
+
+def test_iter_jobs_yields_same_jobs():
+    async def collect():
+        async with make_async_parser(fixture_handler([])) as parser:
+            return [job async for job in parser.iter_jobs(SEARCH_URL)]
+
+    expected = {job['job_id']: dict(job) for job in sync_parse()}
+    jobs = asyncio.run(collect())
+
+    assert {job['job_id']: dict(job) for job in jobs} == expected
+
+
+def test_failed_detail_page_falls_back_to_placeholder():
+    async def run():
+        def handler(request: httpx.Request) -> httpx.Response:
+            if "/jobs/view/" in str(request.url):
+                return httpx.Response(404)
+            return httpx.Response(200, text=fixture_page(str(request.url)))
+
+        async with make_async_parser(handler, total_retries=0) as parser:
+            return await parser.parse(SEARCH_URL, 2)
+
+    jobs = asyncio.run(run())
+    assert len(jobs) == 2
+    assert all(job['full_description'] == 'Description not available' for job in jobs)
@@ -0,0 +1,125 @@
+"""
+BERT推理后端的精度测试
+
+在一组用户需求/职位描述上比较量化模型和ONNX模型与FP32模型给出的余弦相似度。
+默认使用bert-base-uncased，可以通过环境变量BERT_TEST_MODEL指定本地模型路径；模型无法加载时跳过。
+"""
+
+import json
+import os
+import shutil
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from ai.bert_model import BERTModel
+
+MODEL_NAME = os.environ.get("BERT_TEST_MODEL", "bert-base-uncased")
+
+USER_REQUIREMENTS = "Python backend developer in Shanghai, 3 years of Django and Flask experience, salary 25k-35k."
+JOB_DESCRIPTIONS = [
+    "Python Backend Engineer. You will build REST APIs with Django and Flask. Location: Shanghai.",
+    "Senior Frontend Developer. React, TypeScript and design systems. Remote within Europe.",
+    "Data Engineer. Spark, Airflow and Python pipelines on AWS. Hybrid, Beijing office.",
+    "Registered Nurse for the night shift at a city hospital. Patient care and documentation.",
+    "Backend developer (Go/Python) for microservices, PostgreSQL and Kafka, Shanghai, 30k-40k.",
+]
+
+# 与FP32模型分数的最大允许误差
+TOLERANCES = {"quantized": 0.05, "onnx": 1e-4}
+
+
+@pytest.fixture(scope="module")
+def reference_scores():
+    try:
+        model = BERTModel(MODEL_NAME)
+    except OSError as e:
+        pytest.skip(f"无法加载模型 {MODEL_NAME}: {e}")
+    return [result["score"] for result in model.judge_batch(USER_REQUIREMENTS, JOB_DESCRIPTIONS)]
+
+
+@pytest.mark.parametrize("backend", ["quantized", "onnx"])
+def test_backend_scores_match_fp32(backend, reference_scores, tmp_path):
+    if backend == "onnx":
+        pytest.importorskip("onnxruntime")
+    model = BERTModel(MODEL_NAME, backend=backend, cache_dir=str(tmp_path))
+    scores = [result["score"] for result in model.judge_batch(USER_REQUIREMENTS, JOB_DESCRIPTIONS)]
+    for score, reference in zip(scores, reference_scores):
+        assert score == pytest.approx(reference, abs=TOLERANCES[backend])
+
+
+def test_onnx_export_is_cached(tmp_path):
+    pytest.importorskip("onnxruntime")
+    try:
+        BERTModel(MODEL_NAME, backend="onnx", cache_dir=str(tmp_path))
+    except OSError as e:
+        pytest.skip(f"无法加载模型 {MODEL_NAME}: {e}")
+    exported = list(tmp_path.glob("*.onnx"))
+    assert len(exported) == 1
+    mtime = exported[0].stat().st_mtime_ns
+
+    BERTModel(MODEL_NAME, backend="onnx", cache_dir=str(tmp_path))
+    assert exported[0].stat().st_mtime_ns == mtime
+
+
+def test_onnx_cache_is_invalidated_when_the_model_changes(tmp_path):
+    pytest.importorskip("onnxruntime")
+    if not os.path.isdir(MODEL_NAME):
+        pytest.skip("需要通过BERT_TEST_MODEL指定本地模型目录")
+    model_dir = tmp_path / "model"
+    shutil.copytree(MODEL_NAME, model_dir)
+    cache_dir = tmp_path / "cache"
+    BERTModel(str(model_dir), backend="onnx", cache_dir=str(cache_dir))
+    BERTModel(str(model_dir), backend="onnx", cache_dir=str(cache_dir))
+    assert len(list(cache_dir.glob("*.onnx"))) == 1
+
+    # 同一路径下的模型配置变了，不能继续使用旧的导出文件
+    config_path = model_dir / "config.json"
+    config = json.loads(config_path.read_text(encoding="utf-8"))
+    config["hidden_dropout_prob"] = 0.2
+    config_path.write_text(json.dumps(config), encoding="utf-8")
+    BERTModel(str(model_dir), backend="onnx", cache_dir=str(cache_dir))
+    assert len(list(cache_dir.glob("*.onnx"))) == 2
+
+
+def test_long_text_windows_are_bounded():
+    try:
+        model = BERTModel(MODEL_NAME, max_length=128, max_chunks=3, chunk_overlap=16)
+    except OSError as e:
+        pytest.skip(f"无法加载模型 {MODEL_NAME}: {e}")
+    token_ids = list(range(1000))
+
+    windows = model._split_windows(token_ids)
+    assert len(windows) == 3
+    assert all(len(window) == 126 for window in windows)
+    assert windows[0][0] == 0 and windows[-1][-1] == 999
+
+    # 不超过窗口上限时，相邻窗口重叠chunk_overlap个token并覆盖整段文本
+    windows = model._split_windows(token_ids[:300])
+    assert [window[0] for window in windows] == [0, 110, 174]
+    assert windows[-1][-1] == 299
+
+    long_text = "python backend developer " * 200
+    vectors = model.encode([long_text, "short text"])
+    assert vectors.shape == (2, model.encoder.hidden_size)
+
+
+def test_tokenization_cache_skips_repeated_texts():
+    try:
+        model = BERTModel(MODEL_NAME, tokenization_cache_size=2)
+    except OSError as e:
+        pytest.skip(f"无法加载模型 {MODEL_NAME}: {e}")
+    first = model._tokenize(["python developer", "react developer"])
+    assert model._tokenize(["react developer", "python developer"]) == first[::-1]
+    stats = model.tokenization_stats()
+    assert (stats['hits'], stats['misses']) == (2, 2)
+
+    # 超过缓存容量时淘汰最久未使用的文本
+    model._tokenize(["nurse"])
+    assert model.tokenization_stats()['cached'] == 2
+    model._tokenize(["python developer"])
+    assert model.tokenization_stats()['misses'] == 3
+    model._tokenize(["react developer"])
+    assert model.tokenization_stats()['misses'] == 4
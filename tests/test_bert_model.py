@@ -0,0 +1,47 @@
+"""
+BERTModel的测试
+
+默认使用bert-base-uncased，可以通过环境变量BERT_TEST_MODEL指定本地模型路径；模型无法加载时跳过。
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from ai.bert_model import BERTModel
+from ai.cached_model import CachedModel, JudgmentCache
+
+MODEL_NAME = os.environ.get("BERT_TEST_MODEL", "bert-base-uncased")
+JOB_DESCRIPTION = "Python Backend Engineer. You will build REST APIs with Django and Flask. Location: Shanghai."
+
+
+def test_requirements_cache_is_thread_safe():
+    try:
+        model = BERTModel(MODEL_NAME, requirements_cache_size=2)
+    except OSError as e:
+        pytest.skip(f"无法加载模型 {MODEL_NAME}: {e}")
+    requirements = [f"requirement {idx % 5}" for idx in range(40)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        scores = list(executor.map(lambda text: model.judge(text, JOB_DESCRIPTION)['score'], requirements))
+
+    assert len(model._requirements_cache) <= 2
+    assert scores[:5] == pytest.approx(scores[5:10], abs=1e-5)
+
+
+def test_cache_key_depends_on_window_settings():
+    try:
+        model = BERTModel(MODEL_NAME, max_chunks=4, chunk_overlap=64)
+    except OSError as e:
+        pytest.skip(f"无法加载模型 {MODEL_NAME}: {e}")
+    cached = CachedModel(model, JudgmentCache(":memory:"))
+
+    key = cached.make_key("python", JOB_DESCRIPTION)
+    model.chunk_overlap = 32
+    assert cached.make_key("python", JOB_DESCRIPTION) != key
+    model.chunk_overlap = 64
+    assert cached.make_key("python", JOB_DESCRIPTION) == key
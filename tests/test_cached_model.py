@@ -0,0 +1,117 @@
+"""
+JudgmentCache和CachedModel的测试：过期、LRU淘汰、记录数统计、缓存键，以及批量判断的转发
+"""
+
+from typing import Any, Dict, List
+
+import pytest
+
+from ai import AIModel, CachedModel, JudgmentCache
+from ai import cached_model
+
+FAKE_TIME_MODULE = cached_model
+
+
+class CountingModel(AIModel):
+    """记录每次judge和judge_batch调用的模型，描述中包含fail时返回失败结果"""
+
+    def __init__(self, model_name: str = "fake", backend: str = None, supports_batch: bool = False):
+        self.model_name = model_name
+        self.backend = backend
+        self.supports_batch = supports_batch
+        self.judged: List[str] = []
+        self.batches: List[List[str]] = []
+
+    def judge(self, user_requirements: str, job_description: str) -> Dict[str, Any]:
+        self.judged.append(job_description)
+        if "fail" in job_description:
+            return {'success': False, 'error': "rate limited"}
+        return {'success': True, 'score': len(job_description) / 100}
+
+    def cache_key_attributes(self) -> Dict[str, Any]:
+        return {'model_name': self.model_name, 'backend': self.backend}
+
+    def judge_batch(self, user_requirements: str, job_descriptions: List[str]) -> List[Dict[str, Any]]:
+        self.batches.append(list(job_descriptions))
+        return [self.judge(user_requirements, job_description) for job_description in job_descriptions]
+
+
+def test_expired_entries_are_dropped(clock):
+    cache = JudgmentCache(":memory:", ttl=60)
+    cache.set("a", {'score': 0.5})
+
+    clock.now += 59
+    assert cache.get("a") == {'score': 0.5}
+    clock.now += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = JudgmentCache(":memory:", ttl=None, max_entries=2)
+    cache.set("a", {'score': 0.1})
+    clock.now += 1
+    cache.set("b", {'score': 0.2})
+    clock.now += 1
+    assert cache.get("a") is not None
+    clock.now += 1
+    cache.set("c", {'score': 0.3})
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == {'score': 0.1}
+    assert cache.get("c") == {'score': 0.3}
+
+
+def test_size_is_tracked_across_replace_clear_and_reopen(tmp_path, clock):
+    path = str(tmp_path / "judgments.sqlite3")
+    cache = JudgmentCache(path, max_entries=10)
+    for key in ("a", "b", "a", "c", "b"):
+        cache.set(key, {'key': key})
+    assert len(cache) == 3
+    cache.close()
+
+    reopened = JudgmentCache(path, max_entries=10)
+    assert len(reopened) == 3
+    reopened.clear()
+    assert len(reopened) == 0
+
+
+def test_cache_key_depends_on_checkpoint_and_backend():
+    cache = JudgmentCache(":memory:")
+    keys = {
+        CachedModel(CountingModel("bert-base-uncased", "torch"), cache).make_key("python", "job"),
+        CachedModel(CountingModel("bert-base-chinese", "torch"), cache).make_key("python", "job"),
+        CachedModel(CountingModel("bert-base-uncased", "onnx"), cache).make_key("python", "job"),
+        CachedModel(CountingModel("bert-base-uncased", "torch"), cache).make_key("java", "job"),
+    }
+    assert len(keys) == 4
+    assert CachedModel(CountingModel("bert-base-uncased", "torch"), cache).make_key("python", "job") in keys
+
+
+def test_judge_caches_successful_results_only():
+    model = CountingModel()
+    cached = CachedModel(model, JudgmentCache(":memory:"))
+
+    assert cached.judge("python", "backend job") == cached.judge("python", "backend job")
+    cached.judge("python", "fail job")
+    cached.judge("python", "fail job")
+
+    assert model.judged == ["backend job", "fail job", "fail job"]
+    assert cached.stats()['hits'] == 1 and cached.stats()['size'] == 1
+
+
+def test_judge_batch_forwards_only_cache_misses():
+    model = CountingModel(supports_batch=True)
+    cached = CachedModel(model, JudgmentCache(":memory:"))
+    assert cached.supports_batch is True
+    assert CachedModel(CountingModel(), JudgmentCache(":memory:")).supports_batch is False
+
+    first = cached.judge_batch("python", ["job a", "job bb", "job a", "fail c"])
+    second = cached.judge_batch("python", ["job bb", "job ddd", "fail c", "job a"])
+
+    assert model.batches == [["job a", "job bb", "fail c"], ["job ddd", "fail c"]]
+    assert first[0] == first[2] and first[0] is not first[2]
+    assert second[0] == first[1] and second[3] == first[0]
+    assert second[1]['score'] == pytest.approx(0.07)
+    assert first[3]['success'] is False and second[2]['success'] is False
@@ -0,0 +1,105 @@
+"""
+CascadeJudger的测试：同步和异步两条路径都先经过向量模型筛选，结果和统计信息一致
+"""
+
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from ai import AIModel, CascadeJudger
+
+
+class PrefilterModel(AIModel):
+    """描述形如"job-<编号>"，编号越大分数越高"""
+
+    supports_batch = True
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+
+    def judge(self, user_requirements: str, job_description: str) -> Dict[str, Any]:
+        return self.judge_batch(user_requirements, [job_description])[0]
+
+    def judge_batch(self, user_requirements: str, job_descriptions: List[str]) -> List[Dict[str, Any]]:
+        if self.fail:
+            raise RuntimeError("encoder unavailable")
+        return [{'score': int(description.split('-')[1]) / 10} for description in job_descriptions]
+
+
+class LLMModel(AIModel):
+    """分别记录同步和异步调用的大模型替身"""
+
+    def __init__(self):
+        self.sync_calls: List[str] = []
+        self.async_calls: List[str] = []
+
+    def judge(self, user_requirements: str, job_description: str) -> Dict[str, Any]:
+        self.sync_calls.append(job_description)
+        return {'success': True, 'score': 0.95, 'decision': True, 'reason': f"LLM likes {job_description}"}
+
+    async def ajudge(self, user_requirements: str, job_description: str) -> Dict[str, Any]:
+        self.async_calls.append(job_description)
+        await asyncio.sleep(0)
+        return {'success': True, 'score': 0.95, 'decision': True, 'reason': f"LLM likes {job_description}"}
+
+
+def make_judger(**kwargs):
+    llm = LLMModel()
+    judger = CascadeJudger(kwargs.pop('prefilter', PrefilterModel()), llm, user_requirements="python", **kwargs)
+    return judger, llm
+
+
+@pytest.mark.parametrize("kwargs", [{'top_n': 2}, {'top_n': None, 'min_prefilter_score': 0.65},
+                                    {'top_n': 3, 'min_prefilter_score': 0.85}])
+def test_sync_and_async_paths_agree(kwargs):
+    descriptions = [f"job-{idx}" for idx in range(10)]
+    job_infos = [{'job_id': str(idx)} for idx in range(10)]
+
+    sync_judger, sync_llm = make_judger(**kwargs)
+    sync_results = sync_judger.judge_batch(descriptions, job_infos)
+    async_judger, async_llm = make_judger(**kwargs)
+    async_results = asyncio.run(async_judger.ajudge_batch(descriptions, job_infos))
+
+    assert async_results == sync_results
+    assert async_judger.last_stats == sync_judger.last_stats
+    assert sorted(async_llm.async_calls) == sync_llm.sync_calls
+    assert async_llm.sync_calls == []
+    assert sync_judger.last_stats['llm_calls'] == len(sync_llm.sync_calls) < 10
+
+
+def test_async_path_uses_prefilter_scores():
+    judger, llm = make_judger(top_n=2)
+
+    results = asyncio.run(judger.ajudge_batch([f"job-{idx}" for idx in range(10)]))
+
+    assert sorted(llm.async_calls) == ["job-8", "job-9"]
+    assert [result['stage'] for result in results] == ['prefilter'] * 8 + ['llm'] * 2
+    assert [result['prefilter_score'] for result in results] == [idx / 10 for idx in range(10)]
+    assert results[0]['decision'] is False and results[9]['decision'] is True
+    assert judger.last_stats == {'total': 10, 'llm_calls': 2, 'llm_calls_avoided': 8}
+
+
+def test_failed_prefilter_sends_every_job_to_the_llm():
+    sync_judger, sync_llm = make_judger(prefilter=PrefilterModel(fail=True), top_n=2)
+    async_judger, async_llm = make_judger(prefilter=PrefilterModel(fail=True), top_n=2)
+    descriptions = [f"job-{idx}" for idx in range(4)]
+
+    assert sync_judger.judge_batch(descriptions) == asyncio.run(async_judger.ajudge_batch(descriptions))
+    assert len(sync_llm.sync_calls) == len(async_llm.async_calls) == 4
+
+
+def test_pruned_jobs_are_never_recommended():
+    # 向量分数0.8和0.9都高于threshold，但没有进入大模型精判
+    judger, llm = make_judger(top_n=1, threshold=0.7)
+    descriptions = ["job-8", "job-9", "job-10"]
+
+    sync_results = judger.judge_batch(descriptions)
+    async_results = asyncio.run(judger.ajudge_batch(descriptions))
+
+    assert llm.sync_calls == ["job-10"] and llm.async_calls == ["job-10"]
+    for results in (sync_results, async_results):
+        assert [result['decision'] for result in results] == [False, False, True]
+        assert [result['score'] for result in results[:2]] == [0.8, 0.9]
+        assert "80.00%" in results[0]['reason']
+        assert all("建议考虑" not in result['reason'] for result in results[:2])
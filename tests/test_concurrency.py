@@ -0,0 +1,79 @@
+"""
+按API端点共享的并发限制的测试
+"""
+
+import asyncio
+from typing import Any, Dict
+
+from ai import AIJudger, AIModel
+from ai.concurrency import get_endpoint_limit, get_endpoint_semaphore, set_endpoint_limit
+
+
+class EndpointModel(AIModel):
+    """通过端点信号量限流的异步模型，记录所有实例在同一端点上同时进行中的调用数"""
+
+    in_flight = 0
+    max_in_flight = 0
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+
+    def judge(self, user_requirements: str, job_description: str) -> Dict[str, Any]:
+        raise AssertionError("异步判断不应调用judge")
+
+    async def ajudge(self, user_requirements: str, job_description: str) -> Dict[str, Any]:
+        async with get_endpoint_semaphore(self.endpoint):
+            cls = type(self)
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+            try:
+                await asyncio.sleep(0.01)
+            finally:
+                cls.in_flight -= 1
+        return {'success': True, 'score': 0.8, 'reason': job_description}
+
+
+def reset_counters():
+    EndpointModel.in_flight = 0
+    EndpointModel.max_in_flight = 0
+
+
+def test_semaphore_caps_in_flight_calls_across_instances():
+    endpoint = "https://llm.test/cap"
+    set_endpoint_limit(endpoint, 2)
+    reset_counters()
+    judgers = [AIJudger(EndpointModel(endpoint), user_requirements="anything") for _ in range(2)]
+
+    async def run():
+        return await asyncio.gather(*(judger.ajudge_batch([f"job-{idx}" for idx in range(6)])
+                                      for judger in judgers))
+
+    results = asyncio.run(run())
+
+    assert EndpointModel.max_in_flight == 2
+    assert [[result['reason'] for result in batch] for batch in results] == [[f"job-{idx}" for idx in range(6)]] * 2
+
+
+def test_semaphore_works_across_event_loops():
+    endpoint = "https://llm.test/loops"
+    set_endpoint_limit(endpoint, 3)
+    judger = AIJudger(EndpointModel(endpoint), user_requirements="anything")
+
+    for _ in range(3):
+        reset_counters()
+        results = asyncio.run(judger.ajudge_batch([f"job-{idx}" for idx in range(7)]))
+        assert all(result['success'] for result in results)
+        assert EndpointModel.max_in_flight == 3
+
+
+def test_endpoints_are_limited_independently():
+    set_endpoint_limit("https://llm.test/a", 1)
+    assert get_endpoint_limit("https://llm.test/a") == 1
+    assert get_endpoint_limit("https://llm.test/unset") == 8
+
+    async def semaphores():
+        return get_endpoint_semaphore("https://llm.test/a"), get_endpoint_semaphore("https://llm.test/b"), \
+            get_endpoint_semaphore("https://llm.test/a")
+
+    first, other, again = asyncio.run(semaphores())
+    assert first is again and first is not other
@@ -0,0 +1,52 @@
+"""
+LinkedInParser并发抓取职位详情页的测试
+
+_make_request被替换为本地的假实现：搜索结果页返回保存下来的页面，详情页记录同时在进行的请求数。
+"""
+
+from conftest import SEARCH_HTML, SEARCH_URL, FakeLinkedIn
+from parsers import LinkedInParser
+from parsers.html_backends import BS4Backend, DESCRIPTION_NOT_AVAILABLE
+
+# 每个详情页请求的耗时，足够让并发的请求重叠
+DETAIL_DELAY = 0.05
+
+
+def fixture_cards():
+    return BS4Backend().extract_job_cards(SEARCH_HTML)
+
+
+def test_parallel_detail_fetch_is_capped_and_ordered():
+    cards = fixture_cards()
+    fake = FakeLinkedIn(failing=[cards[2]['job_link']], delay=DETAIL_DELAY)
+    parser = LinkedInParser(max_workers=3)
+    parser._make_request = fake
+
+    jobs = parser.parse(SEARCH_URL)
+
+    assert fake.max_in_flight == 3
+    assert [job['job_id'] for job in jobs] == [card['job_id'] for card in cards]
+    assert jobs[2]['full_description'] == DESCRIPTION_NOT_AVAILABLE
+    assert all(job['full_description'] != DESCRIPTION_NOT_AVAILABLE for idx, job in enumerate(jobs) if idx != 2)
+
+
+def test_serial_detail_fetch_matches_parallel():
+    fake = FakeLinkedIn()
+    serial = LinkedInParser(max_workers=1)
+    serial._make_request = fake
+    parallel = LinkedInParser(max_workers=4)
+    parallel._make_request = FakeLinkedIn()
+
+    assert [dict(job) for job in serial.parse(SEARCH_URL, 6)] == [dict(job) for job in parallel.parse(SEARCH_URL, 6)]
+    assert fake.max_in_flight == 1
+
+
+def test_iter_parse_caps_concurrency():
+    fake = FakeLinkedIn(delay=DETAIL_DELAY)
+    parser = LinkedInParser(max_workers=2)
+    parser._make_request = fake
+
+    jobs = list(parser.iter_parse(SEARCH_URL))
+
+    assert fake.max_in_flight == 2
+    assert sorted(job['job_id'] for job in jobs) == sorted(card['job_id'] for card in fixture_cards())
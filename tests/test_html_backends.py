@@ -0,0 +1,51 @@
+import pytest
+
+from conftest import load_fixture
+from parsers.html_backends import HTML_BACKENDS, BS4Backend, get_html_backend
+
+
+def load_backend(name: str):
+    """创建解析后端，依赖未安装时跳过测试"""
+    try:
+        return get_html_backend(name)
+    except ImportError as e:
+        pytest.skip(str(e))
+
+
+def test_bs4_backend_reference_fields():
+    """参照后端的提取结果应与页面内容一致"""
+    cards = BS4Backend().extract_job_cards(load_fixture("linkedin_search.html"))
+
+    assert len(cards) == 10
+    assert cards[0]['title'] == "Student Software Engineer"
+    assert cards[0]['company'] == "Acme & Co."
+    assert cards[0]['job_id'] == "4077875677"
+    assert cards[0]['benefits'] == "Be an early applicant"
+    assert cards[3]['company_logo'] == "Not specified"
+    assert cards[5]['company_link'] == "Not specified"
+
+
+@pytest.mark.parametrize("backend_name", sorted(HTML_BACKENDS))
+def test_job_cards_parity(backend_name):
+    """所有后端从搜索结果页提取的字段都应与bs4完全一致"""
+    html = load_fixture("linkedin_search.html")
+    backend = load_backend(backend_name)
+
+    assert backend.extract_job_cards(html) == BS4Backend().extract_job_cards(html)
+
+
+@pytest.mark.parametrize("backend_name", sorted(HTML_BACKENDS))
+def test_job_description_parity(backend_name):
+    """所有后端从详情页提取的职位描述都应与bs4完全一致"""
+    html = load_fixture("linkedin_job.html")
+    backend = load_backend(backend_name)
+
+    description = backend.extract_job_description(html)
+    assert description == BS4Backend().extract_job_description(html)
+    assert description.startswith("About the job")
+
+
+@pytest.mark.parametrize("backend_name", sorted(HTML_BACKENDS))
+def test_missing_description(backend_name):
+    backend = load_backend(backend_name)
+    assert backend.extract_job_description("<html><body><p>nothing</p></body></html>") == 'Description not available'
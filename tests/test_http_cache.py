@@ -0,0 +1,108 @@
+"""
+HttpCache的测试：URL规范化、过期页面的条件请求重新验证，以及按总大小的LRU淘汰
+"""
+
+import os
+
+from conftest import FakeResponse
+from parsers import LinkedInParser
+from parsers import http_cache as http_cache_module
+from parsers.http_cache import HttpCache, normalize_url
+
+FAKE_TIME_MODULE = http_cache_module
+
+
+def test_normalize_url_strips_tracking_but_keeps_pagination():
+    url = "HTTPS://CN.LinkedIn.com/jobs/view/123/?trk=abc&refId=r&utm_source=x&position=1&pageNum=2#frag"
+    assert normalize_url(url) == "https://cn.linkedin.com/jobs/view/123?pageNum=2"
+
+    assert normalize_url("https://www.linkedin.com/jobs/search?start=25&keywords=python&trackingId=t") == \
+        normalize_url("https://www.linkedin.com/jobs/search/?keywords=python&start=25")
+    assert normalize_url("https://www.linkedin.com/jobs/search?keywords=python&pageNum=0") != \
+        normalize_url("https://www.linkedin.com/jobs/search?keywords=python&pageNum=1")
+    assert normalize_url("https://www.linkedin.com/jobs/search?keywords=python&start=0") != \
+        normalize_url("https://www.linkedin.com/jobs/search?keywords=python&start=25")
+
+
+def test_fresh_pages_are_served_from_cache_and_stale_pages_revalidated(clock):
+    cache = HttpCache(":memory:", search_ttl=60, detail_ttl=3600)
+    parser = LinkedInParser(http_cache=cache)
+    requests_seen = []
+    responses = [FakeResponse("<html>v1</html>", headers={'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}),
+                 FakeResponse(status_code=304),
+                 FakeResponse("<html>v2</html>", headers={'ETag': '"v2"'})]
+
+    def fake_request(url, max_retries=3, headers=None):
+        requests_seen.append(headers)
+        return responses[len(requests_seen) - 1]
+
+    parser._make_request = fake_request
+    url = "https://www.linkedin.com/jobs/search?keywords=python&trk=a"
+
+    assert parser._fetch_html(url, is_search=True) == "<html>v1</html>"
+    clock.now += 30
+    assert parser._fetch_html(url + "&trk=b", is_search=True) == "<html>v1</html>"
+    assert len(requests_seen) == 1
+
+    # 过期后带上验证信息发送条件请求，304时沿用缓存的正文并刷新获取时间
+    clock.now += 60
+    assert parser._fetch_html(url, is_search=True) == "<html>v1</html>"
+    assert requests_seen[1] == {'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+    assert cache.get(url).age == 0
+
+    clock.now += 61
+    assert parser._fetch_html(url, is_search=True) == "<html>v2</html>"
+    assert cache.get(url).etag == '"v2"'
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['revalidated']) == (1, 2, 1)
+
+
+def test_least_recently_used_pages_are_evicted_by_size(clock):
+    page = lambda: os.urandom(1500).hex()  # 随机内容压缩后的大小基本相同
+    cache = HttpCache(":memory:")
+    for idx in range(3):
+        cache.set(f"https://www.linkedin.com/jobs/view/{idx}", page())
+        clock.now += 1
+    # 上限只能再容纳不到一个页面
+    cache.max_bytes = cache.stats()['bytes'] + 500
+    cache.get("https://www.linkedin.com/jobs/view/0")
+    clock.now += 1
+
+    cache.set("https://www.linkedin.com/jobs/view/3", page())
+
+    assert cache.get("https://www.linkedin.com/jobs/view/1") is None
+    assert all(cache.get(f"https://www.linkedin.com/jobs/view/{idx}") for idx in (0, 2, 3))
+    assert cache.stats()['bytes'] <= cache.max_bytes and len(cache) == 3
+
+
+def test_total_size_is_tracked_across_replace_evict_clear_and_reopen(tmp_path, clock):
+    path = str(tmp_path / "http_cache.sqlite3")
+    cache = HttpCache(path, max_bytes=8000)
+
+    def actual_bytes(target: HttpCache) -> int:
+        return target._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    for idx in range(12):
+        cache.set(f"https://www.linkedin.com/jobs/view/{idx % 8}", os.urandom(200 * (idx + 1)).hex())
+        clock.now += 1
+        assert cache.stats()['bytes'] == actual_bytes(cache)
+    assert cache.stats()['bytes'] <= 8000 and len(cache) < 8
+    cache.close()
+
+    reopened = HttpCache(path, max_bytes=8000)
+    assert reopened.stats()['bytes'] == actual_bytes(reopened) > 0
+    reopened.clear()
+    assert reopened.stats()['bytes'] == 0 and len(reopened) == 0
+
+
+def test_pages_larger_than_the_whole_cache_are_not_stored(clock):
+    cache = HttpCache(":memory:", max_bytes=4000)
+    cache.set("https://www.linkedin.com/jobs/view/0", os.urandom(1000).hex())
+    cache.set("https://www.linkedin.com/jobs/view/1", os.urandom(1000).hex())
+    clock.now += 1
+
+    # 超过上限的页面不缓存，也不会把其余的记录挤出去；同一URL的旧记录被删除
+    cache.set("https://www.linkedin.com/jobs/view/1", os.urandom(5000).hex())
+    assert cache.get("https://www.linkedin.com/jobs/view/1") is None
+    assert cache.get("https://www.linkedin.com/jobs/view/0") is not None
+    assert len(cache) == 1 and 0 < cache.stats()['bytes'] <= 4000
@@ -0,0 +1,84 @@
+"""
+JobEmbeddingIndex的测试，编码器为按词计数的词袋模型
+"""
+
+import threading
+import zlib
+
+import numpy as np
+
+from ai import JobEmbeddingIndex
+
+DIM = 64
+
+
+class BagOfWordsEncoder:
+    """把每个词哈希到DIM维中的一维并计数"""
+
+    def encode(self, texts):
+        vectors = np.zeros((len(texts), DIM), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, zlib.crc32(word.encode('utf-8')) % DIM] += 1
+        return vectors
+
+
+def test_top_k_ranks_by_similarity(tmp_path):
+    index = JobEmbeddingIndex(BagOfWordsEncoder(), str(tmp_path))
+    index.add(["1", "2", "3"], ["python django backend", "react frontend", "python data pipelines"])
+
+    ranked = index.top_k("python backend", k=2)
+
+    assert [job_id for job_id, _ in ranked] == ["1", "3"]
+    assert ranked[0][1] > ranked[1][1]
+
+
+def test_invalid_and_repeated_job_ids_are_skipped(tmp_path):
+    index = JobEmbeddingIndex(BagOfWordsEncoder(), str(tmp_path))
+    jobs = [{'job_id': 'Not specified'}, {'job_id': 'Error'}, {'job_id': '42'}, {}, {'job_id': '42'},
+            {'job_id': 'Not specified'}]
+
+    added = index.add_jobs(jobs, ["first", "second", "python", "third", "again", "fourth"])
+
+    assert added == 1
+    assert len(index) == 1 and 'Not specified' not in index
+    assert index.add(["42"], ["python"]) == 0
+
+
+def test_index_grows_and_reloads(tmp_path):
+    index = JobEmbeddingIndex(BagOfWordsEncoder(), str(tmp_path), initial_capacity=2)
+    for idx in range(7):
+        index.add([str(idx)], [f"word{idx} shared"])
+
+    reloaded = JobEmbeddingIndex(BagOfWordsEncoder(), str(tmp_path))
+
+    assert len(reloaded) == 7
+    assert reloaded.top_k("word5", k=1)[0][0] == "5"
+
+
+def test_top_k_during_concurrent_growth(tmp_path):
+    index = JobEmbeddingIndex(BagOfWordsEncoder(), str(tmp_path), initial_capacity=1)
+    index.add(["seed"], ["python seed"])
+    errors = []
+    done = threading.Event()
+
+    def search():
+        while not done.is_set():
+            try:
+                ranked = index.top_k("python", k=3)
+                assert ranked and all(job_id is not None for job_id, _ in ranked)
+            except Exception as e:
+                errors.append(e)
+                return
+
+    readers = [threading.Thread(target=search) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for idx in range(200):
+        index.add([str(idx)], [f"python job {idx}"])
+    done.set()
+    for reader in readers:
+        reader.join()
+
+    assert errors == []
+    assert len(index) == 201
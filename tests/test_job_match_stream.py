@@ -0,0 +1,96 @@
+"""
+JobMatchServer.process_job_stream的测试
+
+解析器和模型都是本地的替身：解析器逐个产出tests/fixtures中搜索结果页的职位并在每个职位之间等待一段时间，
+模型按标题打分，并记录每次判断发生时解析器已经产出了多少个职位。
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+from ai import AIJudger, AIModel
+from conftest import SEARCH_HTML
+from main.job_match_server import JobMatchServer
+from parsers.html_backends import BS4Backend
+from parsers.job_record import JobRecord
+from parsers.linkedin_base import LinkedInParserBase
+
+
+class FakeParser(LinkedInParserBase):
+    """从保存的搜索结果页产出职位，每个职位的“抓取”耗时delay秒"""
+
+    def __init__(self, delay: float = 0.05):
+        super().__init__()
+        cards = BS4Backend().extract_job_cards(SEARCH_HTML)
+        self.jobs = [JobRecord.from_mapping(dict(card, full_description=f"Description of {card['title']}"))
+                     for card in cards]
+        self.delay = delay
+        self.yielded = 0
+        self.finished = threading.Event()
+
+    def parse(self, url: str, max_num: int = -1):
+        return list(self.iter_parse(url, max_num))
+
+    def iter_parse(self, url: str, max_num: int = -1):
+        for job in self.jobs[:max_num] if max_num > 0 else self.jobs:
+            time.sleep(self.delay)
+            self.yielded += 1
+            yield job
+        self.finished.set()
+
+
+class TitleModel(AIModel):
+    """标题中包含Engineer的职位给高分，记录每次判断时解析器已产出的职位数"""
+
+    def __init__(self, parser: FakeParser):
+        self.parser = parser
+        self.yielded_at_judge = []
+
+    def judge(self, user_requirements: str, job_description: str) -> Dict[str, Any]:
+        self.yielded_at_judge.append(self.parser.yielded)
+        score = 0.9 if "Engineer" in job_description.split("\n", 3)[1] else 0.3
+        return {'success': True, 'score': score, 'reason': job_description[:40]}
+
+
+def make_server(delay: float = 0.05):
+    parser = FakeParser(delay)
+    model = TitleModel(parser)
+    return JobMatchServer(parser, AIJudger(model, user_requirements="Software engineer")), parser, model
+
+
+def test_stream_overlaps_judging_with_crawling():
+    server, parser, model = make_server()
+
+    results = list(server.process_job_stream("https://example.com/jobs/search", judge_workers=2))
+
+    assert len(results) == len(parser.jobs)
+    # 第一个职位在解析器产出完所有职位之前就已经被判断
+    assert min(model.yielded_at_judge) < len(parser.jobs)
+    assert parser.finished.is_set()
+
+
+def test_stream_results_match_process_job():
+    server, parser, _ = make_server(delay=0)
+
+    expected = server.process_job("https://example.com/jobs/search", max_num=6)
+    streamed = list(server.process_job_stream("https://example.com/jobs/search", max_num=6, judge_workers=3))
+
+    assert expected['status'] == 'success'
+    by_id = lambda results: {result['job_info']['job_id']: result for result in results}
+    assert by_id(streamed) == by_id(expected['results'])
+    assert {result['decision'] for result in streamed} == {True, False}
+
+
+def test_stream_reports_parse_failure():
+    server, parser, _ = make_server(delay=0)
+
+    def failing_iter_parse(url, max_num=-1):
+        yield parser.jobs[0]
+        raise RuntimeError("search page unavailable")
+
+    parser.iter_parse = failing_iter_parse
+    results = list(server.process_job_stream("https://example.com/jobs/search"))
+
+    assert {'error': 'search page unavailable', 'status': 'failed'} in results
+    assert sum('score' in result for result in results) == 1
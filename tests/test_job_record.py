@@ -0,0 +1,94 @@
+"""
+JobRecord的测试：与原来的dict保持兼容，格式化结果的缓存在字段修改后失效
+"""
+
+import copy
+import json
+import pickle
+
+from parsers.job_record import JobRecord, CARD_FIELDS, NOT_SPECIFIED, ERROR, DESCRIPTION_NOT_AVAILABLE
+
+
+def as_dict(**fields):
+    """原来解析器返回的dict：缺失的卡片字段为'Not specified'"""
+    data = {name: NOT_SPECIFIED for name in CARD_FIELDS}
+    data.update(fields)
+    return data
+
+
+def test_record_compares_equal_to_the_equivalent_dict():
+    record = JobRecord(title="Python Developer", company="Acme", job_id="42")
+    expected = as_dict(title="Python Developer", company="Acme", job_id="42")
+    assert record == expected
+    assert expected == record
+    assert dict(record) == expected
+    assert json.loads(json.dumps(dict(record))) == expected
+
+    record['full_description'] = "Build APIs"
+    assert record != expected
+    assert record == dict(expected, full_description="Build APIs")
+
+    record['score_hint'] = 3
+    assert record == dict(expected, full_description="Build APIs", score_hint=3)
+    assert JobRecord.from_mapping(expected) == expected
+
+
+def test_get_and_membership_match_dict_behavior():
+    record = JobRecord(title="Python Developer", location=NOT_SPECIFIED)
+    assert record.get('title') == "Python Developer"
+    assert record.get('location') == NOT_SPECIFIED
+    assert record.location is None
+    # 详情字段在抓取之前不存在
+    assert 'full_description' not in record
+    assert record.get('full_description') is None
+    assert record.get('full_description', DESCRIPTION_NOT_AVAILABLE) == DESCRIPTION_NOT_AVAILABLE
+    assert record.get('unknown', 'fallback') == 'fallback'
+    assert 'company' in record and 'unknown' not in record
+
+    error = JobRecord.error()
+    assert error['title'] == ERROR
+    assert error == {name: ERROR for name in CARD_FIELDS}
+
+    del record['title']
+    assert record['title'] == NOT_SPECIFIED
+    assert len(record) == len(CARD_FIELDS)
+
+
+def test_pickle_and_copy_round_trip():
+    record = JobRecord(title="Python Developer", job_id="42", full_description="Build APIs")
+    record['extra'] = {'tags': ['remote']}
+    _ = record.formatted
+
+    for restored in (pickle.loads(pickle.dumps(record)), copy.deepcopy(record), record.copy()):
+        assert isinstance(restored, JobRecord)
+        assert restored == record
+        assert restored.formatted == record.formatted
+
+    error = pickle.loads(pickle.dumps(JobRecord.error()))
+    assert error['company'] == ERROR
+
+
+def test_formatted_cache_is_invalidated_on_change():
+    record = JobRecord(title="Python Developer", company="Acme")
+    first = record.formatted
+    assert record.formatted is first
+    assert DESCRIPTION_NOT_AVAILABLE in first
+
+    record['full_description'] = "Build APIs"
+    assert "Build APIs" in record.formatted
+
+    record.title = "Senior Python Developer"
+    assert "**Job Title**: Senior Python Developer" in record.formatted
+
+    del record['company']
+    assert f"**Company**: {NOT_SPECIFIED}" in record.formatted
+
+    # 额外的键不参与格式化，修改时不需要重新生成
+    cached = record.formatted
+    record['note'] = "x"
+    assert record.formatted is cached
+
+    copied = record.copy()
+    copied['location'] = "Shanghai"
+    assert "Shanghai" in copied.formatted
+    assert "Shanghai" not in record.formatted
@@ -0,0 +1,89 @@
+"""
+JobStore和解析器增量模式的测试
+
+_make_request被替换为本地函数，搜索结果页返回tests/fixtures中保存的页面，详情页的请求被记录下来。
+"""
+
+from conftest import SEARCH_HTML, SEARCH_URL, FakeLinkedIn
+from parsers import LinkedInParser
+from parsers import job_store as job_store_module
+from parsers.html_backends import BS4Backend
+from parsers.job_store import JobStore, card_fingerprint
+
+FAKE_TIME_MODULE = job_store_module
+CARDS = BS4Backend().extract_job_cards(SEARCH_HTML)
+
+
+def run(store: JobStore, fake: FakeLinkedIn, **kwargs):
+    parser = LinkedInParser(job_store=store, **kwargs)
+    parser._make_request = fake
+    return parser.parse(SEARCH_URL)
+
+
+def last_seen(store: JobStore, job_id: str) -> float:
+    return store._conn.execute("SELECT last_seen FROM jobs WHERE job_id = ?", (job_id,)).fetchone()[0]
+
+
+def test_incremental_runs_only_fetch_new_or_changed_jobs(clock):
+    store = JobStore(":memory:")
+    failed_id, changed_id = CARDS[3]['job_id'], CARDS[0]['job_id']
+
+    first = FakeLinkedIn(SEARCH_HTML, failing=[failed_id])
+    jobs = run(store, first)
+    assert len(jobs) == len(CARDS) and len(first.detail_requests) == len(CARDS)
+    # 详情页抓取失败的职位不保存，下次运行会重新抓取
+    assert store.get(failed_id) is None
+    assert len(store) == len(CARDS) - 1
+
+    clock.now += 100
+    changed_html = SEARCH_HTML.replace(CARDS[0]['title'], "Staff Software Engineer")
+    second = FakeLinkedIn(changed_html)
+    jobs = run(store, second)
+
+    assert sorted(job['job_id'] for job in jobs) == sorted([changed_id, failed_id])
+    assert len(second.detail_requests) == 2
+    assert store.get(changed_id)['title'] == "Staff Software Engineer"
+    assert store.get(failed_id)['full_description'] != 'Description not available'
+    assert len(store) == len(CARDS)
+
+    # 没有变化的职位被跳过，但更新了最近出现时间
+    unchanged_id = CARDS[5]['job_id']
+    assert last_seen(store, unchanged_id) == 1100.0
+    assert last_seen(store, changed_id) == 1100.0
+
+
+def test_non_incremental_mode_fetches_everything():
+    store = JobStore(":memory:")
+    run(store, FakeLinkedIn(SEARCH_HTML))
+
+    again = FakeLinkedIn(SEARCH_HTML)
+    jobs = run(store, again, incremental=False)
+
+    assert len(jobs) == len(again.detail_requests) == len(CARDS)
+
+
+def test_incremental_can_be_overridden_per_call():
+    store = JobStore(":memory:")
+    run(store, FakeLinkedIn(SEARCH_HTML))
+
+    again = FakeLinkedIn(SEARCH_HTML)
+    parser = LinkedInParser(job_store=store)
+    parser._make_request = again
+    assert len(list(parser.iter_parse(SEARCH_URL, incremental=False))) == len(CARDS)
+    assert list(parser.iter_parse(SEARCH_URL)) == []
+    assert parser.incremental is True
+
+
+def test_upsert_keeps_first_seen_and_skips_invalid_ids(clock):
+    store = JobStore(":memory:")
+    card = dict(CARDS[0], full_description="v1")
+    assert store.upsert_many([card, {'job_id': 'Not specified', 'title': 'x'}, {'title': 'no id'}]) == 1
+
+    clock.now += 50
+    store.upsert_many([dict(card, title="Renamed", full_description="v2")])
+
+    first_seen, seen_last = store._conn.execute(
+        "SELECT first_seen, last_seen FROM jobs WHERE job_id = ?", (card['job_id'],)).fetchone()
+    assert (first_seen, seen_last) == (1000.0, 1050.0)
+    assert store.fingerprints([card['job_id'], 'Not specified', 'missing']) == {
+        card['job_id']: card_fingerprint(dict(card, title="Renamed"))}
@@ -0,0 +1,58 @@
+"""
+导入代价的回归测试：导入包本身不应加载torch、transformers、openai等重量级依赖
+
+每个检查都在新的子进程中进行，避免受到当前进程中已经导入的模块影响。
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+HEAVY_MODULES = ("torch", "transformers", "openai", "onnxruntime")
+
+
+def loaded_heavy_modules(code: str):
+    """在子进程中执行code，返回执行后已加载的重量级模块"""
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src"))
+    script = (
+        f"import sys, json\n{code}\n"
+        f"print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))"
+    )
+    output = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("code", [
+    "import ai",
+    "from ai import AIJudger, CascadeJudger, CachedModel, create_model_from_config",
+    "import parsers",
+    "import main",
+    "import src",
+])
+def test_import_does_not_load_heavy_dependencies(code):
+    assert loaded_heavy_modules(code) == []
+
+
+def test_model_factory_imports_only_selected_backend():
+    pytest.importorskip("openai")
+    loaded = loaded_heavy_modules(
+        "from ai import create_model\n"
+        "create_model('qwen', api_key='test-key')"
+    )
+    assert loaded == ["openai"]
+
+
+def test_lazy_attribute_resolves_class():
+    pytest.importorskip("openai")
+    loaded = loaded_heavy_modules(
+        "import ai\n"
+        "from ai.qwen_model import QwenModel\n"
+        "assert ai.QwenModel is QwenModel"
+    )
+    assert "openai" in loaded
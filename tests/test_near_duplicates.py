@@ -0,0 +1,92 @@
+"""
+NearDuplicateDetector以及AIJudger按详情页描述去重的测试
+"""
+
+from typing import Any, Dict
+
+import pytest
+
+from ai import AIJudger, AIModel
+from ai.near_duplicates import NearDuplicateDetector
+
+WORDS = ("python backend service api database cloud team design review deploy monitor scale cache queue "
+         "latency storage security testing release customer product platform data pipeline metric").split()
+
+
+def make_text(seed: int, length: int = 80) -> str:
+    """生成确定性的伪随机文本，不同seed的文本几乎没有相同的5-gram"""
+    state = seed * 7919 + 17
+    words = []
+    for _ in range(length):
+        state = (state * 1103515245 + 12345) % (1 << 31)
+        words.append(WORDS[state % len(WORDS)])
+    return " ".join(words)
+
+
+def edit(text: str, changed: int) -> str:
+    """把文本中均匀分布的changed个词换成不会出现在原文中的词"""
+    words = text.split()
+    step = len(words) // changed
+    for idx in range(changed):
+        words[idx * step] = f"edited{idx}"
+    return " ".join(words)
+
+
+def test_short_texts_are_their_own_representatives():
+    detector = NearDuplicateDetector(threshold=0.8, min_words=50)
+    short = "Description not available"
+    texts = [short, short, "", "", make_text(1, length=49), make_text(1, length=49)]
+    assert detector.representatives(texts) == list(range(len(texts)))
+    assert detector.signature(short) is None
+
+    # 放宽min_words之后，完全相同的短文本归为一组
+    detector = NearDuplicateDetector(threshold=0.8, min_words=3)
+    assert detector.representatives(texts[4:]) == [0, 0]
+
+
+def test_threshold_controls_grouping():
+    base = make_text(1, length=200)
+    slightly_edited, heavily_edited = edit(base, 2), edit(base, 12)
+    detector = NearDuplicateDetector(threshold=0.9)
+    assert detector.similarity(detector.signature(base), detector.signature(slightly_edited)) >= 0.9
+    assert detector.similarity(detector.signature(base), detector.signature(heavily_edited)) < 0.9
+    assert detector.representatives([base, slightly_edited, heavily_edited]) == [0, 0, 2]
+
+    loose = NearDuplicateDetector(threshold=0.3)
+    assert loose.representatives([base, slightly_edited, heavily_edited]) == [0, 0, 0]
+
+    with pytest.raises(ValueError):
+        NearDuplicateDetector(threshold=0)
+
+
+def test_representatives_map_back_to_first_member_of_each_group():
+    a, b, c = make_text(1), make_text(2), make_text(3)
+    texts = [a, b, a, "too short", c, b, a]
+    assert NearDuplicateDetector().representatives(texts) == [0, 1, 0, 3, 4, 1, 0]
+
+
+class CountingModel(AIModel):
+    def __init__(self):
+        self.descriptions = []
+
+    def judge(self, user_requirements: str, job_description: str) -> Dict[str, Any]:
+        self.descriptions.append(job_description)
+        return {'success': True, 'score': 0.9}
+
+
+def test_judger_dedups_on_full_description_not_formatted_text():
+    description = make_text(5)
+    jobs = [{'job_id': '1', 'title': "Backend Engineer", 'company': "Acme", 'full_description': description},
+            {'job_id': '2', 'title': "Python Developer", 'company': "Globex", 'full_description': description},
+            {'job_id': '3', 'title': "Backend Engineer", 'company': "Acme", 'full_description': make_text(6)}]
+    # 格式化文本中标题和公司不同，而且远短于min_words的要求时不会影响按描述的分组
+    formatted = [f"{job['title']} @ {job['company']}" for job in jobs]
+    model = CountingModel()
+    judger = AIJudger(model, user_requirements="python", dedup_threshold=0.9)
+
+    results = judger.judge_batch(formatted, jobs)
+
+    assert model.descriptions == [formatted[0], formatted[2]]
+    assert results[1]['duplicate_of'] == '1'
+    assert results[1]['job_info'] is jobs[1]
+    assert judger.last_dedup_stats == {'total': 3, 'judged': 2, 'duplicates': 1}
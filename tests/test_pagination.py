@@ -0,0 +1,105 @@
+"""
+搜索结果翻页的测试
+
+_fetch_html被替换为本地函数：每一页都基于tests/fixtures中保存的搜索结果页（10个职位），
+通过改写job_id得到不同页面的职位，也可以让某一页返回重复的职位或空页面。
+"""
+
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from conftest import SEARCH_HTML, SEARCH_URL
+from parsers import LinkedInParser
+from parsers.html_backends import BS4Backend
+from parsers.linkedin_base import LinkedInParserBase
+
+FIXTURE_IDS = [card['job_id'] for card in BS4Backend().extract_job_cards(SEARCH_HTML)]
+
+
+def page_html(page: int) -> str:
+    """第page页的搜索结果，职位与保存的页面相同，job_id各不相同"""
+    html = SEARCH_HTML
+    for job_id in FIXTURE_IDS:
+        html = html.replace(job_id, str(int(job_id) + page * 1000))
+    return html
+
+
+class FakeSearch:
+    """按start参数返回页面，pages为页码到HTML的映射，缺少的页码返回不同职位的页面"""
+
+    def __init__(self, pages: dict = None):
+        self.pages = pages or {}
+        self.requested = []
+        self._lock = threading.Lock()
+
+    def __call__(self, url: str, is_search: bool = False) -> str:
+        start = int(parse_qs(urlsplit(url).query).get('start', ['0'])[0])
+        with self._lock:
+            self.requested.append(start)
+        page = start // 25
+        return self.pages.get(page, page_html(page))
+
+
+def collect(max_num: int = -1, pages: dict = None, **kwargs):
+    parser = LinkedInParser(**kwargs)
+    parser._fetch_html = FakeSearch(pages)
+    return parser._collect_job_cards(SEARCH_URL, max_num), sorted(parser._fetch_html.requested)
+
+
+def test_stops_once_max_num_is_reached():
+    cards, requested = collect(max_num=35, page_concurrency=3)
+
+    assert len(cards) == 35
+    # 每页只有10个职位，每批只抓取凑够剩余数量所需的1页
+    assert requested == [0, 25, 50, 75]
+    assert len({card['job_id'] for card in cards}) == 35
+
+
+def test_stops_when_a_page_adds_only_duplicates():
+    cards, requested = collect(pages={page: SEARCH_HTML for page in range(40)}, page_concurrency=3)
+
+    assert [card['job_id'] for card in cards] == FIXTURE_IDS
+    assert requested == [0, 25, 50, 75]
+
+
+def test_stops_on_an_empty_page():
+    cards, requested = collect(pages={2: ""}, page_concurrency=2)
+
+    assert len(cards) == 20
+    assert requested == [0, 25, 50]
+
+
+def test_later_pages_of_an_exhausted_wave_are_ignored():
+    cards, _ = collect(pages={1: "", 2: page_html(2)}, page_concurrency=3)
+
+    assert [card['job_id'] for card in cards] == FIXTURE_IDS
+
+
+def test_stops_at_max_pages():
+    cards, requested = collect(max_pages=4, page_concurrency=3)
+
+    assert len(cards) == 40
+    assert requested == [0, 25, 50, 75]
+
+
+@pytest.mark.parametrize("next_page, collected, max_num, expected", [
+    (1, 25, -1, [1, 2, 3]),
+    (1, 25, 60, [1, 2]),
+    (1, 25, 26, [1]),
+    (38, 950, -1, [38, 39]),
+    (40, 1000, -1, []),
+])
+def test_next_page_wave(next_page, collected, max_num, expected):
+    parser = LinkedInParserBase(max_pages=40, page_concurrency=3)
+    assert parser._next_page_wave(next_page, collected, max_num) == expected
+
+
+def test_merge_page_cards_deduplicates_valid_ids_only():
+    job_cards, seen_ids = [], set()
+    page = [{'job_id': '1'}, {'job_id': 'Not specified'}, {'job_id': '1'}, {'job_id': 'Error'}, {'job_id': '2'}]
+
+    assert LinkedInParserBase._merge_page_cards(job_cards, seen_ids, page) == 4
+    assert LinkedInParserBase._merge_page_cards(job_cards, seen_ids, [{'job_id': '2'}]) == 0
+    assert [card['job_id'] for card in job_cards] == ['1', 'Not specified', 'Error', '2']
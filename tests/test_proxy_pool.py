@@ -0,0 +1,173 @@
+"""
+代理池的测试：隔离与重新启用、健康检查线程的启动和停止、探测请求经过限速器，以及403/429计为代理失败
+
+时间由假时钟（conftest中的clock）控制，探测请求的requests.get被替换为本地函数，不会访问网络。
+"""
+
+import threading
+
+import pytest
+
+from conftest import FakeResponse
+from parsers import LinkedInParser
+from parsers import proxy_pool as proxy_pool_module
+from parsers.proxy_pool import ACTIVE, QUARANTINED, ProxyPool
+from parsers.rate_limiter import HostRateLimiter
+
+PROXY = "http://10.0.0.1:8080"
+OTHER = "http://10.0.0.2:8080"
+
+
+@pytest.fixture
+def probes(monkeypatch):
+    """替换探测请求，返回 {代理: 状态码} 的映射（默认200）和已探测的代理列表"""
+    statuses, probed = {}, []
+    lock = threading.Lock()
+
+    def fake_get(url, proxies=None, timeout=None):
+        with lock:
+            probed.append(proxies['https'])
+        status = statuses.get(proxies['https'], 200)
+        return FakeResponse(status_code=status, headers={'Retry-After': '30'} if status == 429 else {})
+
+    monkeypatch.setattr(proxy_pool_module.requests, "get", fake_get)
+    return statuses, probed
+
+
+def make_pool(clock, proxies=(PROXY,), **kwargs) -> ProxyPool:
+    return ProxyPool(list(proxies), max_fails=2, cooldown=60, max_cooldown=200, clock=clock,
+                     rate_limiter=HostRateLimiter(rate=1000, capacity=1000, max_rate=1000), **kwargs)
+
+
+def status(pool: ProxyPool, proxy: str = PROXY) -> str:
+    return pool.stats()['proxies'][proxy]['status']
+
+
+def test_consecutive_failures_quarantine_until_cooldown_expires(clock):
+    pool = make_pool(clock)
+
+    pool.report_failure(PROXY)
+    assert status(pool) == ACTIVE
+    pool.report_failure(PROXY)
+    assert status(pool) == QUARANTINED
+    assert pool.acquire() is None
+    assert pool.stats()['proxies'][PROXY]['cooldown_remaining'] == pytest.approx(60)
+
+    clock.now += 61
+    assert pool.acquire() == PROXY
+
+
+def test_readmitted_proxy_gets_one_chance_and_cooldown_doubles(clock):
+    pool = make_pool(clock)
+    for cooldown in (60, 120, 200, 200):
+        pool.report_failure(PROXY)
+        if status(pool) == ACTIVE:
+            pool.report_failure(PROXY)
+        assert status(pool) == QUARANTINED
+        assert pool.stats()['proxies'][PROXY]['cooldown_remaining'] == pytest.approx(cooldown)
+        clock.now += cooldown + 1
+        assert pool.available_count() == 1
+
+    # 成功一次后清零：之后又需要连续失败max_fails次才会被隔离，冷却时间从头开始
+    pool.report_success(PROXY, 0.2)
+    pool.report_failure(PROXY)
+    assert status(pool) == ACTIVE
+    pool.report_failure(PROXY)
+    assert pool.stats()['proxies'][PROXY]['cooldown_remaining'] == pytest.approx(60)
+
+
+def test_successful_probe_readmits_quarantined_proxy_early(probes, clock):
+    statuses, probed = probes
+    pool = make_pool(clock, proxies=(PROXY, OTHER))
+    pool.report_failure(PROXY)
+    pool.report_failure(PROXY)
+    statuses[OTHER] = 403
+
+    assert pool.check_health() == {PROXY: True, OTHER: False}
+    assert status(pool, PROXY) == ACTIVE
+    assert pool.stats()['proxies'][OTHER]['consecutive_failures'] == 1
+    assert sorted(probed) == [PROXY, OTHER]
+
+
+def test_probes_go_through_the_rate_limiter(probes):
+    statuses, _ = probes
+    statuses[PROXY] = 429
+    limiter = HostRateLimiter(rate=10, capacity=10, max_rate=10)
+    pool = ProxyPool([PROXY], rate_limiter=limiter, health_check_url="https://www.linkedin.com/robots.txt")
+
+    pool.check_health()
+
+    stats = limiter.stats()["www.linkedin.com"]
+    assert stats['rate'] == pytest.approx(5)
+    assert stats['blocked_for'] == pytest.approx(30, abs=1)
+
+
+def test_acquire_does_not_start_health_checks():
+    pool = ProxyPool([PROXY])
+    assert pool.acquire() == PROXY
+    assert pool._health_thread is None
+
+
+def test_parser_starts_and_stops_health_checks_of_its_own_pool(probes):
+    _, probed = probes
+    limiter = HostRateLimiter(rate=1000, capacity=1000, max_rate=1000)
+    parser = LinkedInParser(proxies=[PROXY], rate_limiter=limiter)
+    thread = parser.proxy_pool._health_thread
+    assert thread is not None and parser.proxy_pool.rate_limiter is limiter
+
+    parser.close()
+
+    assert parser.proxy_pool._health_thread is None
+    assert not thread.is_alive()
+    assert probed[0] == PROXY
+
+
+def test_parser_leaves_shared_pool_alone():
+    pool_limiter = HostRateLimiter()
+    shared = ProxyPool([PROXY], rate_limiter=pool_limiter)
+    parser = LinkedInParser(proxies=shared, rate_limiter=HostRateLimiter())
+
+    assert shared._health_thread is None
+    assert shared.rate_limiter is pool_limiter
+    parser.close()
+
+
+def test_parser_drops_sessions_of_quarantined_and_removed_proxies(clock):
+    pool = make_pool(clock, proxies=(PROXY, OTHER))
+    parser = LinkedInParser(proxies=pool, rate_limiter=HostRateLimiter())
+    sessions = {proxy: parser.session_pool.get(proxy) for proxy in (PROXY, OTHER, None)}
+
+    pool.report_failure(PROXY)
+    assert len(parser.session_pool) == 3
+    pool.report_failure(PROXY)
+    assert status(pool, PROXY) == QUARANTINED
+    assert parser.session_pool.get(PROXY) is not sessions[PROXY]
+
+    pool.remove(OTHER)
+    assert parser.session_pool.get(OTHER) is not sessions[OTHER]
+    assert parser.session_pool.get(None) is sessions[None]
+
+    # 解析器关闭后不再接收共享代理池的通知
+    parser.close()
+    assert pool._listeners == []
+
+
+class FakeSession:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+
+    def get(self, url, headers=None, timeout=None):
+        return FakeResponse(status_code=self.status_code)
+
+
+@pytest.mark.parametrize("status_code, failures", [(200, 0), (404, 0), (403, 1), (429, 1)])
+def test_blocked_responses_count_as_proxy_failures(status_code, failures):
+    pool = ProxyPool([PROXY], max_fails=5)
+    parser = LinkedInParser(proxies=pool, rate_limiter=HostRateLimiter(rate=1000, capacity=1000, max_rate=1000))
+    parser.session_pool.get = lambda proxy: FakeSession(status_code)
+
+    parser._send("https://www.linkedin.com/jobs/view/1", PROXY)
+
+    info = pool.stats()['proxies'][PROXY]
+    assert info['failures'] == failures
+    assert info['consecutive_failures'] == failures
@@ -0,0 +1,183 @@
+"""
+QwenModel打包模式的测试：分组、打包回复的解析，以及经由AIJudger调度时的补判、并行和超时
+
+_chat（异步路径为_achat）被替换为本地函数，不会访问网络。
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("openai")
+
+from ai import AIJudger, CachedModel, JudgmentCache
+from ai.qwen_model import QwenModel
+
+
+def make_model(pack_token_budget=None, **kwargs) -> QwenModel:
+    return QwenModel(api_key="test-key", base_url="http://127.0.0.1:9/v1", pack_token_budget=pack_token_budget,
+                     **kwargs)
+
+
+def packed_answer(items) -> str:
+    return "```json\n" + json.dumps(items) + "\n```"
+
+
+class FakeChat:
+    """
+    替代QwenModel._chat：打包请求只回答drop之外的职位，单个职位的请求单独回答，每次调用等待delay秒；
+    描述中包含hang的请求等待hang秒，用来触发超时
+    """
+
+    def __init__(self, drop=(), delay: float = 0.0, hang: float = 5.0):
+        self.drop = set(drop)
+        self.delay = delay
+        self.hang = hang
+        self.packed_calls = []
+        self.single_calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, messages) -> str:
+        prompt = messages[-1]['content']
+        jobs = re.findall(r"### 职位 \d+\n(.*)", prompt)
+        time.sleep(self.hang if "hang" in prompt else self.delay)
+        with self._lock:
+            if jobs:
+                self.packed_calls.append(jobs)
+            else:
+                self.single_calls.append(prompt)
+        if not jobs:
+            return "```" + json.dumps({'score': 0.4, 'decision': False, 'reason': "single"}) + "```"
+        return packed_answer([{'job_index': idx, 'score': 0.9, 'decision': True, 'reason': job}
+                              for idx, job in enumerate(jobs) if job not in self.drop])
+
+
+def test_make_packs_respects_budget_and_order():
+    model = make_model(pack_token_budget=400)
+    descriptions = ["a" * 400, "b" * 400, "c" * 2000, "d" * 40, "e" * 40]
+
+    packs = model.make_packs("python", descriptions)
+
+    assert [idx for pack in packs for idx in pack] == list(range(5))
+    # 超出预算的职位独占一组
+    assert [2] in packs
+    assert any(len(pack) > 1 for pack in packs)
+    for pack in packs:
+        if len(pack) > 1:
+            # 分组时各部分分别估算，每部分的取整误差不超过1个token
+            prompt = model._build_packed_prompt("python", [descriptions[idx] for idx in pack])
+            assert model._estimate_tokens(prompt) <= 400 + len(pack)
+
+
+def test_make_packs_is_disabled_without_budget():
+    model = make_model()
+    assert model.supports_batch is False
+    assert model.make_packs("python", ["job"]) is None
+
+
+def test_parse_packed_response_skips_missing_duplicate_and_invalid_items():
+    model = make_model(pack_token_budget=1000)
+    response = packed_answer([
+        {'job_index': 0, 'score': 0.8, 'decision': True, 'reason': "first"},
+        {'job_index': 0, 'score': 0.1, 'decision': False, 'reason': "duplicate"},
+        {'job_index': "2", 'score': 0.3, 'decision': False, 'reason': "string index"},
+        {'job_index': 7, 'score': 0.5, 'reason': "out of range"},
+        {'job_index': 1, 'reason': "no score"},
+        {'score': 0.5, 'reason': "no index"},
+        "not an object",
+    ])
+
+    parsed = model._parse_packed_response(response, 3)
+
+    assert parsed == {
+        0: {'score': 0.8, 'decision': True, 'reason': "first", 'success': True},
+        2: {'score': 0.3, 'decision': False, 'reason': "string index", 'success': True},
+    }
+
+
+@pytest.mark.parametrize("response", ["```json\n[{\"job_index\": 0, \"score\": ```", "not json at all",
+                                      "```{\"job_index\": 0, \"score\": 0.5}```"])
+def test_parse_packed_response_rejects_malformed_answers(response):
+    with pytest.raises(ValueError):
+        make_model(pack_token_budget=1000)._parse_packed_response(response, 2)
+
+
+def test_judge_batch_falls_back_for_missing_jobs():
+    model = make_model(pack_token_budget=10000)
+    model._chat = FakeChat(drop={"job-1"})
+
+    results = model.judge_batch("python", ["job-0", "job-1", "job-2"])
+
+    assert [result['reason'] for result in results] == ["job-0", "single", "job-2"]
+    assert model._chat.packed_calls == [["job-0", "job-1", "job-2"]]
+    assert len(model._chat.single_calls) == 1
+
+
+def test_judger_dispatches_packs_and_fallbacks_in_parallel():
+    model = make_model(pack_token_budget=450)
+    model._chat = FakeChat(drop={"job-1 " + "x" * 400, "job-3 " + "x" * 400}, delay=0.3)
+    descriptions = [f"job-{idx} " + "x" * 400 for idx in range(4)]
+    assert len(model.make_packs("python", descriptions)) == 2
+    judger = AIJudger(model, user_requirements="python", max_workers=4, timeout=2)
+
+    start = time.monotonic()
+    results = judger.judge_batch(descriptions)
+    elapsed = time.monotonic() - start
+
+    # 两个包并行，之后两个补判也并行：约0.6秒，依次调用需要1.2秒
+    assert elapsed < 1.0
+    assert len(model._chat.packed_calls) == 2 and len(model._chat.single_calls) == 2
+    assert [result['decision'] for result in results] == [True, False, True, False]
+
+
+def test_judger_timeout_applies_to_packs_and_fallbacks():
+    model = make_model(pack_token_budget=10000)
+    model._chat = FakeChat(hang=5)
+    judger = AIJudger(model, user_requirements="python", max_workers=4, timeout=0.5)
+
+    start = time.monotonic()
+    results = judger.judge_batch(["job-0", "job-1 hang", "job-2", "job-3"])
+    elapsed = time.monotonic() - start
+
+    # 包含hang的包超时，包中的职位逐个补判，只有hang的职位再次超时
+    assert elapsed < 1.5
+    assert results[1] == {'success': False, 'error': "模型调用超时（超过0.5秒）"}
+    assert [result['reason'] for idx, result in enumerate(results) if idx != 1] == ["single"] * 3
+
+
+def test_cached_model_keeps_pack_dispatch():
+    model = make_model(pack_token_budget=10000)
+    model._chat = FakeChat()
+    cached = CachedModel(model, JudgmentCache(":memory:"))
+    judger = AIJudger(cached, user_requirements="python", max_workers=2, timeout=2)
+
+    judger.judge_batch(["job-0", "job-1"])
+    results = judger.judge_batch(["job-1", "job-2", "job-0"])
+
+    assert model._chat.packed_calls == [["job-0", "job-1"], ["job-2"]]
+    assert [result['reason'] for result in results] == ["job-1", "job-2", "job-0"]
+
+
+def test_ajudge_batch_sends_packs_and_falls_back_for_missing_jobs():
+    model = make_model(pack_token_budget=10000)
+    chat = FakeChat(drop={"job-1"})
+
+    async def achat(messages) -> str:
+        return chat(messages)
+
+    model._achat = achat
+    cached = CachedModel(model, JudgmentCache(":memory:"))
+    judger = AIJudger(cached, user_requirements="python")
+
+    results = asyncio.run(judger.ajudge_batch(["job-0", "job-1", "job-2"]))
+    again = asyncio.run(judger.ajudge_batch(["job-2", "job-3", "job-0"]))
+
+    assert [result['reason'] for result in results] == ["job-0", "single", "job-2"]
+    assert [result['reason'] for result in again] == ["job-2", "job-3", "job-0"]
+    # 第二次只有未命中缓存的职位被发送
+    assert chat.packed_calls == [["job-0", "job-1", "job-2"], ["job-3"]]
+    assert len(chat.single_calls) == 1
@@ -0,0 +1,85 @@
+"""
+限速器的测试，时间由假时钟控制，只检查预约令牌时需要等待的时间，不会真正等待
+"""
+
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from parsers.rate_limiter import HostRateLimiter, TokenBucket, parse_retry_after
+
+
+def make_bucket(clock, **kwargs) -> TokenBucket:
+    params = dict(rate=1.0, capacity=2, min_rate=0.1, max_rate=2.0, increase=0.25, decrease_factor=0.5)
+    params.update(kwargs)
+    return TokenBucket(clock=clock, **params)
+
+
+def test_burst_then_waits_at_current_rate(clock):
+    bucket = make_bucket(clock)
+
+    assert [bucket._reserve() for _ in range(4)] == [0.0, 0.0, pytest.approx(1.0), pytest.approx(2.0)]
+    clock.now += 10
+    # 令牌补充不超过桶容量
+    assert [bucket._reserve() for _ in range(3)] == [0.0, 0.0, pytest.approx(1.0)]
+
+
+def test_success_increases_rate_additively_up_to_max(clock):
+    bucket = make_bucket(clock)
+
+    bucket.on_success()
+    assert bucket.rate == pytest.approx(1.25)
+    for _ in range(10):
+        bucket.on_success()
+    assert bucket.rate == pytest.approx(2.0)
+
+
+def test_throttle_halves_rate_down_to_min_and_empties_bucket(clock):
+    bucket = make_bucket(clock)
+
+    bucket.on_throttle()
+    assert bucket.rate == pytest.approx(0.5)
+    # 被限流后桶中没有剩余令牌，下一个请求按降低后的速率等待
+    assert bucket._reserve() == pytest.approx(2.0)
+
+    for _ in range(10):
+        bucket.on_throttle()
+    assert bucket.rate == pytest.approx(0.1)
+
+
+def test_retry_after_blocks_all_requests_until_it_expires(clock):
+    bucket = make_bucket(clock, rate=2.0, capacity=5)
+
+    bucket.on_throttle(retry_after=30)
+    assert bucket.stats()['blocked_for'] == pytest.approx(30)
+    assert bucket._reserve() == pytest.approx(30)
+
+    clock.now += 31
+    assert bucket._reserve() == 0.0
+    assert bucket.stats()['blocked_for'] == 0.0
+
+
+def test_host_limiter_adjusts_per_host(clock):
+    limiter = HostRateLimiter({"www.linkedin.com": 0.5}, rate=1.0, max_rate=2.0, increase=0.25, clock=clock)
+
+    limiter.on_response("https://www.linkedin.com/jobs/view/1", 429, retry_after=10)
+    limiter.on_response("https://cn.linkedin.com/jobs/view/1", 200)
+    limiter.on_response("https://cn.linkedin.com/jobs/view/2", 404)
+
+    stats = limiter.stats()
+    assert stats["www.linkedin.com"]['rate'] == pytest.approx(0.25)
+    assert stats["www.linkedin.com"]['blocked_for'] == pytest.approx(10)
+    # 404不是限流，也不算成功
+    assert stats["cn.linkedin.com"]['rate'] == pytest.approx(1.25)
+    assert limiter.bucket_for("https://www.linkedin.com/jobs/search") is limiter.bucket_for(
+        "https://www.linkedin.com/jobs/view/3")
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("-5") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    in_a_minute = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=60), usegmt=True)
+    assert parse_retry_after(in_a_minute) == pytest.approx(60, abs=2)
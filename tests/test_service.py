@@ -0,0 +1,225 @@
+"""
+JobMatchService的集成测试
+
+LinkedIn和大模型API都用本地的替身服务代替：LinkedIn替身返回tests/fixtures中保存的页面（职位链接改写为替身地址），
+大模型替身实现OpenAI兼容的流式chat/completions接口，标题中包含Python的职位给高分，其余给低分。
+"""
+
+import json
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import pytest
+
+pytest.importorskip("openai")
+
+from ai import AIJudger, create_model
+from conftest import JOB_HTML, SEARCH_HTML
+from main.job_match_server import JobMatchServer
+from main.service import JobMatchService
+from parsers import LinkedInParser
+from parsers.rate_limiter import HostRateLimiter
+
+def start_server(handler_class) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class LinkedInStandIn(BaseHTTPRequestHandler):
+    search_html = ""
+    job_html = JOB_HTML
+    # 没有set时keywords=slow的搜索页请求会阻塞（最多10秒），用来把抓取线程占满
+    block = threading.Event()
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path.startswith("/jobs/search"):
+            if parse_qs(parts.query).get("keywords") == ["slow"]:
+                self.block.wait(10)
+            body = "" if "start" in parse_qs(parts.query) else self.search_html
+        else:
+            body = self.job_html
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LLMStandIn(BaseHTTPRequestHandler):
+    calls = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).calls += 1
+        prompt = body["messages"][-1]["content"]
+        title = re.search(r"\*\*Job Title\*\*: (.*)", prompt).group(1)
+        score = 0.9 if "Python" in title else 0.2
+        answer = "```" + json.dumps({"score": score, "decision": score > 0.5, "reason": title}) + "```"
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for content in (answer[:10], answer[10:]):
+            chunk = {"id": "stand-in", "object": "chat.completion.chunk", "created": 0, "model": body["model"],
+                     "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def stand_ins():
+    linkedin = start_server(LinkedInStandIn)
+    base = f"http://127.0.0.1:{linkedin.server_address[1]}"
+    LinkedInStandIn.search_html = re.sub(r"https://\w+\.linkedin\.com", base, SEARCH_HTML)
+    llm = start_server(LLMStandIn)
+    yield base, f"http://127.0.0.1:{llm.server_address[1]}/v1"
+    LinkedInStandIn.block.set()
+    linkedin.shutdown()
+    llm.shutdown()
+
+
+def make_service(llm_url: str, **kwargs) -> JobMatchService:
+    parser = LinkedInParser(max_workers=4,
+                            rate_limiter=HostRateLimiter(rate=1000, capacity=1000, max_rate=1000))
+    model = create_model("qwen", api_key="test-key", base_url=llm_url)
+    judger = AIJudger(model, user_requirements="Python backend developer", max_workers=4)
+    return JobMatchService(JobMatchServer(parser, judger), port=0, **kwargs).start()
+
+
+def post(port: int, payload: dict):
+    request = urllib.request.Request(f"http://127.0.0.1:{port}/match", data=json.dumps(payload).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"}, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def get(port: int, path: str):
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=30) as response:
+        return response.status, json.loads(response.read())
+
+
+def test_match_returns_full_ranked_results(stand_ins):
+    linkedin_url, llm_url = stand_ins
+    service = make_service(llm_url)
+    try:
+        LLMStandIn.calls = 0
+        status, body = post(service.port, {"url": f"{linkedin_url}/jobs/search?keywords=python", "max_num": 6,
+                                           "wait": True, "timeout": 20})
+        assert status == 200
+        assert body["status"] == "done"
+        results = body["results"]
+        assert len(results) == 6
+        assert LLMStandIn.calls == 6
+
+        scores = [result["score"] for result in results]
+        assert scores == sorted(scores, reverse=True)
+        assert results[0]["decision"] is True
+        assert all("Python" in result["job_info"]["title"] for result in results if result["decision"])
+
+        status, polled = get(service.port, f"/match/{body['id']}")
+        assert status == 200 and polled["results"] == results
+    finally:
+        service.stop()
+
+
+def test_full_queue_is_rejected_with_429(stand_ins):
+    linkedin_url, llm_url = stand_ins
+    LinkedInStandIn.block.clear()
+    service = make_service(llm_url, queue_size=1, crawl_workers=1)
+    try:
+        slow_url = f"{linkedin_url}/jobs/search?keywords=slow"
+        status, first = post(service.port, {"url": slow_url, "max_num": 1})
+        assert status == 202
+        # 等第一个请求被抓取线程取走，第二个请求占满队列
+        for _ in range(100):
+            if service.get(first["id"]).status == "crawling":
+                break
+            time.sleep(0.05)
+        assert post(service.port, {"url": slow_url, "max_num": 1})[0] == 202
+
+        status, body = post(service.port, {"url": slow_url, "max_num": 1})
+        assert status == 429
+        assert "error" in body
+
+        _, health = get(service.port, "/health")
+        assert health["queue_length"] == 1
+        assert health["requests"]["crawling"] == 1
+    finally:
+        LinkedInStandIn.block.set()
+        service.stop()
+
+
+def test_invalid_request_is_rejected(stand_ins):
+    _, llm_url = stand_ins
+    service = make_service(llm_url)
+    try:
+        assert post(service.port, {"max_num": 3})[0] == 400
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            get(service.port, "/match/unknown")
+        assert excinfo.value.code == 404
+    finally:
+        service.stop()
+
+
+class BlockingServer:
+    """代替JobMatchServer：抓取立即完成，判断一直阻塞到judge_released被set"""
+
+    def __init__(self):
+        self.judger = type("StubJudger", (), {"ai_model": None})()
+        self.judge_released = threading.Event()
+
+    def crawl(self, url: str, max_num: int = -1):
+        return [{"job_id": url}]
+
+    def judge(self, job_info_list, user_requirements: str = ""):
+        self.judge_released.wait(10)
+        return [{"success": True, "score": 0.9, "job_info": job_info_list[0]}]
+
+
+def test_stop_fails_queued_and_waiting_requests():
+    server = BlockingServer()
+    service = JobMatchService(server, port=0, queue_size=4, crawl_workers=1, judge_workers=1,
+                              judge_backlog=1).start()
+    judging = service.submit("job-1")
+    for _ in range(100):
+        if judging.status == "judging":
+            break
+        time.sleep(0.02)
+    # 第二个请求抓取完成后等待判断名额，其余请求留在队列中
+    waiting = service.submit("job-2")
+    for _ in range(100):
+        if waiting.status == "crawling" and service.stats()["queue_length"] == 0:
+            break
+        time.sleep(0.02)
+    queued = [service.submit(f"job-{idx}") for idx in range(3, 5)]
+
+    stopper = threading.Thread(target=service.stop)
+    stopper.start()
+    for request in [waiting] + queued:
+        assert request.done.wait(5)
+        assert request.status == "failed" and "服务已停止" in request.error
+    assert not judging.done.is_set()
+
+    # 正在判断的请求正常完成
+    server.judge_released.set()
+    stopper.join(5)
+    assert not stopper.is_alive()
+    assert judging.status == "done"
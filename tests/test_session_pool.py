@@ -0,0 +1,105 @@
+"""
+SessionPool的测试：每个代理复用同一个Session及其连接，关闭时释放所有Session
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from parsers.session_pool import SessionPool
+
+PROXY = "http://10.0.0.1:8080"
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """支持keep-alive的本地服务，记录每个请求来自哪个客户端端口"""
+
+    protocol_version = "HTTP/1.1"
+    client_ports = []
+
+    def do_GET(self):
+        type(self).client_ports.append(self.client_address[1])
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    KeepAliveHandler.client_ports = []
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_sessions_are_reused_per_proxy():
+    pool = SessionPool({'Accept-Language': 'en-US'}, pool_maxsize=7)
+
+    direct = pool.get()
+    proxied = pool.get(PROXY)
+
+    assert pool.get(None) is direct and pool.get(PROXY) is proxied
+    assert direct is not proxied
+    assert len(pool) == 2
+    assert proxied.proxies == {'http': PROXY, 'https': PROXY}
+    assert not direct.proxies
+    assert proxied.headers['Accept-Language'] == 'en-US'
+    assert proxied.get_adapter("https://www.linkedin.com")._pool_maxsize == 7
+
+
+def test_concurrent_get_creates_one_session_per_proxy():
+    pool = SessionPool()
+    sessions = []
+    barrier = threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        sessions.append(pool.get(PROXY))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(session) for session in sessions}) == 1
+    assert len(pool) == 1
+
+
+def test_connections_are_kept_alive(local_server):
+    pool = SessionPool()
+
+    for _ in range(3):
+        assert pool.get().get(local_server, timeout=5).text == "ok"
+
+    assert len(KeepAliveHandler.client_ports) == 3
+    assert len(set(KeepAliveHandler.client_ports)) == 1
+    pool.close()
+
+
+def test_discard_and_close_release_sessions(monkeypatch):
+    pool = SessionPool()
+    closed = []
+    for proxy in (None, PROXY, "http://10.0.0.2:8080"):
+        session = pool.get(proxy)
+        monkeypatch.setattr(session, "close", lambda proxy=proxy: closed.append(proxy))
+
+    pool.discard(PROXY)
+    pool.discard("http://unknown:1")
+    assert closed == [PROXY]
+    assert len(pool) == 2
+
+    pool.close()
+    assert sorted(closed, key=str) == sorted([PROXY, None, "http://10.0.0.2:8080"], key=str)
+    assert len(pool) == 0
+    # 关闭后再次使用会创建新的Session
+    assert pool.get(PROXY) is not None and len(pool) == 1
@@ -0,0 +1,148 @@
+"""
+SearchWatcher的测试
+
+_make_request被替换为本地函数，搜索结果页返回tests/fixtures中保存的页面并记录详情页请求；
+模型按用户需求给分，可以指定某些职位在前几次判断时失败。
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+from ai import AIJudger, AIModel
+from conftest import SEARCH_HTML, FakeLinkedIn
+from main.watcher import SavedSearch, SearchWatcher
+from parsers import LinkedInParser
+from parsers.html_backends import BS4Backend
+
+CARDS = BS4Backend().extract_job_cards(SEARCH_HTML)
+
+
+class FlakyModel(AIModel):
+    """描述中包含failing中任一标题的职位判断失败，记录每次判断使用的用户需求"""
+
+    def __init__(self):
+        self.failing = set()
+        self.calls = []
+
+    def judge(self, user_requirements: str, job_description: str) -> Dict[str, Any]:
+        self.calls.append(user_requirements)
+        if any(title in job_description for title in self.failing):
+            return {'success': False, 'error': "rate limited"}
+        return {'success': True, 'score': 0.8, 'reason': user_requirements}
+
+
+def make_watcher(searches, judge_workers: int = 2, dedup_threshold: float = None):
+    site = FakeLinkedIn()
+    parser = LinkedInParser()
+    parser._make_request = site
+    model = FlakyModel()
+    judger = AIJudger(model, user_requirements="default", dedup_threshold=dedup_threshold)
+    watcher = SearchWatcher(parser, judger, searches,
+                            judge_workers=judge_workers, on_results=lambda search, results: None)
+    return watcher, site, model
+
+
+def judged_ids(results):
+    return sorted(result['job_info']['job_id'] for result in results)
+
+
+def test_failed_judgments_are_retried_on_next_poll():
+    search = SavedSearch("https://www.linkedin.com/jobs/search?keywords=python", name="python")
+    watcher, site, model = make_watcher([search])
+    try:
+        failed = CARDS[2]
+        model.failing = {failed['title']}
+        results = watcher.poll(search)
+        assert len(results) == len(CARDS)
+        assert [result['job_info']['job_id'] for result in results if not result['success']] == [failed['job_id']]
+
+        # 只有判断失败的职位被重新抓取和判断
+        model.failing = set()
+        site.detail_requests.clear()
+        results = watcher.poll(search)
+        assert judged_ids(results) == [failed['job_id']]
+        assert results[0]['success'] is True
+        assert len(site.detail_requests) == 1
+
+        assert watcher.poll(search) == []
+    finally:
+        watcher.stop()
+
+
+def test_searches_sharing_a_parser_track_jobs_separately():
+    url = "https://www.linkedin.com/jobs/search?keywords=python"
+    backend = SavedSearch(url, name="backend", user_requirements="backend role")
+    remote = SavedSearch(url + "&f_WT=2", name="remote", user_requirements="remote role")
+    watcher, site, model = make_watcher([backend, remote])
+    try:
+        all_ids = sorted(card['job_id'] for card in CARDS)
+        assert judged_ids(watcher.poll(backend)) == all_ids
+        # 另一个搜索中出现的相同职位仍然按它自己的需求判断
+        remote_results = watcher.poll(remote)
+        assert judged_ids(remote_results) == all_ids
+        assert {result['reason'] for result in remote_results} == {"remote role"}
+        assert model.calls.count("backend role") == model.calls.count("remote role") == len(CARDS)
+
+        assert watcher.run_once() == {"backend": [], "remote": []}
+
+        # 卡片有变化的职位在两个搜索中都重新判断
+        site.search_html = SEARCH_HTML.replace(CARDS[0]['title'], "Staff Software Engineer")
+        rerun = watcher.run_once()
+        assert {name: judged_ids(results) for name, results in rerun.items()} == {
+            "backend": [CARDS[0]['job_id']], "remote": [CARDS[0]['job_id']]}
+    finally:
+        watcher.stop()
+
+
+def test_poll_judges_one_job_per_group_of_duplicate_descriptions():
+    # 所有职位的详情页都是同一个页面，描述完全相同
+    search = SavedSearch("https://www.linkedin.com/jobs/search?keywords=python", name="python")
+    watcher, site, model = make_watcher([search], dedup_threshold=0.9)
+    try:
+        results = watcher.poll(search)
+        assert len(model.calls) == 1
+        assert judged_ids(results) == sorted(card['job_id'] for card in CARDS)
+        assert sum('duplicate_of' in result for result in results) == len(CARDS) - 1
+        assert watcher.judger.last_dedup_stats == {'total': len(CARDS), 'judged': 1, 'duplicates': len(CARDS) - 1}
+
+        # 复制了成功结果的重复职位同样记录为已判断
+        assert watcher.poll(search) == []
+    finally:
+        watcher.stop()
+
+
+def test_watcher_leaves_the_shared_parser_unchanged():
+    search = SavedSearch("https://www.linkedin.com/jobs/search?keywords=python", name="python")
+    watcher, site, _ = make_watcher([search])
+    try:
+        assert watcher.parser.incremental is True and watcher.parser.job_store is None
+        assert judged_ids(watcher.poll(search)) == sorted(card['job_id'] for card in CARDS)
+        assert watcher.parser.incremental is True and watcher.parser.job_store is None
+    finally:
+        watcher.stop()
+
+
+def test_stop_waits_for_run_to_shut_down_its_pools():
+    searches = [SavedSearch(f"https://www.linkedin.com/jobs/search?keywords=job{idx}", name=f"job{idx}", interval=0.01)
+                for idx in range(3)]
+    watcher, _, model = make_watcher(searches)
+    errors = []
+
+    def run():
+        try:
+            watcher.run()
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    # 等所有搜索都至少检查过一次，此时仍有检查在按interval不断重新提交
+    deadline = time.monotonic() + 5
+    while len(model.calls) < 3 * len(CARDS) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    watcher.stop()
+
+    assert not thread.is_alive()
+    assert errors == []
+    assert watcher._crawl_executor is None and watcher._judge_executor is None